@@ -0,0 +1,44 @@
+"""Measure figure build time and JSON payload size of the charts, raw versus downsampled.
+
+Run with ``python -m benchmarks.bench_charts --bars 1000000``.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest.backtester import Backtester
+from src.strategies.simple_moving_average import SMAStrategy
+from src.utils.visualizations import MAX_POINTS, plot_stock_data, plot_stock_with_signals
+
+
+def build(function, *args, **kwargs):
+    """Seconds to build the figure and serialize it, and the payload size in MB."""
+    start = time.perf_counter()
+    payload = function(*args, **kwargs).to_json()
+    return time.perf_counter() - start, len(payload) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--max-points", type=int, default=MAX_POINTS)
+    parser.add_argument("--skip-raw", action="store_true", help="only time the downsampled figures")
+    args = parser.parse_args()
+
+    data = make_ohlcv(args.bars, freq="min")
+    backtester = Backtester(data, SMAStrategy, 10000, data.index[0].date(), data.index[-1].date(), "Moderate")
+    positions = backtester.run_backtest_vectorized()[2]
+    print(f"{args.bars:,} bars, {len(positions):,} trades")
+
+    budgets = [("downsampled", args.max_points)]
+    if not args.skip_raw:
+        budgets.append(("raw", args.bars))
+    for label, max_points in budgets:
+        seconds, size = build(plot_stock_data, data, max_points=max_points)
+        print(f"plot_stock_data          {label:<12} {seconds:7.2f}s {size:9.2f} MB")
+        seconds, size = build(plot_stock_with_signals, data, positions, max_points=max_points)
+        print(f"plot_stock_with_signals  {label:<12} {seconds:7.2f}s {size:9.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Backtest a large minute-bar CSV chunk by chunk and report time and peak memory.
+
+    python -m benchmarks.bench_chunked --rows 50000000 --path /tmp/bars.csv
+
+The CSV is generated first (in pieces, so generation itself stays small) and
+reused on later runs if it already exists.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv
+from src.backtest.batch import STRATEGIES
+from src.backtest.chunked import run_chunked_backtest
+from src.data.chunks import read_csv_chunks, resample_chunks
+
+
+def write_csv(path, rows, piece=1_000_000, seed=0):
+    """Write a continuous seeded minute-bar series to ``path`` one piece at a time."""
+    start = pd.Timestamp("2000-01-03 09:30", tz="America/New_York")
+    level = 1.0
+    for i, lo in enumerate(range(0, rows, piece)):
+        data = make_ohlcv(min(piece, rows - lo), seed=seed + i, start=start, freq="min", symbol="SYN",
+                          drift=0.0, volatility=0.001)
+        data[["Open", "High", "Low", "Close"]] *= level
+        level = data["Close"].iloc[-1] / 100
+        start = data.index[-1] + pd.Timedelta(minutes=1)
+        data.to_csv(path, mode="w" if lo == 0 else "a", header=lo == 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--path", default="bench_bars.csv")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--resample", default=None, help="target bar size, e.g. 5min")
+    parser.add_argument("--strategy", default="Simple Moving Avg", choices=list(STRATEGIES))
+    parser.add_argument("--style", default="Moderate")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        start = time.perf_counter()
+        write_csv(args.path, args.rows)
+        print(f"wrote {args.rows:,} rows to {args.path} in {time.perf_counter() - start:.1f}s")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = read_csv_chunks(args.path, chunksize=args.chunksize, tz="America/New_York")
+    if args.resample:
+        chunks = resample_chunks(chunks, args.resample)
+    result = run_chunked_backtest(chunks, STRATEGIES[args.strategy], 10000, args.style)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{result.bars:,} bars, {len(result.ledger):,} trades, final value {result.final_value:,.2f}")
+    print(f"{elapsed:.1f}s ({result.bars / elapsed:,.0f} bars/s), peak traced memory {peak / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark concurrent symbol fetching against a local fake fetcher with injected latency.
+
+Run with ``python -m benchmarks.bench_fetch``; no network access is needed.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_frames
+from src.data.fetchers import ReplayFetcher, fetch_concurrently
+
+
+def time_call(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=2500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake network call")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    frames = make_frames(args.symbols, args.bars)
+    symbols = list(frames)
+
+    for workers in (1, args.workers):
+        fetcher = ReplayFetcher(frames, latency=args.latency)
+        elapsed = time_call(lambda: fetch_concurrently(fetcher, symbols, info_symbols=symbols, max_workers=workers))
+        print(f"fetch {args.symbols} symbols, {workers:>2} workers: {elapsed:.2f}s")
+
+    histories = [frames[s].assign(Symbol=s) for s in symbols]
+
+    def repeated_concat():
+        all_data = pd.DataFrame()
+        for historical_data in histories:
+            all_data = pd.concat([all_data, historical_data], axis=0)
+
+    print(f"assemble with repeated concat: {time_call(repeated_concat):.3f}s")
+    print(f"assemble with single concat:   {time_call(lambda: pd.concat(histories, axis=0)):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
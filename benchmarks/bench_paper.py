@@ -0,0 +1,52 @@
+"""Size how many symbols one process can paper-trade in real time.
+
+    python -m benchmarks.bench_paper --symbols 10 100 1000 --bars 500 --interval 60
+
+Each universe of synthetic minute bars is replayed as fast as the runtime
+can take it, and the throughput is turned into the number of symbols whose
+bars could be handled every ``--interval`` seconds. Pass ``--csv`` to replay
+a combined CSV instead, and ``--speed`` to replay at an accelerated market
+pace and see the latency under that load.
+"""
+import argparse
+
+from benchmarks.synthetic import make_universe
+from src.backtest.batch import STRATEGIES
+from src.backtest.paper import run_paper
+from src.data.data_loader import load_data
+from src.data.store import to_utc_index
+
+
+def report(label, stats, interval):
+    capacity = stats["bars_per_second"] * interval
+    print(f"{label:<14} {stats['bars']:>9,} bars {stats['bars_per_second']:>9,.0f} bars/s  "
+          f"p50 {stats['p50_us']:8.0f}us  p99 {stats['p99_us']:8.0f}us  "
+          f"waits {stats['backpressure_waits']:>6,}  ~{capacity:,.0f} symbols at {interval:g}s bars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--csv", help="replay this Symbol-keyed CSV instead of synthetic bars")
+    parser.add_argument("--strategy", default="Simple Moving Avg", choices=list(STRATEGIES))
+    parser.add_argument("--style", default="Moderate")
+    parser.add_argument("--speed", type=float, default=None, help="market seconds per wall second")
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--interval", type=float, default=60, help="bar interval to size capacity for, seconds")
+    args = parser.parse_args()
+
+    if args.csv:
+        data = load_data(file_path=args.csv)
+        data.index = to_utc_index(data.index).rename("Date")
+        universes = [(f"{data['Symbol'].nunique()} symbols", data)]
+    else:
+        universes = ((f"{n} symbols", make_universe(n, args.bars, freq="min")) for n in args.symbols)
+    for label, data in universes:
+        result = run_paper(data, args.strategy, management_style=args.style, speed=args.speed,
+                           queue_size=args.queue_size)
+        report(label, result.stats, args.interval)
+
+
+if __name__ == "__main__":
+    main()
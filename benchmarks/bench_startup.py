@@ -0,0 +1,96 @@
+"""Measure cold-start import time of the app, the headless runner and a worker process.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``
+and the best of ``--repeat`` runs is kept. The report lists the total import
+time, the interpreter's wall time and which heavy optional packages got
+imported. Run with ``python -m benchmarks.bench_startup``.
+"""
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "streamlit_app", "main.py")
+HEAVY_PACKAGES = ["yfinance", "plotly", "matplotlib", "streamlit"]
+
+
+def app_imports(path=APP_PATH):
+    """Modules the Streamlit app imports at its top level, skipping packages not installed here."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return [m for m in dict.fromkeys(modules) if importlib.util.find_spec(m.split(".")[0]) is not None]
+
+
+def targets():
+    return {
+        "app": "import " + ", ".join(app_imports()),
+        "headless": "import src.main",
+        "worker": "import src.backtest.batch",
+    }
+
+
+def parse_importtime(stderr):
+    """Total import microseconds and the set of imported module names from ``-X importtime`` output."""
+    total = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):  # top level: one space of padding, no nesting indent
+            total += int(cumulative)
+    return total, modules
+
+
+def measure(statement, repeat=5):
+    """Best (import seconds, wall seconds) over ``repeat`` fresh interpreters, plus the modules imported."""
+    best_import = best_wall = float("inf")
+    modules = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+        total, modules = parse_importtime(result.stderr)
+        best_import = min(best_import, total / 1e6)
+        best_wall = min(best_wall, wall)
+    return best_import, best_wall, modules
+
+
+def run(repeat=5, log=print):
+    results = {}
+    for name, statement in targets().items():
+        import_seconds, wall_seconds, modules = measure(statement, repeat)
+        heavy = [p for p in HEAVY_PACKAGES if p in modules]
+        results[name] = {"import_s": import_seconds, "wall_s": wall_seconds, "heavy": heavy}
+        if log:
+            log(f"{name:<10} imports {import_seconds:7.3f}s  wall {wall_seconds:7.3f}s  "
+                f"heavy: {', '.join(heavy) or '-'}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    results = run(args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Measure per-bar latency of each strategy's streaming update().
+
+Run with ``python -m benchmarks.bench_streaming``.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_frames
+from src.strategies.bollinger_band import BollingerBandStrategy
+from src.strategies.macd import MACDStrategy
+from src.strategies.rsi import RSIStrategy
+from src.strategies.simple_moving_average import SMAStrategy
+from src.strategies.vwap import VWAPStrategy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--style", default="Moderate")
+    args = parser.parse_args()
+
+    data = next(iter(make_frames(1, args.bars).values()))
+    bars = [{"Close": c, "Volume": v} for c, v in zip(data["Close"].tolist(), data["Volume"].tolist())]
+
+    for strategy_class in (BollingerBandStrategy, MACDStrategy, RSIStrategy, SMAStrategy, VWAPStrategy):
+        strategy = strategy_class(data, 10000, investment_style=args.style)
+        update = strategy.update
+        start = time.perf_counter()
+        for bar in bars:
+            update(bar)
+        per_bar = (time.perf_counter() - start) / len(bars) * 1e6
+        print(f"{strategy_class.__name__:<22} {per_bar:6.2f} us/bar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Benchmark the strategies, the backtester and the loader on seeded synthetic data.
+
+Record a baseline, then compare a later run against it:
+
+    python -m benchmarks.suite run --output benchmarks/baseline.json
+    python -m benchmarks.suite run --output current.json
+    python -m benchmarks.suite compare benchmarks/baseline.json current.json --threshold 0.2
+
+``compare`` exits with status 1 when any case got slower (or used more peak
+memory) than the threshold allows. Everything runs offline.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv, make_universe
+from src.backtest.backtester import Backtester
+from src.backtest.batch import STRATEGIES
+from src.backtest.portfolio import run_portfolio
+from src.backtest.screener import screen
+from src.data.data_loader import load_data
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def measure(function, repeat=3):
+    """Best wall time of ``repeat`` calls, then peak traced memory of one more call."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def _backtest(data, strategy_class, vectorized):
+    start_date = data.index[0].date()
+    end_date = (data.index[-1] + pd.Timedelta(days=1)).date()
+
+    def run():
+        backtester = Backtester(data, strategy_class, 10000, start_date, end_date, "Moderate")
+        if vectorized:
+            return backtester.run_backtest_vectorized()
+        backtester.run_backtest()
+        return backtester.get_results()
+    return run
+
+
+def _write_csv(data, directory, name):
+    path = os.path.join(directory, name)
+    data.to_csv(path)
+    return path
+
+
+def cases(sizes, n_symbols, universe_bars, loop_max_bars, backtest_strategy, directory):
+    """Yield (name, bars, function) for every benchmark case, building each data size once."""
+    for n_bars in sizes:
+        data = make_ohlcv(n_bars, seed=n_bars, freq="min")
+        for label, strategy_class in STRATEGIES.items():
+            strategy = strategy_class(data, 10000, investment_style="Moderate")
+            yield f"signals/{label}/{n_bars}", n_bars, strategy.generate_signals
+
+        strategy_class = STRATEGIES[backtest_strategy]
+        if n_bars <= loop_max_bars:
+            yield f"run_backtest/{backtest_strategy}/{n_bars}", n_bars, _backtest(data, strategy_class, False)
+        yield f"run_backtest_vectorized/{backtest_strategy}/{n_bars}", n_bars, _backtest(data, strategy_class, True)
+
+        path = _write_csv(data.assign(Symbol="SYM0000"), directory, f"ohlcv_{n_bars}.csv")
+        yield f"load_data/{n_bars}", n_bars, lambda path=path: load_data(file_path=path)
+        del data
+
+    if n_symbols:
+        universe = make_universe(n_symbols, universe_bars)
+        bars = len(universe)
+        strategy_class = STRATEGIES[backtest_strategy]
+        yield (f"run_portfolio/{backtest_strategy}/{n_symbols}x{universe_bars}", bars,
+               lambda: run_portfolio(universe, strategy_class, 10000, "Moderate"))
+        yield f"screen/{n_symbols}x{universe_bars}", bars, lambda: screen(universe)
+        path = _write_csv(universe, directory, f"universe_{n_symbols}.csv")
+        yield f"load_data/{n_symbols}x{universe_bars}", bars, lambda: load_data(file_path=path)
+
+
+def run(sizes=DEFAULT_SIZES, n_symbols=500, universe_bars=2500, loop_max_bars=100_000,
+        backtest_strategy="Simple Moving Avg", repeat=3, log=print):
+    """Run every case and return the results document that ``run`` writes as JSON."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, bars, function in cases(sizes, n_symbols, universe_bars, loop_max_bars, backtest_strategy, directory):
+            seconds, peak = measure(function, repeat)
+            result = {
+                "name": name,
+                "bars": bars,
+                "seconds": seconds,
+                "peak_mb": peak / 2**20,
+                "bars_per_second": bars / seconds if seconds > 0 else float("inf"),
+            }
+            results.append(result)
+            if log:
+                log(f"{name:<48} {seconds:9.4f}s {result['peak_mb']:9.1f}MB {result['bars_per_second']:14,.0f} bars/s")
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_seconds=0.005):
+    """Compare two results documents case by case.
+
+    A case regresses when its wall time or peak memory grew by more than
+    ``threshold`` (a fraction). Time changes smaller than ``min_seconds`` are
+    treated as noise. Returns a DataFrame with one row per case and a Status
+    column of "regression", "faster", "ok", "new" or "missing".
+    """
+    base = {r["name"]: r for r in baseline["results"]}
+    cur = {r["name"]: r for r in current["results"]}
+    rows = []
+    for name in list(base) + [name for name in cur if name not in base]:
+        old, new = base.get(name), cur.get(name)
+        if old is None or new is None:
+            rows.append({"Case": name, "Status": "new" if old is None else "missing"})
+            continue
+        time_ratio = new["seconds"] / old["seconds"] if old["seconds"] > 0 else 1.0
+        memory_ratio = new["peak_mb"] / old["peak_mb"] if old["peak_mb"] > 0 else 1.0
+        slower = time_ratio > 1 + threshold and new["seconds"] - old["seconds"] > min_seconds
+        if slower or memory_ratio > 1 + threshold:
+            status = "regression"
+        elif time_ratio < 1 - threshold and old["seconds"] - new["seconds"] > min_seconds:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({
+            "Case": name,
+            "Baseline s": old["seconds"],
+            "Current s": new["seconds"],
+            "Time Ratio": time_ratio,
+            "Baseline MB": old["peak_mb"],
+            "Current MB": new["peak_mb"],
+            "Memory Ratio": memory_ratio,
+            "Status": status,
+        })
+    return pd.DataFrame(rows, columns=["Case", "Baseline s", "Current s", "Time Ratio",
+                                       "Baseline MB", "Current MB", "Memory Ratio", "Status"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write a JSON results file")
+    run_parser.add_argument("--output", default="benchmarks/baseline.json")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run_parser.add_argument("--symbols", type=int, default=500, help="symbols in the portfolio case (0 to skip)")
+    run_parser.add_argument("--universe-bars", type=int, default=2500)
+    run_parser.add_argument("--loop-max-bars", type=int, default=100_000,
+                            help="largest size to run the per-row run_backtest loop on")
+    run_parser.add_argument("--strategy", default="Simple Moving Avg", choices=list(STRATEGIES))
+    run_parser.add_argument("--repeat", type=int, default=3)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions of a run against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore smaller time changes")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        document = run(args.sizes, args.symbols, args.universe_bars, args.loop_max_bars, args.strategy, args.repeat)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Wrote {len(document['results'])} results to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    table = compare(baseline, current, args.threshold, args.min_seconds)
+    with pd.option_context("display.max_rows", None, "display.width", 160, "display.float_format", "{:.4f}".format):
+        print(table.to_string(index=False))
+    regressions = table[table["Status"] == "regression"]
+    if len(regressions):
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Seeded synthetic market data for tests and benchmarks; no network access needed."""
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(n_bars=1000, seed=0, start="2015-01-01", tz="America/New_York", symbol=None, freq="D",
+               drift=0.0003, volatility=0.02):
+    """Build a seeded OHLCV frame indexed like the Yahoo Finance downloads.
+
+    Closes follow a geometric Brownian motion with the given per-bar drift
+    and volatility; opens, highs and lows are drawn around them and volume is
+    uniform. Use an intraday ``freq`` such as ``"min"`` for very long series,
+    since a million daily bars would run past the last representable timestamp.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, volatility, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n_bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n_bars))
+    volume = rng.integers(1_000_000, 10_000_000, n_bars)
+
+    index = pd.date_range(start, periods=n_bars, freq=freq, tz=tz, name="Date")
+    data = pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+    if symbol is not None:
+        data["Symbol"] = symbol
+    return data
+
+
+def make_frames(n_symbols, n_bars, seed=0, **kwargs):
+    """One independently seeded OHLCV frame per symbol, keyed SYM0000, SYM0001, ..."""
+    return {
+        f"SYM{i:04d}": make_ohlcv(n_bars, seed=seed + i, **kwargs)
+        for i in range(n_symbols)
+    }
+
+
+def make_universe(n_symbols, n_bars, seed=0, **kwargs):
+    """A Symbol-keyed frame of many symbols, shaped like the combined CSV."""
+    frames = make_frames(n_symbols, n_bars, seed=seed, **kwargs)
+    return pd.concat([data.assign(Symbol=symbol) for symbol, data in frames.items()])
@@ -4,4 +4,9 @@ setup(
     name="backtest_engine",
     version="0.1",
     packages=find_packages(),
+    entry_points={
+        "console_scripts": [
+            "backtest-batch=src.main:main",
+        ],
+    },
 )
@@ -1,16 +1,28 @@
 from datetime import datetime
+from .engine import get_trade_parameters, simulate_trades
+from .ledger import TradeLedger
+from src.utils.profiling import count, stage
+
+def date_bounds(start_date, end_date, tz):
+    """Inclusive (start, end) timestamps of a backtest's date range, at midnight, for an index in ``tz``."""
+    start = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(end_date, datetime.min.time())
+    if tz is not None:
+        return start.astimezone(tz), end.astimezone(tz)
+    return start, end
+
 
 class Backtester:
     def __init__(self, data, strategy_class, capital, start_date, end_date, management_style):
-        tz = data.index.tz
-        if tz is not None:
-            self.start_date = datetime.combine(start_date, datetime.min.time()).astimezone(tz)
-            self.end_date = datetime.combine(end_date, datetime.min.time()).astimezone(tz)
-        else:
-            self.start_date = datetime.combine(start_date, datetime.min.time())
-            self.end_date = datetime.combine(end_date, datetime.min.time())
+        self.start_date, self.end_date = date_bounds(start_date, end_date, data.index.tz)
 
-        self.data = data[(data.index >= self.start_date) & (data.index <= self.end_date)]
+        if data.index.is_monotonic_increasing:
+            # Slice by position on the sorted index; unlike a boolean mask this does not copy the frame
+            start = data.index.searchsorted(self.start_date, side='left')
+            end = data.index.searchsorted(self.end_date, side='right')
+            self.data = data.iloc[start:end]
+        else:
+            self.data = data[(data.index >= self.start_date) & (data.index <= self.end_date)]
         self.strategy = strategy_class(self.data, capital, investment_style=management_style)  # Corrected to pass the class, not instance
         self.capital = capital
         self.holdings = 0
@@ -20,19 +32,18 @@ class Backtester:
 
     def run_backtest(self):
         """Run backtest using the selected strategy and management style."""
-        signals = self.strategy.generate_signals()
+        with stage("generate_signals"):
+            signals = self.strategy.generate_signals()
 
         # Define style-specific parameters
-        if self.management_style == 'aggressive':
-            trade_fraction = 1.0  # Use all available cash per trade
-            min_signal_strength = 0  # Accept any signal
-        elif self.management_style == 'moderate':
-            trade_fraction = 0.5  # Use half of available cash per trade
-            min_signal_strength = 0.5  # Accept moderate to strong signals
-        else:  # Passive
-            trade_fraction = 0.25  # Use a quarter of available cash per trade
-            min_signal_strength = 1.0  # Only accept the strongest signals
+        trade_fraction, min_signal_strength = get_trade_parameters(self.management_style)
         print(self.management_style)
+        with stage("trade_loop"):
+            self._trade_loop(signals, trade_fraction, min_signal_strength)
+        count("bars", len(signals))
+        count("trades", len(self.positions))
+
+    def _trade_loop(self, signals, trade_fraction, min_signal_strength):
         for date, signal in signals.items():
             stock_price = self.data.loc[date, 'Close']
 
@@ -52,10 +63,31 @@ class Backtester:
                 self.positions.append((date, 'Sell', self.holdings, stock_price))
                 self.holdings = 0
 
+    def run_backtest_vectorized(self):
+        """Run the backtest on NumPy arrays and return the same tuple as get_results."""
+        with stage("generate_signals"):
+            signals = self.strategy.generate_signals()
+        trade_fraction, min_signal_strength = get_trade_parameters(self.management_style)
+
+        with stage("simulate_trades"):
+            close = self.data['Close'].to_numpy()
+            self.cash, self.holdings, fills = simulate_trades(
+                close, signals.to_numpy(), self.capital, trade_fraction, min_signal_strength
+            )
+            dates = signals.index
+            self.positions = [(dates[i], action, shares, price) for i, action, shares, price in fills]
+        count("bars", len(signals))
+        count("trades", len(self.positions))
+        return self.get_results()
+
     def get_results(self):
         """Calculate and return the final portfolio and HODL values."""
         portfolio_value = self.cash + (self.holdings * self.data.iloc[-1]['Close'])
         hodl_value = (self.capital / self.data.iloc[0]['Close']) * self.data.iloc[-1]['Close']
         
         return portfolio_value, hodl_value, self.positions
-    
\ No newline at end of file
+    
+
+    def get_ledger(self):
+        """Return the trades taken so far as a TradeLedger (for FIFO round trips and realized P/L)."""
+        return TradeLedger.from_positions(self.positions)
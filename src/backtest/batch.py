@@ -0,0 +1,247 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .backtester import Backtester
+from .cache import fingerprint
+from src.strategies.registry import STRATEGIES
+from src.utils.metrics import calculate_equity_curve, performance_summary
+from src.utils.profiling import active_report, profile_run, stage
+
+STYLES = ["Aggressive", "Moderate", "Passive"]
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+RESULT_COLUMNS = ["Symbol", "Strategy", "Style", "Final Value", "HODL Value", "Trades",
+                  "CAGR", "Max Drawdown", "Sharpe"]
+COMPARE_COLUMNS = ["Strategy", "Style", "Final Value", "HODL Value", "Trades", "CAGR", "Max Drawdown", "Sharpe"]
+LEADERBOARD_COLUMNS = ["Strategy", "Style", "Final Value", "HODL Value", "vs HODL", "Max Drawdown", "Sharpe",
+                       "CAGR", "Trades"]
+
+# The price frame of a compare_strategies worker, built once over the shared memory block
+_worker = {}
+
+
+def _utc_nanoseconds(index):
+    """UTC nanosecond timestamps of a Date index plus its timezone name (None if naive)."""
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index, utc=True)
+    tz = str(index.tz) if index.tz is not None else None
+    return (index.tz_convert("UTC") if tz else index).as_unit("ns").asi8, tz
+
+
+def split_by_symbol(data, symbols=None):
+    """Split a Symbol-keyed frame into per-symbol column arrays in a single groupby."""
+    if "Symbol" not in data.columns:
+        raise ValueError("Batch backtests need a 'Symbol' column to split the data on.")
+    timestamps, tz = _utc_nanoseconds(data.index)
+
+    columns = [c for c in PRICE_COLUMNS if c in data.columns]
+    keys = data["Symbol"].to_numpy()
+    frame = pd.DataFrame({c: data[c].to_numpy() for c in columns})
+    frame["_ts"] = timestamps
+
+    arrays = {}
+    for symbol, rows in frame.groupby(keys, sort=False):
+        if symbols is not None and symbol not in symbols:
+            continue
+        rows = rows.sort_values("_ts", kind="stable")
+        arrays[symbol] = {
+            "timestamps": rows["_ts"].to_numpy(),
+            "tz": tz,
+            "columns": {c: rows[c].to_numpy() for c in columns},
+        }
+    return arrays
+
+
+def frame_from_arrays(arrays):
+    """Rebuild a Date-indexed OHLCV frame from the arrays produced by split_by_symbol."""
+    index = pd.DatetimeIndex(arrays["timestamps"].view("datetime64[ns]"), name="Date")
+    if arrays["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(arrays["tz"])
+    return pd.DataFrame(arrays["columns"], index=index, copy=False)
+
+
+def frame_arrays(data):
+    """The arrays of one symbol's Date-indexed frame, in the layout of split_by_symbol."""
+    timestamps, tz = _utc_nanoseconds(data.index)
+    columns = [c for c in PRICE_COLUMNS if c in data.columns]
+    return {"timestamps": timestamps, "tz": tz, "columns": {c: data[c].to_numpy() for c in columns}}
+
+
+def share_arrays(arrays):
+    """Copy arrays into one shared memory block that worker processes can map without copying.
+
+    Returns ``(block, layout)``; pass ``layout`` to ``attach_arrays`` in the
+    workers, and close and unlink ``block`` when they are done.
+    """
+    fields = [("timestamps", np.asarray(arrays["timestamps"]))]
+    fields += [(c, np.asarray(values)) for c, values in arrays["columns"].items()]
+    block = shared_memory.SharedMemory(create=True, size=max(sum(a.nbytes for _, a in fields), 1))
+    layout = {"name": block.name, "tz": arrays["tz"], "rows": len(fields[0][1]), "fields": []}
+    offset = 0
+    for name, values in fields:
+        np.ndarray(values.shape, values.dtype, buffer=block.buf, offset=offset)[:] = values
+        layout["fields"].append((name, values.dtype.str, offset))
+        offset += values.nbytes
+    return block, layout
+
+
+def attach_arrays(layout):
+    """Map a block made by share_arrays; returns ``(block, arrays)`` with arrays viewing the block."""
+    block = shared_memory.SharedMemory(name=layout["name"])
+    views = {
+        name: np.ndarray(layout["rows"], np.dtype(dtype), buffer=block.buf, offset=offset)
+        for name, dtype, offset in layout["fields"]
+    }
+    timestamps = views.pop("timestamps")
+    return block, {"timestamps": timestamps, "tz": layout["tz"], "columns": views}
+
+
+def run_symbol_jobs(symbol, arrays, jobs, capital, start_date=None, end_date=None, profile=False, cache=None):
+    """Run every (strategy, style) job for one symbol.
+
+    Returns ``(rows, profile)``, where ``profile`` is the worker's
+    ProfileReport as a dict when ``profile`` is set and None otherwise.
+    """
+    with profile_run(enabled=profile) as report:
+        rows = _symbol_rows(symbol, arrays, jobs, capital, start_date, end_date, cache)
+    return rows, report.to_dict() if profile else None
+
+
+def backtest_row(data, strategy_name, style, capital, start_date=None, end_date=None, cache=None, symbol=None):
+    """Backtest one strategy/style on a Date-indexed frame.
+
+    Returns ``(final_value, hodl_value, trades, cagr, max_drawdown, sharpe)``,
+    or None when the date range holds no bars. Missing dates default to the
+    first and last bar. With a ResultCache, repeated runs are read from it
+    and filed under ``symbol``.
+    """
+    start_date = start_date or data.index[0].date()
+    end_date = end_date or data.index[-1].date()
+    # The strategies only read the frame, so runs on the same data can share it
+    backtester = Backtester(data, STRATEGIES[strategy_name], capital, start_date, end_date, style)
+    if backtester.data.empty:
+        return None
+    if cache is not None:
+        final_value, hodl_value, positions = cache.run(backtester, fingerprint(backtester.data, symbol))
+    else:
+        final_value, hodl_value, positions = backtester.run_backtest_vectorized()
+    with stage("performance_summary"):
+        summary = performance_summary(calculate_equity_curve(backtester.data['Close'], positions, capital))
+    return (final_value, hodl_value, len(positions),
+            summary['CAGR'], summary['Max Drawdown'], summary['Sharpe'])
+
+
+def _symbol_rows(symbol, arrays, jobs, capital, start_date, end_date, cache=None):
+    data = frame_from_arrays(arrays)
+    if data.empty:
+        return []
+
+    rows = []
+    for strategy_name, style in jobs:
+        row = backtest_row(data, strategy_name, style, capital, start_date, end_date, cache, symbol)
+        if row is not None:
+            rows.append((symbol, strategy_name, style) + row)
+    return rows
+
+
+def run_batch(data, symbols=None, strategies=None, styles=None, capital=10000,
+              start_date=None, end_date=None, max_workers=None, cache=None):
+    """Backtest symbols x strategies x styles across a process pool.
+
+    The frame is split by symbol once and each worker receives one symbol's
+    arrays, running every strategy/style combination against them. Returns a
+    DataFrame with one row per job. When run inside ``profile_run`` the
+    workers profile their jobs too and their stages are merged into the
+    active report. Pass a ResultCache to reuse results of earlier runs.
+    """
+    strategies = list(strategies or STRATEGIES)
+    styles = list(styles or STYLES)
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{name}'. Choose from {list(STRATEGIES)}.")
+    jobs = [(name, style) for name in strategies for style in styles]
+
+    with stage("split_by_symbol"):
+        per_symbol = split_by_symbol(data, symbols)
+    report = active_report()
+    rows = []
+    if max_workers == 1:
+        # Inline jobs are timed straight into the active report
+        for symbol, arrays in per_symbol.items():
+            rows.extend(_symbol_rows(symbol, arrays, jobs, capital, start_date, end_date, cache))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(run_symbol_jobs, symbol, arrays, jobs, capital, start_date, end_date,
+                                report is not None, cache)
+                for symbol, arrays in per_symbol.items()
+            ]
+            for future in as_completed(futures):
+                symbol_rows, symbol_profile = future.result()
+                rows.extend(symbol_rows)
+                if symbol_profile is not None:
+                    report.merge(symbol_profile)
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return results.sort_values(["Symbol", "Strategy", "Style"], ignore_index=True)
+
+
+def _attach_worker(layout):
+    # Keep the block mapped for the worker's lifetime; every job reads the same frame
+    _worker["block"], arrays = attach_arrays(layout)
+    _worker["data"] = frame_from_arrays(arrays)
+
+
+def _compare_job(strategy_name, style, capital, start_date, end_date, cache):
+    return (strategy_name, style) + (backtest_row(_worker["data"], strategy_name, style, capital,
+                                                  start_date, end_date, cache) or (None,) * 6)
+
+
+def compare_strategies(data, capital, start_date=None, end_date=None, strategies=None, styles=None,
+                       max_workers=None, cache=None):
+    """Backtest every strategy x style on one symbol's data, yielding rows as each run finishes.
+
+    Each row is ``(strategy, style, final_value, hodl_value, trades, cagr,
+    max_drawdown, sharpe)``. The price arrays are copied once into shared
+    memory and every worker maps them, so no job gets its own copy of the
+    frame. With ``max_workers=1`` the runs happen in this process.
+    """
+    strategies = list(strategies or STRATEGIES)
+    styles = list(styles or STYLES)
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{name}'. Choose from {list(STRATEGIES)}.")
+    jobs = [(name, style) for name in strategies for style in styles]
+    arrays = frame_arrays(data)
+
+    if max_workers == 1:
+        shared = frame_from_arrays(arrays)
+        for name, style in jobs:
+            yield (name, style) + (backtest_row(shared, name, style, capital, start_date, end_date, cache)
+                                   or (None,) * 6)
+        return
+
+    block, layout = share_arrays(arrays)
+    del arrays
+    try:
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker, initargs=(layout,)) as executor:
+            futures = [
+                executor.submit(_compare_job, name, style, capital, start_date, end_date, cache)
+                for name, style in jobs
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def leaderboard(rows):
+    """Rank compare_strategies rows by final value, with each run's gain over buy and hold."""
+    board = pd.DataFrame(rows, columns=COMPARE_COLUMNS).dropna(subset=["Final Value"])
+    board["vs HODL"] = board["Final Value"] - board["HODL Value"]
+    return board[LEADERBOARD_COLUMNS].sort_values("Final Value", ascending=False, ignore_index=True)
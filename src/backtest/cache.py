@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.data.store import to_utc_index
+from src.utils.profiling import count
+
+# Bump when a change to the engine or strategies alters results, so old entries stop matching
+CACHE_VERSION = 1
+FINGERPRINT_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def fingerprint(data, symbol=None):
+    """Identify a Date-indexed price frame by its symbol, row count, last timestamp and a checksum of its bars.
+
+    The checksum covers the timestamps and every price column present, so any
+    restated or added bar changes it. ``symbol`` defaults to the frame's
+    Symbol column, if it has one.
+    """
+    if symbol is None and "Symbol" in data.columns and len(data):
+        symbol = str(data["Symbol"].iloc[0])
+    index = data.index
+    checksum = hashlib.blake2b(digest_size=16)
+    if isinstance(index, pd.DatetimeIndex):
+        checksum.update(str(index.tz).encode())
+        checksum.update(np.ascontiguousarray(index.as_unit("ns").asi8))
+    else:
+        # Date strings as read from a CSV with mixed UTC offsets
+        checksum.update(np.ascontiguousarray(to_utc_index(index).as_unit("ns").asi8))
+    for column in FINGERPRINT_COLUMNS:
+        if column in data.columns:
+            checksum.update(column.encode())
+            checksum.update(np.ascontiguousarray(data[column].to_numpy()))
+    return {
+        "symbol": symbol,
+        "rows": len(data),
+        "last_timestamp": str(index[-1]) if len(data) else None,
+        "checksum": checksum.hexdigest(),
+    }
+
+
+def strategy_parameters(strategy):
+    """The scalar settings of a strategy instance (windows, thresholds, capital, style, ensemble members)."""
+    return {
+        name: value for name, value in sorted(vars(strategy).items())
+        if isinstance(value, (bool, int, float, str, tuple))
+    }
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of backtest results with size-bounded LRU eviction.
+
+    Each result is a pickle under ``root/<symbol>/<key>.pkl``, where the key
+    hashes the data fingerprint, the strategy class and its parameters, the
+    management style, capital and date range. Hits refresh the file's mtime,
+    and once the cache grows past ``max_bytes`` the least recently used
+    entries are deleted. Files are replaced atomically, so worker processes
+    can share one cache directory.
+    """
+
+    def __init__(self, root="data/cache", max_bytes=256 * 2**20):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._bytes = None  # running total, measured on the first write
+
+    def key(self, backtester, data_fingerprint):
+        """Cache key of a Backtester's run over data with the given fingerprint."""
+        strategy_class = type(backtester.strategy)
+        parts = [
+            CACHE_VERSION,
+            data_fingerprint,
+            f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+            strategy_parameters(backtester.strategy),
+            backtester.management_style,
+            backtester.capital,
+            backtester.start_date.isoformat(),
+            backtester.end_date.isoformat(),
+        ]
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def _path(self, key, symbol):
+        directory = "_" if symbol is None else str(symbol).replace(os.sep, "_")
+        return os.path.join(self.root, directory, f"{key}.pkl")
+
+    def get(self, key, symbol=None):
+        """Return the cached value for ``key``, or None on a miss."""
+        path = self._path(key, symbol)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            # Missing, or evicted/cut short by another process
+            self.misses += 1
+            count("result_cache_misses")
+            return None
+        self.hits += 1
+        count("result_cache_hits")
+        return value
+
+    def put(self, key, value, symbol=None):
+        path = self._path(key, symbol)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+        self.writes += 1
+
+        if self._bytes is None:
+            self._bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._bytes += os.path.getsize(path)
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def run(self, backtester, data_fingerprint=None):
+        """Return ``backtester``'s results, running its vectorized backtest only on a cache miss.
+
+        On a hit the cash, holdings and positions are restored onto the
+        backtester, so ``get_ledger`` and friends work as after a real run.
+        The fingerprint defaults to that of the backtester's date-sliced data.
+        """
+        data_fingerprint = data_fingerprint or fingerprint(backtester.data)
+        key = self.key(backtester, data_fingerprint)
+        cached = self.get(key, data_fingerprint["symbol"])
+        if cached is not None:
+            backtester.cash, backtester.holdings, backtester.positions = cached
+            return backtester.get_results()
+        results = backtester.run_backtest_vectorized()
+        self.put(key, (backtester.cash, backtester.holdings, backtester.positions), data_fingerprint["symbol"])
+        return results
+
+    def _entries(self):
+        """(path, size, mtime) of every cached result."""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used entries until the cache fits in ``max_bytes`` (default: its limit)."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._bytes = total
+
+    def invalidate(self, symbol=None):
+        """Drop every cached result of ``symbol``, or of all symbols when None."""
+        path = self.root if symbol is None else os.path.dirname(self._path("", symbol))
+        shutil.rmtree(path, ignore_errors=True)
+        self._bytes = None
+
+    def stats(self):
+        """Hit/miss counts of this instance plus the entries and bytes on disk."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
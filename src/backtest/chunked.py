@@ -0,0 +1,91 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .backtester import date_bounds
+from .engine import get_trade_parameters, simulate_trades
+from .ledger import BUY, SELL, TradeLedger
+
+ChunkedResult = namedtuple('ChunkedResult', ['final_value', 'hodl_value', 'ledger', 'bars'])
+
+
+def chunk_signals(strategy_class, chunks, capital=10000, management_style="Moderate"):
+    """Yield ``(chunk, signals)`` for a stream of Date-indexed chunks.
+
+    Each chunk is prefixed with the last ``warmup_bars()`` bars of the data
+    before it, so rolling windows see exactly the history they would in one
+    in-memory frame; the signals of the carried-over bars are dropped again.
+    """
+    tail = None
+    warmup = None
+    for chunk in chunks:
+        frame = chunk if tail is None else pd.concat([tail, chunk])
+        strategy = strategy_class(frame, capital, investment_style=management_style)
+        if warmup is None:
+            warmup = strategy.warmup_bars()
+        signals = strategy.generate_signals().to_numpy()
+        yield chunk, signals[len(frame) - len(chunk):]
+        tail = frame.iloc[-warmup:] if warmup else frame.iloc[:0]
+
+
+def _in_range(chunks, start_date, end_date):
+    """Drop the bars of each chunk outside the backtest's inclusive date bounds."""
+    if start_date is None and end_date is None:
+        yield from chunks
+        return
+    lower = upper = None
+    for chunk in chunks:
+        if lower is None and upper is None:
+            lower, upper = date_bounds(start_date or end_date, end_date or start_date, chunk.index.tz)
+            lower = lower if start_date is not None else None
+            upper = upper if end_date is not None else None
+        mask = np.ones(len(chunk), dtype=bool)
+        if lower is not None:
+            mask &= chunk.index >= lower
+        if upper is not None:
+            mask &= chunk.index <= upper
+        if mask.any():
+            yield chunk[mask]
+
+
+def run_chunked_backtest(chunks, strategy_class, capital, management_style, start_date=None, end_date=None):
+    """Backtest a strategy over a stream of chunks in roughly constant memory.
+
+    ``chunks`` is any iterable of Date-indexed frames in time order, such as
+    ``read_csv_chunks`` or ``read_store_chunks``, optionally passed through
+    ``resample_chunks``. Bars outside ``start_date``..``end_date`` are skipped
+    with the same bounds as Backtester, and cash and holdings carry from one
+    chunk to the next. The final and HODL values match
+    ``Backtester.run_backtest_vectorized`` on the same data held in memory.
+    Returns a ChunkedResult whose trades are in a TradeLedger.
+    """
+    trade_fraction, min_signal_strength = get_trade_parameters(management_style)
+    cash, holdings = capital, 0
+    first_close = last_close = None
+    bars = 0
+    ledger = TradeLedger()
+
+    chunks = _in_range(chunks, start_date, end_date)
+    for chunk, signals in chunk_signals(strategy_class, chunks, capital, management_style):
+        close = chunk['Close'].to_numpy()
+        cash, holdings, fills = simulate_trades(close, signals, cash, trade_fraction, min_signal_strength, holdings)
+        if fills:
+            rows, actions, shares, prices = zip(*fills)
+            timestamps = chunk.index[list(rows)].as_unit('ns')
+            if ledger.tz is None:
+                ledger.tz = timestamps.tz
+            if timestamps.tz is not None:
+                timestamps = timestamps.tz_convert('UTC')
+            sides = np.where(np.asarray(actions) == 'Buy', BUY, SELL)
+            ledger.extend(timestamps.asi8, sides, shares, prices)
+        if first_close is None:
+            first_close = close[0]
+        last_close = close[-1]
+        bars += len(chunk)
+
+    if first_close is None:
+        raise ValueError("No bars to backtest in the given chunks and date range.")
+    final_value = cash + holdings * last_close
+    hodl_value = (capital / first_close) * last_close
+    return ChunkedResult(final_value, hodl_value, ledger, bars)
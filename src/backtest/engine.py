@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def get_trade_parameters(management_style):
+    """Return (trade_fraction, min_signal_strength) for a management style."""
+    if management_style == 'aggressive':
+        return 1.0, 0  # Use all available cash per trade, accept any signal
+    elif management_style == 'moderate':
+        return 0.5, 0.5  # Use half of available cash, accept moderate to strong signals
+    else:  # Passive
+        return 0.25, 1.0  # Use a quarter of available cash, only the strongest signals
+
+
+def simulate_trades(close, signals, capital, trade_fraction, min_signal_strength, holdings=0):
+    """Replay signals over close prices in a single pass over NumPy arrays.
+
+    Follows the same fill rules as ``Backtester.run_backtest`` and returns
+    ``(cash, holdings, fills)`` where ``fills`` is a list of
+    ``(bar_index, action, shares, price)`` tuples. Pass the cash and holdings
+    left by a previous call to continue a simulation over the next bars.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signals = np.ascontiguousarray(signals, dtype=np.float64)
+
+    buy_mask = (signals == 1) & (signals >= min_signal_strength)
+    sell_mask = (signals == -1) & ~(signals >= min_signal_strength)
+    events = np.flatnonzero(buy_mask | sell_mask)
+    is_buy = buy_mask[events]
+
+    # A sell always liquidates everything, so only the first sell of a run can fill
+    keep = is_buy.copy()
+    keep[1:] |= is_buy[:-1]
+    if len(keep):
+        keep[0] = True
+    events = events[keep]
+    is_buy = is_buy[keep]
+
+    cash = capital
+    fills = []
+    for i, buy, price in zip(events.tolist(), is_buy.tolist(), close[events].tolist()):
+        if buy:
+            if cash > 0:
+                shares = int((cash * trade_fraction) // price)
+                if shares > 0:
+                    holdings += shares
+                    cash -= shares * price
+                    fills.append((i, 'Buy', shares, price))
+        elif holdings > 0:
+            cash += holdings * price
+            fills.append((i, 'Sell', holdings, price))
+            holdings = 0
+
+    return cash, holdings, fills
+
+
+def equity_curve(close, fills, capital):
+    """Mark-to-market portfolio value at every bar from the fills of simulate_trades."""
+    close = np.asarray(close, dtype=np.float64)
+    cash_delta = np.zeros(len(close))
+    share_delta = np.zeros(len(close), dtype=np.int64)
+    if fills:
+        index, actions, shares, prices = zip(*fills)
+        index = np.asarray(index)
+        signed = np.where(np.asarray(actions) == 'Buy', 1, -1) * np.asarray(shares, dtype=np.int64)
+        np.add.at(share_delta, index, signed)
+        np.add.at(cash_delta, index, -signed * np.asarray(prices, dtype=np.float64))
+    return capital + np.cumsum(cash_delta) + np.cumsum(share_delta) * close
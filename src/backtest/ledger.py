@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+BUY, SELL = 1, -1
+LEDGER_DTYPE = np.dtype([('timestamp', 'i8'), ('side', 'i1'), ('shares', 'i8'), ('price', 'f8')])
+LOT_COLUMNS = ["Buy Date", "Sell Date", "Shares", "Buy Price", "Sell Price", "Profit/Loss", "Holding Period"]
+
+
+class TradeLedger:
+    """Compact trade log backed by a growable NumPy structured array.
+
+    Each trade takes 25 bytes (int64 UTC-nanosecond timestamp, int8 side,
+    int64 shares, float64 price) instead of a tuple of Python objects. The
+    buffer doubles when full, so appends are amortized O(1).
+    """
+
+    def __init__(self, capacity=1024, tz=None):
+        self._trades = np.empty(max(capacity, 1), dtype=LEDGER_DTYPE)
+        self._size = 0
+        self.tz = tz
+
+    @classmethod
+    def from_positions(cls, positions):
+        """Build a ledger from Backtester-style (date, action, shares, price) tuples."""
+        ledger = cls(capacity=len(positions))
+        if positions:
+            dates, actions, shares, prices = zip(*positions)
+            index = pd.DatetimeIndex(dates)
+            ledger.tz = index.tz
+            sides = np.where(np.asarray(actions) == 'Buy', BUY, SELL)
+            ledger.extend(index.as_unit('ns').asi8, sides, shares, prices)
+        return ledger
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def trades(self):
+        """View of the filled part of the buffer."""
+        return self._trades[:self._size]
+
+    @property
+    def nbytes(self):
+        return self.trades.nbytes
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > len(self._trades):
+            grown = np.empty(max(needed, 2 * len(self._trades)), dtype=LEDGER_DTYPE)
+            grown[:self._size] = self._trades[:self._size]
+            self._trades = grown
+
+    def append(self, timestamp, side, shares, price):
+        """Record one trade; ``timestamp`` is UTC nanoseconds or anything pd.Timestamp accepts."""
+        if not isinstance(timestamp, (int, np.integer)):
+            timestamp = pd.Timestamp(timestamp)
+            if self.tz is None:
+                self.tz = timestamp.tz
+            timestamp = timestamp.as_unit('ns').value
+        self._reserve(1)
+        self._trades[self._size] = (timestamp, side, shares, price)
+        self._size += 1
+
+    def extend(self, timestamps, sides, shares, prices):
+        """Record many trades at once from parallel arrays."""
+        n = len(timestamps)
+        self._reserve(n)
+        block = self._trades[self._size:self._size + n]
+        block['timestamp'] = timestamps
+        block['side'] = sides
+        block['shares'] = shares
+        block['price'] = prices
+        self._size += n
+
+    def dates(self, timestamps=None):
+        timestamps = self.trades['timestamp'] if timestamps is None else timestamps
+        index = pd.DatetimeIndex(np.asarray(timestamps).view('datetime64[ns]'))
+        return index.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else index
+
+    def to_frame(self):
+        """Export as a DataFrame whose columns are views of the ledger buffer (no copy)."""
+        trades = self.trades
+        return pd.DataFrame({name: trades[name] for name in LEDGER_DTYPE.names}, copy=False)
+
+    def to_positions(self):
+        """Backtester-style list of (date, action, shares, price) tuples."""
+        trades = self.trades
+        actions = np.where(trades['side'] == BUY, 'Buy', 'Sell')
+        return list(zip(self.dates(), actions.tolist(), trades['shares'].tolist(), trades['price'].tolist()))
+
+    def _fifo_lots(self):
+        """Overlap buy and sell share ranges on cumulative-share axes.
+
+        Returns each lot's size and the positions, within the buys and the
+        sells, of the trades it pairs.
+        """
+        trades = self.trades
+        is_buy = trades['side'] == BUY
+        bought = np.cumsum(trades['shares'][is_buy])
+        sold = np.cumsum(trades['shares'][~is_buy])
+        if len(sold):
+            # Long-only: shares sold so far can never exceed shares bought before each sell
+            bought_before = np.cumsum(np.where(is_buy, trades['shares'], 0))[~is_buy]
+            if (sold > bought_before).any():
+                raise ValueError("Ledger sells more shares than were bought before the sell.")
+
+        matched = sold[-1] if len(sold) else 0
+        edges = np.union1d(bought, sold)
+        edges = np.concatenate(([0], edges[edges <= matched]))
+        starts, shares = edges[:-1], np.diff(edges)
+        return shares, np.searchsorted(bought, starts, side='right'), np.searchsorted(sold, starts, side='right')
+
+    def match_fifo(self):
+        """Match sells against the oldest open buys and return one row per matched lot.
+
+        The lots come from one sort and two ``searchsorted`` calls over the
+        cumulative bought and sold shares rather than a per-trade queue. Each
+        row has the lot's dates, size, prices, realized P/L and holding period.
+        """
+        trades = self.trades
+        is_buy = trades['side'] == BUY
+        buys, sells = trades[is_buy], trades[~is_buy]
+        shares, buy_lot, sell_lot = self._fifo_lots()
+
+        buy_price, sell_price = buys['price'][buy_lot], sells['price'][sell_lot]
+        buy_time, sell_time = buys['timestamp'][buy_lot], sells['timestamp'][sell_lot]
+        return pd.DataFrame({
+            "Buy Date": self.dates(buy_time),
+            "Sell Date": self.dates(sell_time),
+            "Shares": shares,
+            "Buy Price": buy_price,
+            "Sell Price": sell_price,
+            "Profit/Loss": shares * (sell_price - buy_price),
+            "Holding Period": pd.to_timedelta(sell_time - buy_time, unit='ns'),
+        }, columns=LOT_COLUMNS)
+
+    def realized_pnl(self):
+        """Realized P/L and FIFO average cost of every trade, aligned with the ledger (zero/NaN for buys)."""
+        trades = self.trades
+        is_buy = trades['side'] == BUY
+        shares, buy_lot, sell_lot = self._fifo_lots()
+        cost = shares * trades['price'][is_buy][buy_lot]
+        rows = np.flatnonzero(~is_buy)[sell_lot]
+
+        pnl = np.zeros(len(trades))
+        matched_cost = np.zeros(len(trades))
+        matched_shares = np.zeros(len(trades))
+        np.add.at(pnl, rows, shares * trades['price'][rows] - cost)
+        np.add.at(matched_cost, rows, cost)
+        np.add.at(matched_shares, rows, shares)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            average_cost = np.where(matched_shares > 0, matched_cost / matched_shares, np.nan)
+        return pnl, average_cost
@@ -0,0 +1,256 @@
+import asyncio
+import time
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import split_by_symbol
+from .engine import get_trade_parameters
+from src.strategies.registry import get_strategy
+from src.utils.profiling import stage
+
+PaperResult = namedtuple('PaperResult', ['summary', 'fills', 'stats'])
+SUMMARY_COLUMNS = ["Symbol", "Bars", "Trades", "Cash", "Holdings", "Last Close", "Final Value", "HODL Value"]
+FILL_COLUMNS = ["Symbol", "Date", "Action", "Shares", "Price"]
+
+
+async def replay(data, speed=None, symbols=None):
+    """Stream the bars of a Symbol-keyed frame in time order as ``(symbol, timestamp, bar, released)``.
+
+    ``data`` is any frame load_data or read_from_store returns, e.g. a
+    combined country CSV. ``timestamp`` is in UTC nanoseconds, ``bar`` a dict
+    with Close (and Volume, when every symbol has it) as strategies' update()
+    takes it, and ``released`` the perf_counter_ns at which the bar was due.
+    With a ``speed`` the feed keeps market time, accelerated that many times
+    (e.g. 60 releases one-minute bars every second); without one it releases
+    each timestamp's bars as soon as the previous ones have been handed over.
+    """
+    arrays = split_by_symbol(data, symbols)
+    if not arrays:
+        return
+    names = list(arrays)
+    lengths = [len(a["timestamps"]) for a in arrays.values()]
+    columns = [c for c in ("Close", "Volume") if all(c in a["columns"] for a in arrays.values())]
+    timestamps = np.concatenate([a["timestamps"] for a in arrays.values()])
+    codes = np.repeat(np.arange(len(names)), lengths)
+    values = [np.concatenate([a["columns"][c] for a in arrays.values()]) for c in columns]
+
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order].tolist()
+    codes = codes[order].tolist()
+    values = [v[order].tolist() for v in values]
+    # Rows where a new timestamp starts; all bars of one timestamp are released together
+    starts = np.flatnonzero(np.diff(timestamps, prepend=timestamps[0] - 1)).tolist() + [len(timestamps)]
+
+    start_ns = time.perf_counter_ns()
+    for lo, hi in zip(starts, starts[1:]):
+        if speed:
+            released = start_ns + int((timestamps[lo] - timestamps[0]) / speed)
+            delay = released - time.perf_counter_ns()
+            await asyncio.sleep(max(delay, 0) / 1e9)
+        else:
+            await asyncio.sleep(0)  # let the consumers catch up between timestamps
+            released = time.perf_counter_ns()
+        for i in range(lo, hi):
+            yield names[codes[i]], timestamps[i], {c: v[i] for c, v in zip(columns, values)}, released
+
+
+class LatencyHistogram:
+    """Latency counts in log-spaced buckets, so a session of any length takes constant memory.
+
+    Buckets run from 1 microsecond to 100 seconds, 20 per factor of ten, so
+    a percentile (reported as its bucket's upper edge) is within 12% of the
+    exact value.
+    """
+
+    BUCKETS_PER_DECADE = 20
+
+    def __init__(self, low_ns=1_000, decades=8):
+        exponents = np.arange(1, decades * self.BUCKETS_PER_DECADE + 1) / self.BUCKETS_PER_DECADE
+        self.edges = (low_ns * 10 ** exponents).tolist()
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, nanoseconds):
+        self.counts[bisect_left(self.edges, nanoseconds)] += 1
+        self.count += 1
+        self.total_ns += nanoseconds
+        if nanoseconds > self.max_ns:
+            self.max_ns = nanoseconds
+
+    def percentile(self, q):
+        """Upper bound in nanoseconds of the ``q``-th percentile latency (0 if nothing was recorded)."""
+        if not self.count:
+            return 0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q / 100 * self.count))
+        return min(self.edges[bucket], self.max_ns) if bucket < len(self.edges) else self.max_ns
+
+    def to_frame(self):
+        """The non-empty buckets as a frame of upper edges in microseconds and counts."""
+        edges = self.edges + [float("inf")]
+        rows = [(edges[i] / 1e3, n) for i, n in enumerate(self.counts) if n]
+        return pd.DataFrame(rows, columns=["Up To us", "Bars"])
+
+
+class PaperAccount:
+    """Cash and shares of one symbol, filled one signal at a time with the Backtester's rules.
+
+    A buy spends ``trade_fraction`` of the cash on whole shares and a sell
+    liquidates the holding, with the same signal-strength filter as
+    ``simulate_trades``, so the fills match a backtest of the same signals.
+    """
+
+    def __init__(self, capital, management_style):
+        self.capital = capital
+        self.trade_fraction, self.min_signal_strength = get_trade_parameters(management_style)
+        self.cash = capital
+        self.holdings = 0
+        self.bars = 0
+        self.trades = 0
+        self.first_close = None
+        self.last_close = None
+
+    def on_signal(self, price, signal):
+        """Apply one bar's signal at its close; returns ``(action, shares)`` of the fill, or None."""
+        self.bars += 1
+        if self.first_close is None:
+            self.first_close = price
+        self.last_close = price
+        if signal == 1 and signal >= self.min_signal_strength:
+            if self.cash > 0:
+                shares = int((self.cash * self.trade_fraction) // price)
+                if shares > 0:
+                    self.holdings += shares
+                    self.cash -= shares * price
+                    self.trades += 1
+                    return 'Buy', shares
+        elif signal == -1 and not signal >= self.min_signal_strength and self.holdings > 0:
+            shares, self.holdings = self.holdings, 0
+            self.cash += shares * price
+            self.trades += 1
+            return 'Sell', shares
+        return None
+
+    @property
+    def value(self):
+        return self.cash + self.holdings * (self.last_close or 0)
+
+
+class PaperTrader:
+    """Drive one strategy instance per symbol from an async bar feed and paper-trade its signals.
+
+    Every symbol gets a consumer task with a queue of at most ``queue_size``
+    bars. The dispatcher waits on a full queue rather than dropping bars or
+    growing memory, so a consumer that falls behind (e.g. a slow ``on_fill``
+    coroutine sending orders somewhere) slows the feed down; those waits
+    are counted in the stats. The latency of a bar runs from its release by
+    the feed until its signal has been traded and any ``on_fill`` awaited.
+    """
+
+    def __init__(self, strategy, capital=10000, management_style="Moderate", queue_size=64, on_fill=None):
+        self.strategy_class = get_strategy(strategy) if isinstance(strategy, str) else strategy
+        self.capital = capital
+        self.management_style = management_style
+        self.queue_size = queue_size
+        self.on_fill = on_fill
+        self.accounts = {}
+        self.fills = []
+        self.latency = LatencyHistogram()
+        self.backpressure_waits = 0
+        self.blocked_ns = 0
+        self.seconds = 0.0
+
+    async def _consume(self, symbol, queue):
+        strategy = self.strategy_class(pd.DataFrame(), self.capital, investment_style=self.management_style)
+        account = self.accounts[symbol] = PaperAccount(self.capital, self.management_style)
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            timestamp, bar, released = item
+            fill = account.on_signal(bar['Close'], strategy.update(bar))
+            if fill is not None:
+                fill = (symbol, timestamp, fill[0], fill[1], bar['Close'])
+                self.fills.append(fill)
+                if self.on_fill is not None:
+                    await self.on_fill(fill)
+            self.latency.record(time.perf_counter_ns() - released)
+
+    async def run(self, feed):
+        """Consume an async feed of ``(symbol, timestamp, bar, released)``, e.g. from ``replay``."""
+        queues = {}
+        consumers = []
+        start = time.perf_counter()
+        try:
+            async for symbol, timestamp, bar, released in feed:
+                queue = queues.get(symbol)
+                if queue is None:
+                    queue = queues[symbol] = asyncio.Queue(self.queue_size)
+                    consumers.append(asyncio.create_task(self._consume(symbol, queue)))
+                item = (timestamp, bar, released)
+                if queue.full():
+                    self.backpressure_waits += 1
+                    blocked = time.perf_counter_ns()
+                    await queue.put(item)
+                    self.blocked_ns += time.perf_counter_ns() - blocked
+                else:
+                    queue.put_nowait(item)
+            for queue in queues.values():
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            self.seconds = time.perf_counter() - start
+
+    def summary(self):
+        """One row per symbol with its bars, trades and final and HODL values."""
+        rows = [
+            (symbol, a.bars, a.trades, a.cash, a.holdings, a.last_close, a.value,
+             self.capital / a.first_close * a.last_close)
+            for symbol, a in self.accounts.items()
+        ]
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+    def fills_frame(self, tz=None):
+        """Every fill so far in time order, with its UTC nanosecond timestamp as a Date in ``tz``."""
+        fills = pd.DataFrame(self.fills, columns=FILL_COLUMNS)
+        fills["Date"] = pd.to_datetime(fills["Date"].astype("int64"), utc=True)
+        if tz is not None:
+            fills["Date"] = fills["Date"].dt.tz_convert(tz)
+        return fills.sort_values(["Date", "Symbol"], kind="stable", ignore_index=True)
+
+    def stats(self):
+        """Throughput, p50/p99/max per-bar latency and backpressure of the last run."""
+        bars = self.latency.count
+        return {
+            "symbols": len(self.accounts),
+            "bars": bars,
+            "fills": len(self.fills),
+            "seconds": self.seconds,
+            "bars_per_second": bars / self.seconds if self.seconds else 0.0,
+            "p50_us": self.latency.percentile(50) / 1e3,
+            "p99_us": self.latency.percentile(99) / 1e3,
+            "max_us": self.latency.max_ns / 1e3,
+            "backpressure_waits": self.backpressure_waits,
+            "blocked_s": self.blocked_ns / 1e9,
+        }
+
+
+def run_paper(data, strategy, capital=10000, management_style="Moderate", speed=None, symbols=None,
+              queue_size=64, on_fill=None):
+    """Replay a Symbol-keyed frame through a PaperTrader and return a PaperResult.
+
+    See ``replay`` for ``speed`` and PaperTrader for the other arguments.
+    Must be called outside a running event loop; inside one, await
+    ``PaperTrader.run(replay(...))`` instead.
+    """
+    trader = PaperTrader(strategy, capital, management_style, queue_size, on_fill)
+    with stage("paper_trading"):
+        asyncio.run(trader.run(replay(data, speed, symbols)))
+    tz = data.index.tz if isinstance(data.index, pd.DatetimeIndex) else None
+    return PaperResult(trader.summary(), trader.fills_frame(tz), trader.stats())
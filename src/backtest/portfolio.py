@@ -0,0 +1,165 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .engine import get_trade_parameters
+from src.data.store import to_utc_index
+
+Panel = namedtuple('Panel', ['index', 'symbols', 'close', 'volume'])
+PortfolioResult = namedtuple('PortfolioResult', ['equity', 'cash', 'holdings', 'trades', 'hodl_value'])
+
+
+def build_panel(data, symbols=None):
+    """Scatter a Symbol-keyed frame into (time x symbol) Close and Volume matrices.
+
+    Rows are the sorted union of all timestamps; a symbol has NaN wherever it
+    has no bar (before listing, after delisting or on its own holidays).
+    """
+    if symbols is not None:
+        data = data[data['Symbol'].isin(symbols)]
+    timestamps = to_utc_index(data.index)
+    if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+        timestamps = timestamps.tz_convert(data.index.tz)
+    rows, index = pd.factorize(timestamps, sort=True)
+    cols, symbol_index = pd.factorize(data['Symbol'], sort=True)
+
+    shape = (len(index), len(symbol_index))
+    close = np.full(shape, np.nan)
+    close[rows, cols] = data['Close'].to_numpy(dtype=np.float64)
+    volume = None
+    if 'Volume' in data.columns:
+        volume = np.full(shape, np.nan)
+        volume[rows, cols] = data['Volume'].to_numpy(dtype=np.float64)
+    return Panel(pd.DatetimeIndex(index, name='Date'), list(symbol_index), close, volume)
+
+
+def signal_matrix(panel, strategy_class, investment_style="Moderate", capital=10000):
+    """Run a strategy over each symbol's listed span and return a (time x symbol) int8 signal matrix.
+
+    Each column is handed to the strategy as its contiguous run of bars from
+    first to last listed row, so rolling windows never straddle the gap before
+    listing or after delisting. Rows where a symbol does not trade stay 0.
+    """
+    signals = np.zeros(panel.close.shape, dtype=np.int8)
+    valid = ~np.isnan(panel.close)
+    for j in range(panel.close.shape[1]):
+        rows = np.flatnonzero(valid[:, j])
+        if not len(rows):
+            continue
+        columns = {'Close': panel.close[rows, j]}
+        if panel.volume is not None:
+            columns['Volume'] = panel.volume[rows, j]
+        frame = pd.DataFrame(columns, index=panel.index[rows])
+        strategy = strategy_class(frame, capital, investment_style=investment_style)
+        signals[rows, j] = strategy.generate_signals().to_numpy()
+    return signals
+
+
+def _forward_fill(matrix):
+    """Carry the last non-NaN value of each column forward."""
+    valid = ~np.isnan(matrix)
+    last = np.where(valid, np.arange(len(matrix))[:, None], 0)
+    np.maximum.accumulate(last, axis=0, out=last)
+    filled = matrix[last, np.arange(matrix.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def simulate_portfolio(panel, signals, capital, management_style):
+    """Trade a basket of symbols out of one shared cash pool.
+
+    At each bar, sells are filled first (liquidating the whole position, as in
+    Backtester), then ``trade_fraction`` of the remaining cash is split evenly
+    across that bar's buy signals. Positions still open on a symbol's last
+    listed bar are liquidated there. Only bars with an event are visited; the
+    equity curve is then marked to market for every bar in one vectorized step.
+    """
+    close = panel.close
+    n_bars, n_symbols = close.shape
+    trade_fraction, min_signal_strength = get_trade_parameters(management_style)
+
+    valid = ~np.isnan(close)
+    buy = valid & (signals == 1) & (signals >= min_signal_strength)
+    sell = valid & (signals == -1) & ~(signals >= min_signal_strength)
+    last_row = np.where(valid.any(axis=0), n_bars - 1 - np.argmax(valid[::-1], axis=0), -1)
+    delist = np.zeros_like(valid)
+    listed = last_row >= 0
+    delist[last_row[listed], np.flatnonzero(listed)] = True
+    event_rows = np.flatnonzero((buy | sell | delist).any(axis=1))
+
+    cash = float(capital)
+    holdings = np.zeros(n_symbols, dtype=np.int64)
+    cash_after = np.empty(len(event_rows))
+    holdings_after = np.empty((len(event_rows), n_symbols), dtype=np.int64)
+    trades = []
+
+    for k, t in enumerate(event_rows):
+        prices = close[t]
+
+        selling = sell[t] & (holdings > 0)
+        if selling.any():
+            cash += float(np.dot(holdings[selling], prices[selling]))
+            trades.append((t, np.flatnonzero(selling), -1, holdings[selling], prices[selling]))
+            holdings[selling] = 0
+
+        buying = buy[t]
+        n_buys = int(buying.sum())
+        if n_buys and cash > 0:
+            budget = cash * trade_fraction / n_buys
+            shares = (budget // prices[buying]).astype(np.int64)
+            filled = shares > 0
+            if filled.any():
+                symbols = np.flatnonzero(buying)[filled]
+                holdings[symbols] += shares[filled]
+                cash -= float(np.dot(shares[filled], prices[symbols]))
+                trades.append((t, symbols, 1, shares[filled], prices[symbols]))
+
+        closing = delist[t] & (holdings > 0)
+        if closing.any():
+            cash += float(np.dot(holdings[closing], prices[closing]))
+            trades.append((t, np.flatnonzero(closing), -1, holdings[closing], prices[closing]))
+            holdings[closing] = 0
+
+        cash_after[k] = cash
+        holdings_after[k] = holdings
+
+    # Mark to market: state after the latest event at or before each bar, valued at last known prices
+    state = np.searchsorted(event_rows, np.arange(n_bars), side='right') - 1
+    has_state = state >= 0
+    cash_curve = np.where(has_state, cash_after[np.maximum(state, 0)], float(capital))
+    held = np.where(has_state[:, None], holdings_after[np.maximum(state, 0)], 0)
+    marks = np.nan_to_num(_forward_fill(close))
+    equity = pd.Series(cash_curve + (held * marks).sum(axis=1), index=panel.index, name='Equity')
+
+    # Equal-weight buy and hold of each symbol over its own listed span
+    first_row = np.argmax(valid, axis=0)
+    per_symbol = capital / max(int(listed.sum()), 1)
+    first_price = close[first_row[listed], np.flatnonzero(listed)]
+    last_price = close[last_row[listed], np.flatnonzero(listed)]
+    hodl_value = float((per_symbol / first_price * last_price).sum())
+
+    return PortfolioResult(equity, cash, holdings, _trade_frame(panel, trades), hodl_value)
+
+
+def _trade_frame(panel, trades):
+    """Flatten the per-bar fill batches into a Date/Symbol/Action/Shares/Price table."""
+    if not trades:
+        return pd.DataFrame(columns=["Date", "Symbol", "Action", "Shares", "Price"])
+    rows = np.concatenate([np.full(len(symbols), t) for t, symbols, _, _, _ in trades])
+    symbols = np.concatenate([symbols for _, symbols, _, _, _ in trades])
+    sides = np.concatenate([np.full(len(s), side, dtype=np.int8) for _, s, side, _, _ in trades])
+    return pd.DataFrame({
+        "Date": panel.index[rows],
+        "Symbol": np.asarray(panel.symbols, dtype=object)[symbols],
+        "Action": np.where(sides == 1, "Buy", "Sell"),
+        "Shares": np.concatenate([shares for _, _, _, shares, _ in trades]),
+        "Price": np.concatenate([prices for _, _, _, _, prices in trades]),
+    })
+
+
+def run_portfolio(data, strategy_class, capital, management_style, symbols=None):
+    """Build the panel, generate signals with ``strategy_class`` and simulate the shared-cash basket."""
+    panel = build_panel(data, symbols)
+    signals = signal_matrix(panel, strategy_class, management_style, capital)
+    return simulate_portfolio(panel, signals, capital, management_style)
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from .batch import STRATEGIES
+from .portfolio import build_panel
+from src.strategies.indicators import band_signals, bollinger_bands, crossover_signals, macd, rolling_mean, rsi, vwap
+from src.utils.profiling import stage
+
+SCREEN_COLUMNS = ["Rank", "Symbol", "Strategy", "Date", "Close", "Signal", "Action", "Indicator", "Distance"]
+ACTIONS = {1: "Buy", -1: "Sell", 0: "Hold"}
+
+
+def align_to_last_bar(panel):
+    """Right-align each symbol's bars so every column ends in its latest bar.
+
+    Gaps (holidays, late listing) are squeezed out and the rows freed at the
+    top are NaN, so rolling windows over a column see exactly the contiguous
+    history a per-symbol backtest would. Returns ``(close, volume, last_row)``,
+    where ``last_row`` is each symbol's latest row in the panel (-1 if none).
+    """
+    valid = ~np.isnan(panel.close)
+    # A stable sort of the valid flags moves each column's gaps to the top, keeping its bars in time order
+    order = np.argsort(valid, axis=0, kind='stable')
+    n_bars = valid.sum(axis=0)
+    last_row = np.where(n_bars > 0, len(valid) - 1 - np.argmax(valid[::-1], axis=0), -1)
+    close = np.take_along_axis(panel.close, order, axis=0)
+    volume = None if panel.volume is None else np.take_along_axis(panel.volume, order, axis=0)
+    return close, volume, last_row
+
+
+def _screen_bollinger(strategy, close, volume):
+    bands = bollinger_bands(close, strategy.window, strategy.num_std_dev)
+    signals = band_signals(close, bands.lower, bands.upper)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = strategy.num_std_dev * (close - bands.middle) / (bands.upper - bands.middle)
+    # Standard deviations beyond the nearer band
+    return z_score, signals, np.abs(z_score) - strategy.num_std_dev
+
+
+def _screen_sma(strategy, close, volume):
+    short_ma = rolling_mean(close, strategy.short_window)
+    long_ma = rolling_mean(close, strategy.long_window)
+    gap = short_ma / long_ma - 1
+    return gap, crossover_signals(short_ma, long_ma), np.abs(gap)
+
+
+def _screen_macd(strategy, close, volume):
+    result = macd(close, strategy.short_window, strategy.long_window, strategy.signal_window)
+    histogram = result.macd - result.signal_line
+    # Relative to the price, so symbols trading at different levels compare
+    return histogram, crossover_signals(result.macd, result.signal_line), np.abs(histogram) / close
+
+
+def _screen_rsi(strategy, close, volume):
+    value = rsi(close, strategy.rsi_window)
+    # The aligned matrix pads short histories with NaN rows on top, which rsi() counts as flat bars
+    padding = np.isnan(close).sum(axis=0)
+    value[np.arange(len(close))[:, None] < padding + strategy.rsi_window - 1] = np.nan
+    signals = band_signals(value, strategy.oversold, strategy.overbought)
+    return value, signals, np.maximum(strategy.oversold - value, value - strategy.overbought)
+
+
+def _screen_vwap(strategy, close, volume):
+    if volume is None:
+        raise ValueError("Screening with VWAP needs a Volume column.")
+    rolling_vwap = vwap(close, volume, strategy.vwap_window)
+    gap = close / rolling_vwap - 1
+    return gap, crossover_signals(close, rolling_vwap), np.abs(gap)
+
+
+# Strategy name -> function returning (indicator, signals, distance to threshold) matrices
+SCREENS = {
+    "Bollinger Band": _screen_bollinger,
+    "Simple Moving Avg": _screen_sma,
+    "MACD": _screen_macd,
+    "RSI": _screen_rsi,
+    "VWAP": _screen_vwap,
+}
+
+
+def screen(data, strategies=None, style="Moderate", symbols=None, capital=10000):
+    """Rank a whole universe by each strategy's signal on its latest bar.
+
+    ``data`` is a Symbol-keyed frame such as the combined country file. It is
+    scattered once into a (time x symbol) panel and every indicator is computed
+    for all symbols together over the strategy's warm-up window, with signals
+    matching the strategy's own generate_signals on each symbol's history. Returns one row per symbol and
+    strategy with the latest Signal, the Indicator behind it and its Distance
+    past the signal's threshold (negative when no signal has triggered yet):
+
+    * Bollinger Band: z-score of the close; distance in standard deviations beyond the band
+    * Simple Moving Avg: short/long average - 1; distance is the size of that gap
+    * MACD: MACD minus signal line; distance as a fraction of the close
+    * RSI: the RSI; distance in points past 30 (buy) or 70 (sell)
+    * VWAP: close/VWAP - 1; distance is the size of that gap
+
+    Within each strategy, buys rank first, then sells, then holds, each by
+    descending distance.
+    """
+    strategies = list(strategies or SCREENS)
+    for name in strategies:
+        if name not in SCREENS:
+            raise ValueError(f"Unknown strategy '{name}'. Choose from {list(SCREENS)}.")
+    if "Symbol" not in data.columns:
+        raise ValueError("Screening needs a 'Symbol' column.")
+
+    with stage("build_panel"):
+        panel = build_panel(data, symbols)
+        close, volume, last_row = align_to_last_bar(panel)
+    listed = np.flatnonzero(last_row >= 0)
+    symbol_names = np.asarray(panel.symbols, dtype=object)[listed]
+    dates = panel.index[last_row[listed]]
+    latest_close = close[-1, listed]
+
+    frames = []
+    for name in strategies:
+        strategy = STRATEGIES[name](pd.DataFrame(), capital, investment_style=style)
+        # The latest signal only depends on the last warmup_bars() of each history
+        tail = slice(-strategy.warmup_bars(), None)
+        with stage(f"screen_{name}"):
+            indicator, signals, distance = SCREENS[name](
+                strategy, close[tail], None if volume is None else volume[tail])
+        signal = signals[-1, listed]
+        frame = pd.DataFrame({
+            "Symbol": symbol_names,
+            "Strategy": name,
+            "Date": dates,
+            "Close": latest_close,
+            "Signal": signal,
+            "Action": pd.Series(signal).map(ACTIONS).to_numpy(),
+            "Indicator": indicator[-1, listed],
+            "Distance": distance[-1, listed],
+        })
+        order = np.lexsort((-np.nan_to_num(frame["Distance"].to_numpy(), nan=-np.inf), _signal_order(signal)))
+        frame = frame.iloc[order].reset_index(drop=True)
+        frame.insert(0, "Rank", np.arange(1, len(frame) + 1))
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=SCREEN_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[SCREEN_COLUMNS]
+
+
+def _signal_order(signal):
+    """Sort key putting buys before sells before holds."""
+    return np.select([signal == 1, signal == -1], [0, 1], 2)
@@ -0,0 +1,71 @@
+from itertools import product
+
+import pandas as pd
+
+from .engine import get_trade_parameters, simulate_trades
+from src.strategies.indicators import IndicatorCache, band_signals, crossover_signals
+
+
+def bollinger_signals(cache, window, num_std_dev):
+    upper, lower = cache.bollinger_bands(window, num_std_dev)
+    return band_signals(cache.close, lower, upper)
+
+
+def sma_signals(cache, short_window, long_window):
+    return crossover_signals(cache.rolling_mean(short_window), cache.rolling_mean(long_window))
+
+
+def macd_signals(cache, short_window, long_window, signal_window):
+    macd, signal_line = cache.macd(short_window, long_window, signal_window)
+    return crossover_signals(macd, signal_line)
+
+
+def rsi_signals(cache, rsi_window):
+    return band_signals(cache.rsi(rsi_window), 30, 70)
+
+
+def vwap_signals(cache, vwap_window):
+    return crossover_signals(cache.close, cache.vwap(vwap_window))
+
+
+# Strategy name -> (signal function, parameter names in the order the function takes them)
+SWEEPS = {
+    "Bollinger Band": (bollinger_signals, ("window", "num_std_dev")),
+    "Simple Moving Avg": (sma_signals, ("short_window", "long_window")),
+    "MACD": (macd_signals, ("short_window", "long_window", "signal_window")),
+    "RSI": (rsi_signals, ("rsi_window",)),
+    "VWAP": (vwap_signals, ("vwap_window",)),
+}
+
+
+def sweep(data, strategy, grid, capital=10000, management_style="Moderate", cache=None):
+    """Evaluate a strategy over every point of a parameter grid.
+
+    ``grid`` maps each of the strategy's parameter names to the values to try,
+    e.g. ``{"short_window": range(5, 101), "long_window": range(50, 301, 10)}``
+    for "Simple Moving Avg". Indicators come from a shared IndicatorCache, so
+    each distinct window is computed once however many grid points use it.
+    Returns a DataFrame ranked by final portfolio value.
+    """
+    if strategy not in SWEEPS:
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose from {list(SWEEPS)}.")
+    signal_function, param_names = SWEEPS[strategy]
+    missing = [name for name in param_names if name not in grid]
+    if missing:
+        raise ValueError(f"Grid for '{strategy}' is missing parameters: {missing}")
+
+    if cache is None:
+        volume = data['Volume'].to_numpy() if 'Volume' in data.columns else None
+        cache = IndicatorCache(data['Close'].to_numpy(), volume)
+    close = cache.close
+    trade_fraction, min_signal_strength = get_trade_parameters(management_style)
+    hodl_value = (capital / close[0]) * close[-1]
+
+    rows = []
+    for params in product(*(grid[name] for name in param_names)):
+        signals = signal_function(cache, *params)
+        cash, holdings, fills = simulate_trades(close, signals, capital, trade_fraction, min_signal_strength)
+        rows.append(params + (cash + holdings * close[-1], hodl_value, len(fills)))
+
+    results = pd.DataFrame(rows, columns=list(param_names) + ["Final Value", "HODL Value", "Trades"])
+    return results.sort_values("Final Value", ascending=False, kind="stable", ignore_index=True)
@@ -0,0 +1,121 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .batch import STRATEGIES, STYLES
+from .engine import equity_curve, get_trade_parameters, simulate_trades
+from .sweep import SWEEPS
+from src.strategies.indicators import IndicatorCache
+
+WalkForwardResult = namedtuple('WalkForwardResult', ['folds', 'equity'])
+
+# Per-process indicator cache over the full history, built once by _init_worker
+_worker_cache = None
+
+
+def walk_forward_windows(index, train=pd.DateOffset(years=2), test=pd.DateOffset(months=6), step=None):
+    """Return (train_start, train_end, test_end) row positions for each fold.
+
+    Folds are ``train`` long, followed by a ``test`` slice, and advance by
+    ``step`` (default: the test length). Boundaries are found with
+    ``searchsorted`` on the sorted index, so each window is a pair of slices.
+    """
+    step = step or test
+    windows = []
+    start = index[0]
+    while True:
+        train_end_time = start + train
+        a = index.searchsorted(start, side='left')
+        b = index.searchsorted(train_end_time, side='left')
+        c = index.searchsorted(train_end_time + test, side='left')
+        if b >= len(index) or c <= b:
+            break
+        windows.append((a, b, c))
+        start = start + step
+    return windows
+
+
+def style_parameters(strategy, style):
+    """Parameters a strategy class picks for an investment style, keyed like the sweep grids."""
+    instance = STRATEGIES[strategy](None, 0, investment_style=style)
+    return {name: getattr(instance, name) for name in SWEEPS[strategy][1]}
+
+
+def _init_worker(close, volume):
+    global _worker_cache
+    _worker_cache = IndicatorCache(close, volume)
+
+
+def _simulate(strategy, params, management_style, capital, lo, hi):
+    signal_function, param_names = SWEEPS[strategy]
+    signals = signal_function(_worker_cache, *(params[name] for name in param_names))
+    close = _worker_cache.close[lo:hi]
+    trade_fraction, min_signal_strength = get_trade_parameters(management_style)
+    cash, holdings, fills = simulate_trades(close, signals[lo:hi], capital, trade_fraction, min_signal_strength)
+    return cash + holdings * close[-1], close, fills
+
+
+def _run_fold(strategy, candidates, capital, window):
+    """Pick the best candidate on the train slice and replay it on the test slice."""
+    train_start, train_end, test_end = window
+    scores = [_simulate(strategy, params, style, capital, train_start, train_end)[0]
+              for _, params, style in candidates]
+    best = int(np.argmax(scores))
+    label, params, style = candidates[best]
+    test_value, close, fills = _simulate(strategy, params, style, capital, train_end, test_end)
+    return label, scores[best], test_value, equity_curve(close, fills, capital)
+
+
+def walk_forward(data, strategy, capital=10000, train=pd.DateOffset(years=2), test=pd.DateOffset(months=6),
+                 step=None, styles=None, grid=None, management_style="Moderate", max_workers=None):
+    """Walk-forward out-of-sample evaluation of a strategy.
+
+    On every fold the best candidate is chosen by final value on the train
+    slice and then run on the following test slice. Candidates are the
+    investment styles (default) or, when ``grid`` is given, every point of a
+    sweep grid traded with ``management_style``. Folds run in parallel; each
+    worker computes the full-history indicators once, and because they are
+    causal, a test slice's signals only depend on bars before it.
+
+    Returns the per-fold table and the out-of-sample equity curve, with each
+    fold compounded onto the previous fold's ending value.
+    """
+    if strategy not in SWEEPS:
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose from {list(SWEEPS)}.")
+    if grid is not None:
+        names = SWEEPS[strategy][1]
+        points = pd.MultiIndex.from_product([grid[name] for name in names], names=names)
+        candidates = [(str(point), dict(zip(names, point)), management_style) for point in points]
+    else:
+        candidates = [(style, style_parameters(strategy, style), style) for style in (styles or STYLES)]
+
+    index = data.index
+    if not index.is_monotonic_increasing:
+        raise ValueError("Walk-forward evaluation needs data sorted by date.")
+    windows = walk_forward_windows(index, train, test, step)
+    close = data['Close'].to_numpy(dtype=np.float64)
+    volume = data['Volume'].to_numpy(dtype=np.float64) if 'Volume' in data.columns else None
+
+    if max_workers == 1:
+        _init_worker(close, volume)
+        outcomes = [_run_fold(strategy, candidates, capital, window) for window in windows]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(close, volume)) as executor:
+            outcomes = list(executor.map(_run_fold, [strategy] * len(windows), [candidates] * len(windows),
+                                         [capital] * len(windows), windows))
+
+    rows, curves, level = [], [], float(capital)
+    for (train_start, train_end, test_end), (label, train_value, test_value, curve) in zip(windows, outcomes):
+        test_close = close[train_end:test_end]
+        rows.append((index[train_start], index[train_end - 1], index[train_end], index[test_end - 1],
+                     label, train_value, test_value, capital / test_close[0] * test_close[-1]))
+        curves.append(curve / capital * level)
+        level = curves[-1][-1]
+
+    folds = pd.DataFrame(rows, columns=["Train Start", "Train End", "Test Start", "Test End",
+                                       "Chosen", "Train Value", "Test Value", "Test HODL Value"])
+    test_index = index[np.concatenate([np.arange(w[1], w[2]) for w in windows])] if windows else index[:0]
+    equity = pd.Series(np.concatenate(curves) if curves else [], index=test_index, name='Equity')
+    return WalkForwardResult(folds, equity)
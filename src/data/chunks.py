@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from .store import to_utc_index
+
+OHLCV_AGGREGATES = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def read_csv_chunks(file_path, chunksize=1_000_000, symbol=None, tz=None, columns=('Close', 'Volume')):
+    """Yield a large CSV as Date-indexed frames of at most ``chunksize`` rows.
+
+    Only ``columns`` (plus Date and, when filtering, Symbol) are parsed. The
+    Date column is converted to UTC and then to ``tz`` once per chunk, which
+    also handles files whose offsets change with daylight saving time. With
+    ``symbol`` only that symbol's rows are kept from a combined file.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    usecols = ['Date'] + [c for c in columns if c in header]
+    if symbol is not None:
+        usecols.append('Symbol')
+
+    for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+        if symbol is not None:
+            chunk = chunk[chunk['Symbol'] == symbol].drop(columns='Symbol')
+        chunk = chunk.dropna()
+        if chunk.empty:
+            continue
+        index = to_utc_index(chunk.pop('Date'))
+        if tz is not None:
+            index = index.tz_convert(tz)
+        chunk.index = index.rename('Date')
+        yield chunk
+
+
+def read_store_chunks(store, country, symbol, chunksize=1_000_000, columns=('Close', 'Volume'), start=None, end=None):
+    """Yield a MarketDataStore partition as Date-indexed frames of at most ``chunksize`` rows.
+
+    Each frame is built from slices of the memory-mapped columns, so only the
+    current chunk is ever read into memory.
+    """
+    arrays, tz = store.read_arrays(country, symbol, list(columns), start, end)
+    timestamps = arrays.pop('Date')
+    for lo in range(0, len(timestamps), chunksize):
+        hi = lo + chunksize
+        index = pd.DatetimeIndex(np.asarray(timestamps[lo:hi]).view('datetime64[ns]'), name='Date')
+        yield pd.DataFrame(
+            {c: np.asarray(values[lo:hi]) for c, values in arrays.items()},
+            index=index.tz_localize('UTC').tz_convert(tz),
+        )
+
+
+def resample_bars(data, rule):
+    """Aggregate bars into coarser ones (e.g. ``rule="5min"``) by flooring their wall-clock time.
+
+    Consecutive bars with the same floored time form one bar stamped with the
+    time of its first bar: first open, highest high, lowest low, last close and
+    summed volume. Because each group only depends on its own rows, this gives
+    the same result on a whole history as on its chunks through resample_chunks.
+    """
+    if data.empty:
+        return data
+    index = data.index
+    wall = index.tz_localize(None) if index.tz is not None else index
+    labels = wall.floor(rule).asi8
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.append(starts[1:], len(data)) - 1
+
+    columns = {}
+    for column in data.columns:
+        values = data[column].to_numpy()
+        how = OHLCV_AGGREGATES.get(column, 'last')
+        if how == 'first':
+            columns[column] = values[starts]
+        elif how == 'last':
+            columns[column] = values[ends]
+        elif how == 'max':
+            columns[column] = np.maximum.reduceat(values, starts)
+        elif how == 'min':
+            columns[column] = np.minimum.reduceat(values, starts)
+        else:
+            columns[column] = np.add.reduceat(values, starts)
+    return pd.DataFrame(columns, index=index[starts])
+
+
+def resample_chunks(chunks, rule):
+    """Apply resample_bars to a stream of chunks, holding each chunk's last, possibly unfinished, bar back."""
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            chunk = pd.concat([pending, chunk])
+        index = chunk.index
+        wall = index.tz_localize(None) if index.tz is not None else index
+        labels = wall.floor(rule).asi8
+        # Rows from the last change of label onward may continue in the next chunk
+        changes = np.flatnonzero(labels[1:] != labels[:-1])
+        cut = changes[-1] + 1 if len(changes) else 0
+        pending = chunk.iloc[cut:]
+        if cut:
+            yield resample_bars(chunk.iloc[:cut], rule)
+    if pending is not None and not pending.empty:
+        yield resample_bars(pending, rule)
@@ -5,50 +5,130 @@
 #     data = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
 #     data = data.dropna()  # Remove missing values
 #     return data
+import logging
 import pandas as pd
-import yfinance as yf
 import os
+from .fetchers import YahooFetcher, fetch_concurrently
+from src.utils.profiling import count, stage, timed
+
+logger = logging.getLogger(__name__)
+
+FUNDAMENTAL_KEYS = ['marketCap', 'priceToBook', 'pegRatio', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow']
 
 # Function to load and preprocess stock data from a CSV file
-def load_data(file_path=None, symbols=None, country=None):
-    """Load and preprocess stock data either from a CSV file or Yahoo Finance."""
+@timed()
+def load_data(file_path=None, symbols=None, country=None, store=None, fetcher=None, max_workers=8, cache=None):
+    """Load and preprocess stock data either from a CSV file or Yahoo Finance.
+
+    When a MarketDataStore is given, the store is refreshed incrementally (only
+    bars newer than what is stored are fetched) and the symbols are read back
+    from it instead of rewriting the combined CSV. ``fetcher`` defaults to
+    Yahoo Finance; pass a ReplayFetcher to work offline. Symbols are fetched
+    on up to ``max_workers`` threads and per-symbol fundamentals go to a side
+    table instead of being repeated on every row. Cached backtest results of
+    symbols that receive new bars are dropped from ``cache``, a ResultCache.
+    """
     
     # Load CSV if file path is provided
     if file_path:
-        data = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
-        data = data.dropna()  # Remove missing values
+        with stage("read_csv"):
+            data = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
+            data = data.dropna()  # Remove missing values
+        count("rows_loaded", len(data))
         return data
     
     # If symbols and country are provided, fetch stock data from Yahoo Finance
     if symbols and country:
+        fetcher = fetcher or YahooFetcher()
+        if store is not None:
+            refresh_store(store, symbols, country, fetcher, max_workers=max_workers, cache=cache)
+            return read_from_store(store, country, [s for s in symbols if store.has(country, s)])
+
         # Directory to store the CSV files
         output_dir = f'data/{country.lower()}_stock_data'
         os.makedirs(output_dir, exist_ok=True)
-        
-        all_data = pd.DataFrame()
 
-        # Fetch data for each symbol
+        # Fetch every symbol concurrently, then assemble with a single concat
+        with stage("fetch"):
+            histories, infos, report = fetch_concurrently(fetcher, symbols, info_symbols=symbols, max_workers=max_workers)
+        log_fetch_errors(report)
+        frames = []
         for symbol in symbols:
-            try:
-                stock = yf.Ticker(symbol)
-                historical_data = stock.history(period="10y")
+            if symbol in histories:
+                historical_data = histories[symbol]
                 historical_data['Symbol'] = symbol  # Add symbol as a column to identify stock
-                
-                # Fetch stock details (additional attributes)
-                stock_info = stock.info
-                for key in ['marketCap', 'priceToBook', 'pegRatio', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow']:
-                    if key in stock_info:
-                        historical_data[key] = stock_info[key]
-
-                all_data = pd.concat([all_data, historical_data], axis=0)
-                
-            except Exception as e:
-                print(f"Error fetching data for {symbol}: {e}")
+                frames.append(historical_data)
+        all_data = pd.concat(frames, axis=0) if frames else pd.DataFrame()
+
+        # Fundamentals are per symbol, so keep them in a side table rather than on every row
+        fundamentals = fundamentals_table(infos)
 
         # Save combined data to a CSV file
         file_name = os.path.join(output_dir, f"combined_data_{country}.csv")
         all_data.to_csv(file_name)
+        fundamentals.to_csv(os.path.join(output_dir, f"fundamentals_{country}.csv"))
         return all_data
 
     # Return empty DataFrame if no valid input
     return pd.DataFrame()
+
+
+def refresh_store(store, symbols, country, fetcher=None, info_ttl=24 * 60 * 60, max_workers=8, cache=None):
+    """Bring the store up to date by fetching only the bars after each symbol's last stored one.
+
+    Fundamentals are re-fetched separately, once they are older than ``info_ttl``
+    seconds. Symbols are fetched concurrently; writes happen on the calling
+    thread. Symbols that receive bars have their results dropped from
+    ``cache``, if given. Returns the FetchReport of the run.
+    """
+    fetcher = fetcher or YahooFetcher()
+    starts = {}
+    for symbol in symbols:
+        last_timestamp = store.last_timestamp(country, symbol)
+        if last_timestamp is not None:
+            # Start from the last stored bar's day so a restated last bar replaces it
+            starts[symbol] = last_timestamp.normalize()
+    stale_info = []
+    for symbol in symbols:
+        age = store.fundamentals_age(country, symbol)
+        if age is None or age > info_ttl:
+            stale_info.append(symbol)
+
+    with stage("fetch"):
+        histories, infos, report = fetch_concurrently(
+            fetcher, symbols, starts=starts, info_symbols=stale_info, max_workers=max_workers
+        )
+    for symbol, historical_data in histories.items():
+        historical_data = historical_data.dropna(subset=['Close'])
+        if not historical_data.empty:
+            store.append(country, symbol, historical_data)
+            if cache is not None:
+                cache.invalidate(symbol)
+    for symbol, stock_info in infos.items():
+        store.write_fundamentals(country, symbol, {k: stock_info.get(k) for k in FUNDAMENTAL_KEYS})
+    log_fetch_errors(report)
+    return report
+
+
+def fundamentals_table(infos):
+    """Build the Symbol-indexed fundamentals side table from fetched info dicts."""
+    rows = {symbol: {k: info.get(k) for k in FUNDAMENTAL_KEYS} for symbol, info in infos.items()}
+    return pd.DataFrame.from_dict(rows, orient='index', columns=FUNDAMENTAL_KEYS).rename_axis('Symbol')
+
+
+def log_fetch_errors(report):
+    for symbol, error in report.errors.items():
+        logger.warning("Error fetching data for %s after %d attempts: %s", symbol, report.attempts[symbol], error)
+
+
+@timed()
+def read_from_store(store, country, symbols, columns=None, start=None, end=None):
+    """Read symbols from a MarketDataStore into one Symbol-keyed frame, like the combined CSV."""
+    frames = []
+    for symbol in symbols:
+        data = store.read(country, symbol, columns=columns, start=start, end=end)
+        data['Symbol'] = symbol
+        frames.append(data)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames) if len(frames) > 1 else frames[0]
@@ -0,0 +1,149 @@
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+class BaseFetcher(ABC):
+    """Source of price history and fundamentals for a symbol."""
+
+    @abstractmethod
+    def fetch_history(self, symbol, start=None):
+        """Return Date-indexed OHLCV bars from ``start`` (inclusive), or the full default period if None."""
+        pass
+
+    @abstractmethod
+    def fetch_info(self, symbol):
+        """Return a dict of the symbol's fundamentals."""
+        pass
+
+
+class YahooFetcher(BaseFetcher):
+    def __init__(self, period="10y"):
+        self.period = period
+
+    def fetch_history(self, symbol, start=None):
+        import yfinance as yf  # slow to import, so only once data is actually downloaded
+
+        stock = yf.Ticker(symbol)
+        if start is None:
+            return stock.history(period=self.period)
+        return stock.history(start=pd.Timestamp(start).strftime('%Y-%m-%d'))
+
+    def fetch_info(self, symbol):
+        import yfinance as yf
+
+        return yf.Ticker(symbol).info
+
+
+class ReplayFetcher(BaseFetcher):
+    """Serve history and fundamentals from local frames, for tests and offline use.
+
+    ``frames`` maps symbols to Date-indexed frames (e.g. loaded from the CSVs
+    under data/raw); every call is recorded in ``calls`` so tests can check
+    what would have gone over the network.
+    """
+
+    def __init__(self, frames, infos=None, latency=0.0):
+        self.frames = frames
+        self.infos = infos or {}
+        self.latency = latency  # seconds slept per call, to stand in for network round trips
+        self.calls = []
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """Build a replay fetcher from a downloaded CSV, splitting combined files by Symbol."""
+        data = pd.read_csv(file_path, index_col='Date')
+        data.index = pd.to_datetime(data.index, utc=True)
+        return cls({symbol: frame for symbol, frame in data.groupby('Symbol', sort=False)})
+
+    def fetch_history(self, symbol, start=None):
+        self.calls.append(('history', symbol, start))
+        if self.latency:
+            time.sleep(self.latency)
+        if symbol not in self.frames:
+            raise KeyError(f"No replay data for {symbol}")
+        data = self.frames[symbol]
+        if start is not None:
+            data = data[data.index >= start]
+        return data.copy()
+
+    def fetch_info(self, symbol):
+        self.calls.append(('info', symbol))
+        if self.latency:
+            time.sleep(self.latency)
+        return dict(self.infos.get(symbol, {}))
+
+
+class FetchReport:
+    """Per-symbol outcome of a fetch run: bars fetched, attempts made and the final error if any."""
+
+    def __init__(self):
+        self.rows = {}
+        self.attempts = {}
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def to_frame(self):
+        symbols = list(self.attempts)
+        return pd.DataFrame({
+            'Symbol': symbols,
+            'Status': ['error' if s in self.errors else 'ok' for s in symbols],
+            'Rows': [self.rows.get(s, 0) for s in symbols],
+            'Attempts': [self.attempts[s] for s in symbols],
+            'Error': [self.errors.get(s) for s in symbols],
+        })
+
+
+def _with_retry(call, retries, backoff):
+    """Run ``call`` up to ``retries + 1`` times with exponential backoff; return (result, attempts)."""
+    for attempt in range(retries + 1):
+        try:
+            return call(), attempt + 1
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def fetch_concurrently(fetcher, symbols, starts=None, info_symbols=(), max_workers=8, retries=2, backoff=0.5):
+    """Fetch history (and optionally fundamentals) for many symbols on a bounded thread pool.
+
+    ``starts`` maps symbols to the first bar to fetch (full history otherwise) and
+    ``info_symbols`` lists the symbols whose fundamentals should be fetched too.
+    Failures are retried with exponential backoff and recorded in the returned
+    FetchReport instead of aborting the run. Returns ``(histories, infos, report)``.
+    """
+    starts = starts or {}
+    info_symbols = set(info_symbols)
+
+    def fetch_one(symbol):
+        attempts = 0
+        history, used = _with_retry(lambda: fetcher.fetch_history(symbol, start=starts.get(symbol)), retries, backoff)
+        attempts += used
+        info = None
+        if symbol in info_symbols:
+            info, used = _with_retry(lambda: fetcher.fetch_info(symbol), retries, backoff)
+            attempts += used
+        return history, info, attempts
+
+    histories, infos, report = {}, {}, FetchReport()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {symbol: executor.submit(fetch_one, symbol) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                history, info, attempts = future.result()
+            except Exception as e:
+                report.attempts[symbol] = retries + 1
+                report.errors[symbol] = f"{type(e).__name__}: {e}"
+                continue
+            histories[symbol] = history
+            if info is not None:
+                infos[symbol] = info
+            report.rows[symbol] = len(history)
+            report.attempts[symbol] = attempts
+    return histories, infos, report
@@ -0,0 +1,323 @@
+import glob
+import io
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+# Typed columns kept in the store; fundamentals and the Symbol key are not per-bar data
+STORE_COLUMNS = {
+    'Open': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+    'Volume': np.int64,
+    'Dividends': np.float64,
+    'Stock Splits': np.float64,
+}
+COUNTRY_TIMEZONES = {'USA': 'America/New_York', 'India': 'Asia/Kolkata', 'Japan': 'Asia/Tokyo'}
+SYMBOL_SUFFIX_COUNTRIES = {'.NS': 'India', '.BO': 'India', '.T': 'Japan'}
+
+
+def infer_country(symbol):
+    """Guess the listing country of a Yahoo Finance symbol from its suffix."""
+    for suffix, country in SYMBOL_SUFFIX_COUNTRIES.items():
+        if symbol.endswith(suffix):
+            return country
+    return 'USA'
+
+
+def to_utc_index(index):
+    """Parse an index of timestamps or offset-bearing strings into a UTC DatetimeIndex."""
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        return index.tz_convert('UTC')
+    if not isinstance(index, pd.DatetimeIndex):
+        parsed = _parse_offset_strings(index)
+        if parsed is not None:
+            return parsed
+    return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+
+
+def _parse_offset_strings(values):
+    """Fast path for 'YYYY-MM-DD HH:MM:SS+HH:MM' strings, as written by to_csv for tz-aware data.
+
+    pandas parses strings with mixed UTC offsets (e.g. across daylight saving
+    changes) one at a time; here the fixed-width characters are decoded as a
+    byte matrix instead. Returns None when the values do not all have that
+    shape, so the caller can fall back to pandas.
+    """
+    strings = pd.Series(values, copy=False)
+    if strings.empty or pd.api.types.infer_dtype(strings, skipna=False) != 'string':
+        return None
+    # One spare byte shows up non-zero for any string longer than 25 characters
+    chars = np.asarray(strings, dtype='S26').view(np.uint8).reshape(-1, 26)
+    if chars[:, 25].any():
+        return None
+    punctuation = {4: b'-', 7: b'-', 10: b' ', 13: b':', 16: b':', 22: b':'}
+    if any((chars[:, i] != ord(c)).any() for i, c in punctuation.items()):
+        return None
+    sign = chars[:, 19]
+    if ((sign != ord('+')) & (sign != ord('-'))).any():
+        return None
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 23, 24]]
+    if ((digits < ord('0')) | (digits > ord('9'))).any():
+        return None
+
+    def number(start):
+        return (chars[:, start] - ord('0')).astype(np.int64) * 10 + (chars[:, start + 1] - ord('0'))
+
+    days = np.ascontiguousarray(chars[:, :10]).view('S10').ravel().astype('datetime64[D]')
+    seconds = number(11) * 3600 + number(14) * 60 + number(17)
+    offset = np.where(sign == ord('-'), -1, 1) * (number(20) * 3600 + number(23) * 60)
+    # Same (microsecond) resolution as pandas gives for these strings
+    utc = days.astype('datetime64[us]') + ((seconds - offset) * 1_000_000).astype('timedelta64[us]')
+    return pd.DatetimeIndex(utc).tz_localize('UTC')
+
+
+class MarketDataStore:
+    """Columnar market data store partitioned by country and symbol.
+
+    Each partition is a directory of raw ``.npy`` files, one per column, next to
+    a sorted int64 ``Date`` column (UTC nanoseconds) and a ``meta.json``. Reads
+    memory-map the files, so loading a symbol's history or a date range of it
+    is a handful of ``searchsorted`` calls and slice views rather than a text parse.
+    """
+
+    def __init__(self, root='data/store'):
+        self.root = root
+
+    def _partition(self, country, symbol):
+        return os.path.join(self.root, country.lower(), symbol)
+
+    def has(self, country, symbol):
+        return os.path.exists(os.path.join(self._partition(country, symbol), 'meta.json'))
+
+    def symbols(self, country):
+        """List the symbols stored for a country."""
+        country_dir = os.path.join(self.root, country.lower())
+        if not os.path.isdir(country_dir):
+            return []
+        return sorted(s for s in os.listdir(country_dir) if self.has(country, s))
+
+    def meta(self, country, symbol):
+        with open(os.path.join(self._partition(country, symbol), 'meta.json')) as f:
+            return json.load(f)
+
+    def last_timestamp(self, country, symbol):
+        """Return the last stored bar time as a tz-aware Timestamp, or None if the symbol is not stored."""
+        if not self.has(country, symbol):
+            return None
+        meta = self.meta(country, symbol)
+        if meta['last_timestamp'] is None:
+            return None
+        return pd.Timestamp(meta['last_timestamp'], tz='UTC').tz_convert(meta['tz'])
+
+    def _prepare(self, data, columns):
+        """Sort a frame's bars by UTC timestamp, drop duplicates and cast columns to their stored dtypes."""
+        index = to_utc_index(data.index).as_unit('ns').asi8
+        order = np.argsort(index, kind='stable')
+        timestamps = index[order]
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = timestamps[1:] != timestamps[:-1]  # drop duplicate bars, keeping the first
+        values = {c: data[c].to_numpy()[order][keep].astype(STORE_COLUMNS[c]) for c in columns}
+        return timestamps[keep], values
+
+    def _write_meta(self, partition, meta):
+        staging = os.path.join(partition, 'meta.json.tmp')
+        with open(staging, 'w') as f:
+            json.dump(meta, f)
+        os.replace(staging, os.path.join(partition, 'meta.json'))
+
+    def write(self, country, symbol, data):
+        """Replace a symbol's partition with the given Date-indexed frame."""
+        columns = [c for c in STORE_COLUMNS if c in data.columns]
+        timestamps, values = self._prepare(data, columns)
+
+        tz = data.index.tz if isinstance(data.index, pd.DatetimeIndex) else None
+        tz = str(tz) if tz is not None else COUNTRY_TIMEZONES.get(country, 'UTC')
+        previous = self.meta(country, symbol) if self.has(country, symbol) else {}
+
+        partition = self._partition(country, symbol)
+        staging = partition + '.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        np.save(os.path.join(staging, 'Date.npy'), timestamps)
+        for column in columns:
+            np.save(os.path.join(staging, f'{column}.npy'), values[column])
+
+        meta = {
+            'symbol': symbol,
+            'country': country,
+            'tz': tz,
+            'columns': columns,
+            'rows': len(timestamps),
+            'last_timestamp': int(timestamps[-1]) if len(timestamps) else None,
+            'version': previous.get('version', 0) + 1,
+        }
+        self._write_meta(staging, meta)
+
+        shutil.rmtree(partition, ignore_errors=True)
+        os.replace(staging, partition)
+        return meta
+
+    def append(self, country, symbol, data):
+        """Append new bars to a symbol's partition in place.
+
+        Stored bars at or after the first incoming timestamp are replaced, so a
+        re-fetched (possibly restated) last bar does not duplicate. Only the new
+        rows are written; the existing history is not rewritten.
+        """
+        if not self.has(country, symbol):
+            return self.write(country, symbol, data)
+        meta = self.meta(country, symbol)
+        missing = [c for c in meta['columns'] if c not in data.columns]
+        if missing:
+            raise ValueError(f"Cannot append to {country}/{symbol}: missing columns {missing}")
+        timestamps, values = self._prepare(data, meta['columns'])
+        if not len(timestamps):
+            return meta
+
+        partition = self._partition(country, symbol)
+        stored = np.load(os.path.join(partition, 'Date.npy'), mmap_mode='r')[:meta['rows']]
+        rows = int(np.searchsorted(stored, timestamps[0], side='left'))
+        del stored
+
+        _append_npy(os.path.join(partition, 'Date.npy'), rows, timestamps)
+        for column in meta['columns']:
+            _append_npy(os.path.join(partition, f'{column}.npy'), rows, values[column])
+
+        meta.update(
+            rows=rows + len(timestamps),
+            last_timestamp=int(timestamps[-1]),
+            version=meta['version'] + 1,
+        )
+        self._write_meta(partition, meta)
+        return meta
+
+    def write_fundamentals(self, country, symbol, info):
+        """Record a symbol's fundamentals in the country's side table, stamped with the fetch time."""
+        table = self._read_fundamentals(country)
+        table[symbol] = dict(info, fetched_at=time.time())
+        os.makedirs(os.path.join(self.root, country.lower()), exist_ok=True)
+        path = os.path.join(self.root, country.lower(), '_fundamentals.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(table, f)
+        os.replace(path + '.tmp', path)
+
+    def fundamentals_age(self, country, symbol):
+        """Seconds since a symbol's fundamentals were fetched, or None if never."""
+        entry = self._read_fundamentals(country).get(symbol)
+        return None if entry is None else time.time() - entry['fetched_at']
+
+    def fundamentals(self, country, symbols=None):
+        """Return the fundamentals side table as a Symbol-indexed frame."""
+        table = self._read_fundamentals(country)
+        if symbols is not None:
+            table = {s: table[s] for s in symbols if s in table}
+        return pd.DataFrame.from_dict(table, orient='index').rename_axis('Symbol')
+
+    def _read_fundamentals(self, country):
+        path = os.path.join(self.root, country.lower(), '_fundamentals.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def read_arrays(self, country, symbol, columns=None, start=None, end=None):
+        """Return memory-mapped column views for ``start <= Date <= end``.
+
+        Only the requested columns are opened; the date range is resolved with
+        ``searchsorted`` on the sorted timestamp column, so no data is copied.
+        """
+        meta = self.meta(country, symbol)
+        partition = self._partition(country, symbol)
+        columns = meta['columns'] if columns is None else [c for c in columns if c in meta['columns']]
+
+        timestamps = np.load(os.path.join(partition, 'Date.npy'), mmap_mode='r')
+        lo = 0 if start is None else np.searchsorted(timestamps, self._to_ns(start, meta['tz']), side='left')
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, self._to_ns(end, meta['tz']), side='right')
+
+        arrays = {'Date': timestamps[lo:hi]}
+        for column in columns:
+            arrays[column] = np.load(os.path.join(partition, f'{column}.npy'), mmap_mode='r')[lo:hi]
+        return arrays, meta['tz']
+
+    def read(self, country, symbol, columns=None, start=None, end=None):
+        """Load a symbol's bars as a Date-indexed frame in the exchange timezone."""
+        arrays, tz = self.read_arrays(country, symbol, columns, start, end)
+        index = pd.DatetimeIndex(arrays.pop('Date').view(np.ndarray).view('datetime64[ns]'), name='Date')
+        index = index.tz_localize('UTC').tz_convert(tz)
+        # Plain ndarray views keep the columns backed by the mapped files without the memmap subclass
+        return pd.DataFrame({c: a.view(np.ndarray) for c, a in arrays.items()}, index=index, copy=False)
+
+    @staticmethod
+    def _to_ns(value, tz):
+        timestamp = pd.Timestamp(value)
+        if timestamp.tz is None:
+            timestamp = timestamp.tz_localize(tz)
+        return timestamp.tz_convert('UTC').as_unit('ns').value
+
+
+def _append_npy(path, rows, values):
+    """Keep the first ``rows`` entries of a 1-D .npy file and append ``values`` after them."""
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(f)
+        header_length = f.tell()
+
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (rows + len(values),),
+        })
+        if header.tell() == header_length:
+            f.seek(0)
+            f.write(header.getvalue())
+            f.seek(header_length + rows * dtype.itemsize)
+            f.truncate()
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            return
+
+    # The new shape no longer fits in the padded header, fall back to a rewrite
+    existing = np.load(path)[:rows]
+    np.save(path, np.concatenate([existing, values.astype(dtype)]))
+
+
+def import_csv(store, file_path, country=None):
+    """Import a downloaded CSV (combined or single-symbol) into the store, one partition per symbol."""
+    data = pd.read_csv(file_path, index_col='Date')
+    if 'Symbol' in data.columns:
+        groups = data.groupby('Symbol', sort=False)
+    else:
+        # Single-symbol downloads are named like BHARTIARTL.NS_historical_data.csv
+        groups = [(os.path.basename(file_path).split('_')[0], data)]
+
+    imported = []
+    for symbol, frame in groups:
+        symbol_country = country or infer_country(symbol)
+        tz = COUNTRY_TIMEZONES.get(symbol_country, 'UTC')
+        frame = frame.set_axis(to_utc_index(frame.index).tz_convert(tz))
+        store.write(symbol_country, symbol, frame.dropna(subset=['Close']))
+        imported.append((symbol_country, symbol))
+    return imported
+
+
+def import_existing(store, patterns=('data/raw/*.csv', 'usa_stock_data/*.csv', 'data/*_stock_data/*.csv')):
+    """One-time import of the CSVs already on disk under data/raw, usa_stock_data and the download dirs."""
+    imported = []
+    for pattern in patterns:
+        for file_path in sorted(glob.glob(pattern)):
+            imported.extend(import_csv(store, file_path))
+    return imported
+
+
+if __name__ == '__main__':
+    for country, symbol in import_existing(MarketDataStore()):
+        print(f"Imported {country}/{symbol}")
@@ -0,0 +1,254 @@
+"""Run backtest jobs from a job file without the Streamlit UI.
+
+    backtest-batch jobs.json --output results.jsonl --workers 4
+
+A job file is JSON with a list of job specs, each expanded into one job per
+symbol x strategy x style x date range::
+
+    {
+      "defaults": {"capital": 10000, "styles": ["Moderate", "Passive"]},
+      "jobs": [
+        {"csv": "usa_stock_data/combined_data_USA.csv", "symbols": ["AAPL", "MSFT"],
+         "strategies": ["RSI", "MACD"], "start_date": "2018-01-01", "end_date": "2023-12-31"},
+        {"store": "data/store", "country": "USA", "symbols": ["AAPL"],
+         "date_ranges": [["2015-01-01", "2019-12-31"], ["2020-01-01", "2024-12-31"]]}
+      ]
+    }
+
+Data comes only from local CSVs (``csv``) or a MarketDataStore (``store``),
+so runs are fully offline. Relative paths are taken from the job file's
+directory. Each result is appended to the JSONL output as soon as its symbol
+finishes; rerunning the same job file skips job IDs already in the output.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+
+import pandas as pd
+
+from src.backtest.batch import STRATEGIES, STYLES, backtest_row, frame_from_arrays, split_by_symbol
+from src.backtest.cache import ResultCache
+from src.data.data_loader import load_data, read_from_store
+from src.data.store import MarketDataStore, infer_country
+from src.utils.profiling import profile_run, stage
+
+Job = namedtuple('Job', ['job_id', 'strategy', 'style', 'start_date', 'end_date', 'capital'])
+OUTPUT_COLUMNS = ["Job ID", "Source", "Symbol", "Strategy", "Style", "Start Date", "End Date", "Capital",
+                  "Final Value", "HODL Value", "Trades", "CAGR", "Max Drawdown", "Sharpe", "Error"]
+
+
+def read_job_file(path):
+    """Load a job file and return its job specs with defaults applied and paths resolved."""
+    with open(path) as f:
+        document = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = document.get("defaults", {})
+
+    specs = []
+    for entry in document.get("jobs", []):
+        spec = {**defaults, **entry}
+        if ("csv" in spec) == ("store" in spec):
+            raise ValueError(f"Each job needs exactly one of 'csv' or 'store': {entry}")
+        if "store" in spec and not spec.get("symbols"):
+            raise ValueError(f"Store jobs need a list of 'symbols': {entry}")
+        for name in spec.get("strategies", []):
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown strategy '{name}'. Choose from {list(STRATEGIES)}.")
+        key = "csv" if "csv" in spec else "store"
+        spec["source"] = f"{key}:{spec[key]}"
+        spec["path"] = os.path.join(base_dir, spec[key])
+        specs.append(spec)
+    return specs
+
+
+def date_ranges(spec):
+    """The (start, end) ISO date pairs of a spec; None means the data's first or last bar."""
+    if "date_ranges" in spec:
+        return [tuple(pair) for pair in spec["date_ranges"]]
+    return [(spec.get("start_date"), spec.get("end_date"))]
+
+
+def job_id(source, symbol, strategy, style, start_date, end_date, capital):
+    """Stable ID of one job, so a rerun can recognise work it has already done."""
+    key = json.dumps([source, symbol, strategy, style, start_date, end_date, capital])
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def expand_jobs(spec, symbol):
+    capital = spec.get("capital", 10000)
+    return [
+        Job(job_id(spec["source"], symbol, strategy, style, start, end, capital), strategy, style, start, end, capital)
+        for strategy in spec.get("strategies") or list(STRATEGIES)
+        for style in spec.get("styles") or STYLES
+        for start, end in date_ranges(spec)
+    ]
+
+
+def load_source(spec):
+    """Read a spec's data from its CSV or store as a Symbol-keyed frame."""
+    if "csv" in spec:
+        data = load_data(file_path=spec["path"])
+        if "Symbol" not in data.columns:
+            data["Symbol"] = spec.get("symbol") or os.path.splitext(os.path.basename(spec["path"]))[0]
+        return data
+    store = MarketDataStore(spec["path"])
+    frames = []
+    for symbol in spec["symbols"]:
+        country = spec.get("country") or infer_country(symbol)
+        if store.has(country, symbol):
+            frames.append(read_from_store(store, country, [symbol]))
+    return pd.concat(frames) if frames else pd.DataFrame(columns=["Symbol", "Close"])
+
+
+def completed_job_ids(path):
+    """IDs of the jobs that finished without error in an existing output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if not record.get("Error"):
+                done.add(record["Job ID"])
+    return done
+
+
+def _date(value):
+    return date.fromisoformat(value) if value else None
+
+
+def _record(source, symbol, job, **values):
+    record = dict.fromkeys(OUTPUT_COLUMNS)
+    record.update({"Job ID": job.job_id, "Source": source, "Symbol": symbol, "Strategy": job.strategy,
+                   "Style": job.style, "Start Date": job.start_date, "End Date": job.end_date,
+                   "Capital": job.capital})
+    record.update(values)
+    return record
+
+
+def run_symbol(source, symbol, arrays, jobs, profile=False, cache=None):
+    """Worker: run one symbol's jobs and return ``(records, profile)``.
+
+    A job that raises is recorded with its error rather than stopping the run.
+    """
+    records = []
+    with profile_run(enabled=profile) as report:
+        data = frame_from_arrays(arrays)
+        for job in jobs:
+            try:
+                row = backtest_row(data, job.strategy, job.style, job.capital,
+                                   _date(job.start_date), _date(job.end_date), cache, symbol)
+            except Exception as error:
+                records.append(_record(source, symbol, job, Error=f"{type(error).__name__}: {error}"))
+                continue
+            if row is None:
+                records.append(_record(source, symbol, job, Error="No bars in the date range."))
+            else:
+                records.append(_record(source, symbol, job, **dict(zip(OUTPUT_COLUMNS[8:14], row))))
+    return records, report.to_dict() if profile else None
+
+
+def tasks(specs, done, counts):
+    """Yield (source, symbol, arrays, jobs) per symbol with jobs left to run, loading each source once.
+
+    Jobs already in ``done`` are tallied in ``counts["skipped"]``.
+    """
+    loaded = {}
+    for spec in specs:
+        if spec["source"] not in loaded:
+            with stage("load_source"):
+                loaded[spec["source"]] = split_by_symbol(load_source(spec))
+        per_symbol = loaded[spec["source"]]
+        for symbol in spec.get("symbols") or list(per_symbol):
+            all_jobs = expand_jobs(spec, symbol)
+            jobs = [job for job in all_jobs if job.job_id not in done]
+            counts["skipped"] += len(all_jobs) - len(jobs)
+            if jobs:
+                yield spec["source"], symbol, per_symbol.get(symbol), jobs
+
+
+def run_jobs(job_file, output, max_workers=None, resume=True, profile=False, log=print, cache=None):
+    """Run every job of ``job_file``, appending one JSON line per job to ``output``.
+
+    At most two tasks per worker are in flight, and results are written and
+    flushed as each symbol completes, so memory does not grow with the number
+    of jobs. With a ResultCache, backtests already run by any earlier job
+    file are read back instead of recomputed. Returns a dict of completed,
+    skipped and failed job counts.
+    """
+    specs = read_job_file(job_file)
+    done = completed_job_ids(output) if resume else set()
+    mode = "a" if resume else "w"
+    counts = {"completed": 0, "skipped": 0, "failed": 0}
+
+    with profile_run(enabled=profile or None) as report, open(output, mode) as out:
+        def write(records, worker_profile=None):
+            for record in records:
+                out.write(json.dumps(record, default=str) + "\n")
+                counts["failed" if record["Error"] else "completed"] += 1
+            out.flush()
+            if worker_profile is not None:
+                report.merge(worker_profile)
+            if log:
+                log(f"{counts['completed']} completed, {counts['failed']} failed")
+
+        if max_workers == 1:
+            for source, symbol, arrays, jobs in tasks(specs, done, counts):
+                if arrays is None:
+                    write([_record(source, symbol, job, Error="Symbol not found in the source.") for job in jobs])
+                else:
+                    write(run_symbol(source, symbol, arrays, jobs, cache=cache)[0])
+        else:
+            limit = 2 * (max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pending = set()
+                for source, symbol, arrays, jobs in tasks(specs, done, counts):
+                    if arrays is None:
+                        write([_record(source, symbol, job, Error="Symbol not found in the source.") for job in jobs])
+                        continue
+                    if len(pending) >= limit:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(*future.result())
+                    pending.add(executor.submit(run_symbol, source, symbol, arrays, jobs, report.enabled, cache))
+                for future in wait(pending).done:
+                    write(*future.result())
+
+    if report.enabled:
+        counts["profile"] = report
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job_file", help="JSON job file")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true", help="rerun every job and overwrite the output")
+    parser.add_argument("--parquet", help="also write all results to this Parquet file when done (needs pyarrow)")
+    parser.add_argument("--profile", help="write a stage timing report (JSON) to this path")
+    parser.add_argument("--cache", help="directory of a result cache shared across runs")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache) if args.cache else None
+    counts = run_jobs(args.job_file, args.output, args.workers, resume=not args.no_resume,
+                      profile=bool(args.profile), log=None, cache=cache)
+    print(f"{counts['completed']} completed, {counts['failed']} failed, "
+          f"{counts['skipped']} skipped (already done) -> {args.output}")
+    if args.profile:
+        counts["profile"].to_json(args.profile)
+    if args.parquet:
+        pd.read_json(args.output, lines=True).to_parquet(args.parquet, index=False)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,28 @@ class BaseStrategy(ABC):
         self.data = data
         self.capital = capital
         self.positions = []
+        self.reset()
 
     @abstractmethod
     def generate_signals(self):
         """Generate buy/sell signals based on the strategy."""
         pass
+
+    def reset(self):
+        """Clear the streaming state used by update()."""
+        self.stream = None
+
+    def warmup_bars(self):
+        """Bars of history generate_signals needs behind a bar before that bar's signal is settled.
+
+        The chunked pipeline carries this many bars over from one chunk to the next.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not report its warm-up length.")
+
+    def update(self, bar):
+        """Consume one bar (a mapping with 'Close' and, where needed, 'Volume') and return its signal.
+
+        Streaming counterpart of generate_signals: each call costs O(1) and the
+        signals match the batch output bar for bar.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming updates.")
@@ -1,5 +1,7 @@
 import pandas as pd
 from .base_strategy import BaseStrategy
+from .indicators import band_signals, bollinger_bands
+from .streaming import RollingStats
 
 class BollingerBandStrategy(BaseStrategy):
     def __init__(self, data, capital, investment_style="Moderate"):
@@ -23,20 +25,27 @@ class BollingerBandStrategy(BaseStrategy):
 
     def generate_signals(self):
         """Calculate Bollinger Bands and generate buy/sell signals based on investment style."""
-        # Calculate the rolling mean and standard deviation for Bollinger Bands
-        self.data['MA'] = self.data['Close'].rolling(window=self.window).mean()
-        self.data['STD'] = self.data['Close'].rolling(window=self.window).std()
-        self.data['Upper'] = self.data['MA'] + (self.num_std_dev * self.data['STD'])
-        self.data['Lower'] = self.data['MA'] - (self.num_std_dev * self.data['STD'])
+        close = self.data['Close'].to_numpy()
+        bands = bollinger_bands(close, self.window, self.num_std_dev)
 
-        # Generate signals: 1 for buy, -1 for sell, 0 for hold
-        self.data['Signal'] = 0  # Default hold signal
-        self.data.loc[self.data['Close'] < self.data['Lower'], 'Signal'] = 1  # Buy signal
-        self.data.loc[self.data['Close'] > self.data['Upper'], 'Signal'] = -1  # Sell signal
+        # Signals: 1 for buy below the lower band, -1 for sell above the upper band, 0 for hold
+        signals = band_signals(close, bands.lower, bands.upper)
+        return pd.Series(signals, index=self.data.index, name='Signal')
 
-        # Fill NaN values with hold (0)
-        self.data['Signal'].fillna(0, inplace=True)
+    def warmup_bars(self):
+        return self.window
 
-        return self.data['Signal']
-
-    
\ No newline at end of file
+    def update(self, bar):
+        """Update the rolling band with one bar and return its signal."""
+        if self.stream is None:
+            self.stream = RollingStats(self.window)
+        close = bar['Close']
+        self.stream.update(close)
+        if not self.stream.full:
+            return 0
+        band = self.num_std_dev * self.stream.std
+        if close > self.stream.mean + band:
+            return -1  # Sell signal
+        if close < self.stream.mean - band:
+            return 1  # Buy signal
+        return 0
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+from .base_strategy import BaseStrategy
+from .bollinger_band import BollingerBandStrategy
+from .indicators import band_signals, crossover_signals, ema, rolling_mean, rolling_std, rolling_sum
+from .macd import MACDStrategy
+from .registry import get_strategy
+from .rsi import RSIStrategy
+from .simple_moving_average import SMAStrategy
+from .vwap import VWAPStrategy
+
+# Indicator nodes are tuples (kind, *arguments); an argument that is itself a tuple is an input node.
+CLOSE, VOLUME = ('close',), ('volume',)
+
+
+def _diff(values):
+    return np.diff(values, prepend=np.nan)
+
+
+def _rsi(gain, loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def _divide(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return a / b
+
+
+# Node kind -> function of the node's evaluated inputs and parameters. Each matches the
+# arithmetic of the indicators module step for step, so signals equal generate_signals exactly.
+OPERATIONS = {
+    'mean': rolling_mean,
+    'std': rolling_std,
+    'sum': rolling_sum,
+    'ema': ema,
+    'diff': _diff,
+    'gain': lambda delta: np.where(delta > 0, delta, 0.0),
+    'loss': lambda delta: np.where(delta < 0, -delta, 0.0),
+    'add': np.add,
+    'sub': np.subtract,
+    'mul': np.multiply,
+    'div': _divide,
+    'scale': np.multiply,
+    'rsi': _rsi,
+}
+
+
+def _bollinger_plan(strategy):
+    middle = ('mean', CLOSE, strategy.window)
+    width = ('scale', ('std', CLOSE, strategy.window), strategy.num_std_dev)
+    return (CLOSE, ('sub', middle, width), ('add', middle, width)), band_signals
+
+
+def _sma_plan(strategy):
+    return (('mean', CLOSE, strategy.short_window), ('mean', CLOSE, strategy.long_window)), crossover_signals
+
+
+def _macd_plan(strategy):
+    line = ('sub', ('ema', CLOSE, strategy.short_window), ('ema', CLOSE, strategy.long_window))
+    return (line, ('ema', line, strategy.signal_window)), crossover_signals
+
+
+def _rsi_plan(strategy):
+    delta = ('diff', CLOSE)
+    value = ('rsi', ('mean', ('gain', delta), strategy.rsi_window), ('mean', ('loss', delta), strategy.rsi_window))
+    return (value,), lambda rsi: band_signals(rsi, strategy.oversold, strategy.overbought)
+
+
+def _vwap_plan(strategy):
+    rolling_vwap = ('div', ('sum', ('mul', CLOSE, VOLUME), strategy.vwap_window), ('sum', VOLUME, strategy.vwap_window))
+    return (CLOSE, rolling_vwap), crossover_signals
+
+
+# Strategy class -> function returning (indicator nodes, function of their values giving the signals)
+SIGNAL_PLANS = {
+    BollingerBandStrategy: _bollinger_plan,
+    SMAStrategy: _sma_plan,
+    MACDStrategy: _macd_plan,
+    RSIStrategy: _rsi_plan,
+    VWAPStrategy: _vwap_plan,
+}
+
+
+def dependency_order(nodes):
+    """Every node needed for ``nodes``, each once, with inputs before the nodes using them."""
+    order = []
+    seen = set()
+
+    def visit(node):
+        if node in seen:
+            return
+        seen.add(node)
+        for argument in node[1:]:
+            if isinstance(argument, tuple):
+                visit(argument)
+        order.append(node)
+
+    for node in nodes:
+        visit(node)
+    return order
+
+
+class IndicatorGraph:
+    """Indicator values over one close (and optional volume) series, each node computed at most once.
+
+    ``computed`` lists the nodes in the order they were evaluated, so callers
+    can check how much work a set of strategies actually shared.
+    """
+
+    def __init__(self, close, volume=None):
+        self.values = {CLOSE: np.asarray(close, dtype=np.float64)}
+        if volume is not None:
+            self.values[VOLUME] = np.asarray(volume, dtype=np.float64)
+        self.computed = []
+
+    def evaluate(self, nodes):
+        """Return the values of ``nodes``, computing whatever they depend on that is not known yet."""
+        for node in dependency_order(nodes):
+            if node in self.values:
+                continue
+            if node == VOLUME:
+                raise ValueError("This indicator needs a Volume series.")
+            arguments = [self.values[a] if isinstance(a, tuple) else a for a in node[1:]]
+            self.values[node] = OPERATIONS[node[0]](*arguments)
+            self.computed.append(node)
+        return [self.values[node] for node in nodes]
+
+
+class EnsembleStrategy(BaseStrategy):
+    """Combine the signals of several strategies, sharing the indicators they have in common.
+
+    ``members`` are strategy names, optionally paired with their own style,
+    e.g. ``["RSI", ("MACD", "Passive")]``; by default all five built-in
+    strategies at the ensemble's style. Modes:
+
+    * ``"vote"``: buy (sell) when more than half the members buy (sell)
+    * ``"weighted"``: buy (sell) when the weighted mean signal is at least ``threshold`` (at most ``-threshold``)
+    * ``"unanimous"``: only when every member gives the same buy or sell signal
+
+    Every member's indicators go into one IndicatorGraph, so each distinct
+    indicator is computed once however many members use it.
+    """
+
+    MODES = ("vote", "weighted", "unanimous")
+    DEFAULT_MEMBERS = ("Bollinger Band", "Simple Moving Avg", "MACD", "RSI", "VWAP")
+
+    def __init__(self, data, capital, investment_style="Moderate", members=None, mode="vote",
+                 weights=None, threshold=0.5):
+        super().__init__(data, capital)
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid ensemble mode '{mode}'. Choose from {list(self.MODES)}.")
+        self.investment_style = investment_style
+        self.members = tuple(
+            (member, investment_style) if isinstance(member, str) else tuple(member)
+            for member in (members or self.DEFAULT_MEMBERS)
+        )
+        if not self.members:
+            raise ValueError("An ensemble needs at least one member strategy.")
+        self.weights = tuple(weights) if weights is not None else (1.0,) * len(self.members)
+        if len(self.weights) != len(self.members):
+            raise ValueError("Give one weight per member strategy.")
+        self.mode = mode
+        self.threshold = threshold
+        self.strategies = [get_strategy(name)(data, capital, investment_style=style) for name, style in self.members]
+        self.graph = None
+
+    def member_signals(self):
+        """(members x bars) matrix of the members' signals, computed over one shared IndicatorGraph."""
+        volume = self.data['Volume'].to_numpy() if 'Volume' in self.data.columns else None
+        self.graph = IndicatorGraph(self.data['Close'].to_numpy(), volume)
+        plans = [SIGNAL_PLANS[type(s)](s) if type(s) in SIGNAL_PLANS else None for s in self.strategies]
+        # Resolve the whole graph first, so shared inputs are computed once in dependency order
+        self.graph.evaluate([node for plan in plans if plan is not None for node in plan[0]])
+
+        rows = []
+        for strategy, plan in zip(self.strategies, plans):
+            if plan is None:
+                rows.append(strategy.generate_signals().to_numpy())  # no plan: the member computes its own
+            else:
+                nodes, to_signals = plan
+                rows.append(to_signals(*self.graph.evaluate(nodes)))
+        return np.array(rows, dtype=np.int8).reshape(len(rows), len(self.data))
+
+    def combine(self, signals):
+        """Reduce a (members x bars) signal matrix to one signal per bar."""
+        n_members = len(signals)
+        if self.mode == "vote":
+            buys = (signals == 1).sum(axis=0)
+            sells = (signals == -1).sum(axis=0)
+            combined = np.where(2 * buys > n_members, 1, np.where(2 * sells > n_members, -1, 0))
+        elif self.mode == "weighted":
+            weights = np.asarray(self.weights, dtype=np.float64)
+            score = weights @ signals / np.abs(weights).sum()
+            combined = np.where(score >= self.threshold, 1, np.where(score <= -self.threshold, -1, 0))
+        else:
+            agree = (signals == signals[0]).all(axis=0) & (signals[0] != 0)
+            combined = np.where(agree, signals[0], 0)
+        return combined.astype(np.int8)
+
+    def generate_signals(self):
+        """Generate the ensemble's buy/sell signals from its members' signals."""
+        return pd.Series(self.combine(self.member_signals()), index=self.data.index, name='Signal')
+
+    def warmup_bars(self):
+        return max(strategy.warmup_bars() for strategy in self.strategies)
+
+    def reset(self):
+        super().reset()
+        for strategy in getattr(self, 'strategies', []):
+            strategy.reset()
+
+    def update(self, bar):
+        """Update every member with one bar and return the combined signal."""
+        signals = np.array([[strategy.update(bar)] for strategy in self.strategies], dtype=np.int8)
+        return int(self.combine(signals)[0])
@@ -0,0 +1,231 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+BollingerBands = namedtuple('BollingerBands', ['middle', 'upper', 'lower'])
+MACD = namedtuple('MACD', ['macd', 'signal_line'])
+
+
+def _output(shape, out, dtype):
+    """Return ``out`` if it is a usable buffer of the given shape, else allocate one."""
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {shape}.")
+    return out
+
+
+def _as_float(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _wrap(values):
+    """Wrap a 1-D or 2-D array in a pandas object without copying it."""
+    if values.ndim == 2:
+        return pd.DataFrame(values, copy=False)
+    return pd.Series(values, copy=False)
+
+
+def _rolling(values, window, method, out, dtype):
+    values = _as_float(values)
+    out = _output(values.shape, out, dtype)
+    result = getattr(_wrap(values).rolling(window=window), method)()
+    np.copyto(out, result.to_numpy(), casting='unsafe')
+    return out
+
+
+def rolling_sum(values, window, out=None, dtype=np.float64):
+    """Rolling sum along the first axis, NaN until the window fills.
+
+    Works on 1-D series and 2-D (time x symbol) arrays. Results are written
+    into ``out`` when given, so repeated runs can reuse one buffer.
+    """
+    return _rolling(values, window, 'sum', out, dtype)
+
+
+def rolling_mean(values, window, out=None, dtype=np.float64):
+    """Simple moving average along the first axis."""
+    return _rolling(values, window, 'mean', out, dtype)
+
+
+def rolling_std(values, window, out=None, dtype=np.float64):
+    """Rolling sample standard deviation (ddof=1) along the first axis."""
+    return _rolling(values, window, 'std', out, dtype)
+
+
+def ema(values, span, out=None, dtype=np.float64):
+    """Exponential moving average along the first axis, as ``ewm(span=span, adjust=False).mean()``."""
+    values = _as_float(values)
+    out = _output(values.shape, out, dtype)
+    np.copyto(out, _wrap(values).ewm(span=span, adjust=False).mean().to_numpy(), casting='unsafe')
+    return out
+
+
+def bollinger_bands(close, window, num_std_dev, dtype=np.float64):
+    """Return the BollingerBands (middle, upper, lower) of a close series."""
+    middle = rolling_mean(close, window, dtype=dtype)
+    width = rolling_std(close, window, dtype=dtype)
+    width *= num_std_dev
+    return BollingerBands(middle, middle + width, middle - width)
+
+
+def macd(close, short_window, long_window, signal_window, dtype=np.float64):
+    """Return the MACD line and its signal line."""
+    line = ema(close, short_window, dtype=dtype)
+    line -= ema(close, long_window, dtype=dtype)
+    return MACD(line, ema(line, signal_window, dtype=dtype))
+
+
+def rsi(close, window, out=None, dtype=np.float64):
+    """Relative Strength Index from rolling mean gains and losses."""
+    close = _as_float(close)
+    delta = np.diff(close, axis=0, prepend=np.nan)
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+    out = _output(close.shape, out, dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.copyto(out, 100 - (100 / (1 + gain / loss)), casting='unsafe')
+    return out
+
+
+def vwap(close, volume, window, out=None, dtype=np.float64):
+    """Rolling volume-weighted average price."""
+    close, volume = _as_float(close), _as_float(volume)
+    price_volume = rolling_sum(close * volume, window)
+    total_volume = rolling_sum(volume, window)
+    out = _output(close.shape, out, dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(price_volume, total_volume, out=out, casting='unsafe')
+    return out
+
+
+def crossover_signals(fast, slow):
+    """1 where ``fast`` is above ``slow``, -1 where below, 0 otherwise (including NaN)."""
+    signals = np.zeros(np.shape(fast), dtype=np.int8)
+    signals[fast > slow] = 1
+    signals[fast < slow] = -1
+    return signals
+
+
+def band_signals(values, lower, upper):
+    """1 where ``values`` is below ``lower``, -1 where above ``upper``, 0 otherwise."""
+    signals = np.zeros(np.shape(values), dtype=np.int8)
+    signals[values < lower] = 1
+    signals[values > upper] = -1
+    return signals
+
+
+def rolling_sum_from_cumsum(cumsum, window):
+    """Rolling sum of the series behind ``cumsum`` (which has a leading zero), NaN until the window fills."""
+    n = len(cumsum) - 1
+    out = np.full(n, np.nan)
+    if 0 < window <= n:
+        out[window - 1:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+class IndicatorCache:
+    """Memoized indicators over one close (and optional volume) series.
+
+    Running sums of the close, its square, price*volume and RSI gains/losses are
+    built once, so any rolling window costs a single vectorized subtraction.
+    Each distinct indicator is computed at most once and reused afterwards.
+    """
+
+    def __init__(self, close, volume=None):
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = None if volume is None else np.ascontiguousarray(volume, dtype=np.float64)
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+        self._sums = {}
+
+        # Centre the series before accumulating to keep the variance well conditioned
+        self._offset = float(self.close.mean()) if len(self.close) else 0.0
+
+    def _memo(self, key, compute):
+        if key in self._cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _cumsum(self, name):
+        """Running sum (with a leading zero) of one of the base series."""
+        if name not in self._sums:
+            if name == 'close':
+                values = self.close - self._offset
+            elif name == 'close_sq':
+                values = (self.close - self._offset) ** 2
+            elif name == 'gain' or name == 'loss':
+                delta = np.diff(self.close, prepend=np.nan)
+                values = np.where(delta > 0, delta, 0.0) if name == 'gain' else np.where(delta < 0, -delta, 0.0)
+            elif name == 'price_volume':
+                values = self.close * self._require_volume()
+            elif name == 'volume':
+                values = self._require_volume()
+            self._sums[name] = np.concatenate(([0.0], np.cumsum(values)))
+        return self._sums[name]
+
+    def _require_volume(self):
+        if self.volume is None:
+            raise ValueError("This indicator needs a Volume series.")
+        return self.volume
+
+    def rolling_mean(self, window):
+        """Simple moving average of the close."""
+        return self._memo(
+            ('mean', window),
+            lambda: rolling_sum_from_cumsum(self._cumsum('close'), window) / window + self._offset,
+        )
+
+    def rolling_std(self, window):
+        """Rolling sample standard deviation (ddof=1, as pandas) of the close."""
+        def compute():
+            total = rolling_sum_from_cumsum(self._cumsum('close'), window)
+            total_sq = rolling_sum_from_cumsum(self._cumsum('close_sq'), window)
+            variance = (total_sq - total * total / window) / (window - 1) if window > 1 else np.full(len(total), np.nan)
+            return np.sqrt(np.maximum(variance, 0.0))
+        return self._memo(('std', window), compute)
+
+    def bollinger_bands(self, window, num_std_dev):
+        """Return the (upper, lower) Bollinger Bands."""
+        def compute():
+            mean, std = self.rolling_mean(window), self.rolling_std(window)
+            return mean + num_std_dev * std, mean - num_std_dev * std
+        return self._memo(('bollinger', window, num_std_dev), compute)
+
+    def ema(self, span):
+        """Exponential moving average of the close (adjust=False)."""
+        return self._memo(
+            ('ema', span),
+            lambda: pd.Series(self.close).ewm(span=span, adjust=False).mean().to_numpy(),
+        )
+
+    def macd(self, short_window, long_window, signal_window):
+        """Return the (MACD, signal line) pair."""
+        def compute():
+            macd = self.ema(short_window) - self.ema(long_window)
+            signal_line = pd.Series(macd).ewm(span=signal_window, adjust=False).mean().to_numpy()
+            return macd, signal_line
+        return self._memo(('macd', short_window, long_window, signal_window), compute)
+
+    def rsi(self, window):
+        """Relative Strength Index from rolling mean gains and losses."""
+        def compute():
+            gain = rolling_sum_from_cumsum(self._cumsum('gain'), window)
+            loss = rolling_sum_from_cumsum(self._cumsum('loss'), window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return 100 - (100 / (1 + gain / loss))
+        return self._memo(('rsi', window), compute)
+
+    def vwap(self, window):
+        """Rolling volume-weighted average price."""
+        def compute():
+            price_volume = rolling_sum_from_cumsum(self._cumsum('price_volume'), window)
+            volume = rolling_sum_from_cumsum(self._cumsum('volume'), window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return price_volume / volume
+        return self._memo(('vwap', window), compute)
@@ -1,5 +1,9 @@
 import pandas as pd
 from .base_strategy import BaseStrategy
+from .indicators import crossover_signals, macd
+from .streaming import EMA
+
+EMA_WARMUP_SPANS = 40
 
 class MACDStrategy(BaseStrategy):
     def __init__(self, data, capital, investment_style="Moderate"):
@@ -20,20 +24,29 @@ class MACDStrategy(BaseStrategy):
 
     def calculate_macd(self):
         """Calculate the MACD line and the signal line."""
-        self.data['EMA_Short'] = self.data['Close'].ewm(span=self.short_window, adjust=False).mean()
-        self.data['EMA_Long'] = self.data['Close'].ewm(span=self.long_window, adjust=False).mean()
-
-        self.data['MACD'] = self.data['EMA_Short'] - self.data['EMA_Long']
-        self.data['Signal_Line'] = self.data['MACD'].ewm(span=self.signal_window, adjust=False).mean()
+        return macd(self.data['Close'].to_numpy(), self.short_window, self.long_window, self.signal_window)
 
     def generate_signals(self):
         """Generate buy/sell signals based on MACD strategy."""
-        self.calculate_macd()
-
-        self.data['Signal'] = 0
-        self.data.loc[self.data['MACD'] > self.data['Signal_Line'], 'Signal'] = 1  # Buy signal
-        self.data.loc[self.data['MACD'] < self.data['Signal_Line'], 'Signal'] = -1  # Sell signal
-
-        self.data['Signal'].fillna(0, inplace=True)
-
-        return self.data['Signal']
+        result = self.calculate_macd()
+
+        # Buy while the MACD is above its signal line, sell while below
+        signals = crossover_signals(result.macd, result.signal_line)
+        return pd.Series(signals, index=self.data.index, name='Signal')
+
+    def warmup_bars(self):
+        # EMAs never forget entirely; after this many spans the seed's weight is far below float precision
+        return EMA_WARMUP_SPANS * (self.long_window + self.signal_window)
+
+    def update(self, bar):
+        """Update the MACD and signal line EMAs with one bar and return its signal."""
+        if self.stream is None:
+            self.stream = (EMA(self.short_window), EMA(self.long_window), EMA(self.signal_window))
+        ema_short, ema_long, ema_signal = self.stream
+        macd = ema_short.update(bar['Close']) - ema_long.update(bar['Close'])
+        signal_line = ema_signal.update(macd)
+        if macd > signal_line:
+            return 1  # Buy signal
+        if macd < signal_line:
+            return -1  # Sell signal
+        return 0
@@ -0,0 +1,80 @@
+import importlib
+from collections.abc import Mapping
+from importlib.metadata import EntryPoint, entry_points
+
+# Installed packages can add strategies under this entry point group, e.g. in setup.py:
+#     entry_points={"backtest_engine.strategies": ["Mean Reversion = my_package.strategies:MeanReversion"]}
+ENTRY_POINT_GROUP = "backtest_engine.strategies"
+
+# Display name -> "module:Class" of the built-in strategies
+BUILTIN_STRATEGIES = {
+    "Bollinger Band": "src.strategies.bollinger_band:BollingerBandStrategy",
+    "Simple Moving Avg": "src.strategies.simple_moving_average:SMAStrategy",
+    "MACD": "src.strategies.macd:MACDStrategy",
+    "RSI": "src.strategies.rsi:RSIStrategy",
+    "VWAP": "src.strategies.vwap:VWAPStrategy",
+    "Ensemble": "src.strategies.ensemble:EnsembleStrategy",
+}
+
+
+class StrategyRegistry(Mapping):
+    """Read-only mapping of strategy names to classes that imports each class on first lookup.
+
+    Names come from the built-in table, from classes registered with
+    ``register`` and from the entry point group of installed packages.
+    Listing names or testing ``name in registry`` imports nothing.
+    """
+
+    def __init__(self, builtins):
+        self._targets = dict(builtins)
+        self._classes = {}
+        self._discovered = False
+
+    def register(self, name):
+        """Class decorator adding a strategy under ``name``."""
+        def decorator(cls):
+            self._targets[name] = cls
+            self._classes[name] = cls
+            return cls
+        return decorator
+
+    def _discover(self):
+        if not self._discovered:
+            self._discovered = True
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                self._targets.setdefault(entry_point.name, entry_point)
+
+    def __getitem__(self, name):
+        if name not in self._classes:
+            self._discover()
+            target = self._targets[name]
+            if isinstance(target, str):
+                module, _, attribute = target.partition(":")
+                target = getattr(importlib.import_module(module), attribute)
+            elif isinstance(target, EntryPoint):
+                target = target.load()
+            self._classes[name] = target
+        return self._classes[name]
+
+    def __contains__(self, name):
+        self._discover()
+        return name in self._targets
+
+    def __iter__(self):
+        self._discover()
+        return iter(self._targets)
+
+    def __len__(self):
+        self._discover()
+        return len(self._targets)
+
+
+STRATEGIES = StrategyRegistry(BUILTIN_STRATEGIES)
+register_strategy = STRATEGIES.register
+
+
+def get_strategy(name):
+    """Return the strategy class registered as ``name``."""
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'. Choose from {list(STRATEGIES)}.")
+    return STRATEGIES[name]
@@ -1,7 +1,11 @@
 import pandas as pd
 from .base_strategy import BaseStrategy
+from .indicators import band_signals, rsi
+from .streaming import RollingRSI
 
 class RSIStrategy(BaseStrategy):
+    oversold, overbought = 30, 70
+
     def __init__(self, data, capital, investment_style="Moderate"):
         super().__init__(data, capital)
         self.investment_style = investment_style
@@ -20,22 +24,24 @@ class RSIStrategy(BaseStrategy):
 
     def calculate_rsi(self):
         """Calculate the Relative Strength Index (RSI)."""
-        delta = self.data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_window).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return rsi(self.data['Close'].to_numpy(), self.rsi_window)
 
     def generate_signals(self):
         """Generate buy/sell signals based on RSI strategy."""
-        self.data['RSI'] = self.calculate_rsi()
-
-        self.data['Signal'] = 0
-        self.data.loc[self.data['RSI'] < 30, 'Signal'] = 1  # Buy signal (Oversold)
-        self.data.loc[self.data['RSI'] > 70, 'Signal'] = -1  # Sell signal (Overbought)
-
-        self.data['Signal'].fillna(0, inplace=True)
-
-        return self.data['Signal']
+        # Buy when oversold (RSI < 30), sell when overbought (RSI > 70)
+        signals = band_signals(self.calculate_rsi(), self.oversold, self.overbought)
+        return pd.Series(signals, index=self.data.index, name='Signal')
+
+    def warmup_bars(self):
+        return self.rsi_window + 1  # one more bar for the first price change
+
+    def update(self, bar):
+        """Update the RSI with one bar and return its signal."""
+        if self.stream is None:
+            self.stream = RollingRSI(self.rsi_window)
+        value = self.stream.update(bar['Close'])
+        if value < self.oversold:
+            return 1  # Buy signal (Oversold)
+        if value > self.overbought:
+            return -1  # Sell signal (Overbought)
+        return 0
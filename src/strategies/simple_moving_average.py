@@ -1,5 +1,7 @@
 import pandas as pd
 from .base_strategy import BaseStrategy
+from .indicators import crossover_signals, rolling_mean
+from .streaming import RollingStats
 
 class SMAStrategy(BaseStrategy):
     def __init__(self, data, capital, investment_style="Moderate"):
@@ -23,16 +25,28 @@ class SMAStrategy(BaseStrategy):
 
     def generate_signals(self):
         """Generate buy/sell signals based on SMA crossover strategy."""
-        # Calculate the short-term and long-term moving averages
-        self.data['SMA_Short'] = self.data['Close'].rolling(window=self.short_window).mean()
-        self.data['SMA_Long'] = self.data['Close'].rolling(window=self.long_window).mean()
+        close = self.data['Close'].to_numpy()
+        sma_short = rolling_mean(close, self.short_window)
+        sma_long = rolling_mean(close, self.long_window)
 
-        # Generate signals: 1 for buy, -1 for sell, 0 for hold
-        self.data['Signal'] = 0  # Default hold signal
-        self.data.loc[self.data['SMA_Short'] > self.data['SMA_Long'], 'Signal'] = 1  # Buy signal
-        self.data.loc[self.data['SMA_Short'] < self.data['SMA_Long'], 'Signal'] = -1  # Sell signal
+        # Signals: 1 for buy, -1 for sell, 0 for hold (including before the long window fills)
+        signals = crossover_signals(sma_short, sma_long)
+        return pd.Series(signals, index=self.data.index, name='Signal')
 
-        # Fill NaN values with hold (0)
-        self.data['Signal'].fillna(0, inplace=True)
+    def warmup_bars(self):
+        return self.long_window
 
-        return self.data['Signal']
+    def update(self, bar):
+        """Update both moving averages with one bar and return its signal."""
+        if self.stream is None:
+            self.stream = (RollingStats(self.short_window), RollingStats(self.long_window))
+        short_ma, long_ma = self.stream
+        short_ma.update(bar['Close'])
+        long_ma.update(bar['Close'])
+        if not (short_ma.full and long_ma.full):
+            return 0
+        if short_ma.mean > long_ma.mean:
+            return 1  # Buy signal
+        if short_ma.mean < long_ma.mean:
+            return -1  # Sell signal
+        return 0
@@ -0,0 +1,111 @@
+import math
+
+import pandas as pd
+
+
+class RollingStats:
+    """Constant-time rolling sum, mean and sample standard deviation over a fixed window.
+
+    Values live in a ring buffer; the mean and sum of squared deviations are
+    updated with Welford's add/remove recurrences as values enter and leave.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.position = 0
+        self.count = 0
+        self.nonzero = 0  # lets an all-zero window report an exact zero sum
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def full(self):
+        return self.count == self.window
+
+    def update(self, value):
+        if self.full:
+            old = self.buffer[self.position]
+            new_mean = self.mean + (value - old) / self.window
+            self._m2 += (value - old) * (value - new_mean + old - self.mean)
+            self.mean = new_mean
+            self.nonzero -= old != 0
+        else:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        self.nonzero += value != 0
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.window
+
+    @property
+    def sum(self):
+        return self.mean * self.count if self.nonzero else 0.0
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+
+class EMA:
+    """Recursive exponential moving average matching ``ewm(span=..., adjust=False)``."""
+
+    def __init__(self, span):
+        self.alpha = 2 / (span + 1)
+        self.value = None
+
+    def update(self, value):
+        if self.value is None:
+            self.value = value
+        else:
+            # Same operation order as pandas so crossovers agree with the batch signals
+            old_weight = 1 - self.alpha
+            self.value = (old_weight * self.value + self.alpha * value) / (old_weight + self.alpha)
+        return self.value
+
+
+class RollingRSI:
+    """Rolling-mean RSI, as computed by RSIStrategy.calculate_rsi, one close at a time."""
+
+    def __init__(self, window):
+        self.gains = RollingStats(window)
+        self.losses = RollingStats(window)
+        self.previous = None
+
+    def update(self, close):
+        delta = 0.0 if self.previous is None else close - self.previous
+        self.previous = close
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+        if not self.gains.full:
+            return math.nan
+        gain, loss = self.gains.sum, self.losses.sum
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+
+class RollingVWAP:
+    """Rolling volume-weighted average price from running price*volume and volume sums."""
+
+    def __init__(self, window):
+        self.price_volume = RollingStats(window)
+        self.volume = RollingStats(window)
+
+    def update(self, close, volume):
+        self.price_volume.update(close * volume)
+        self.volume.update(volume)
+        if not self.volume.full or self.volume.sum == 0:
+            return math.nan
+        return self.price_volume.sum / self.volume.sum
+
+
+def stream_signals(strategy, data):
+    """Feed ``data`` to ``strategy.update`` one bar at a time and collect the signals."""
+    strategy.reset()
+    columns = [c for c in ('Close', 'Volume') if c in data.columns]
+    bars = (dict(zip(columns, values)) for values in zip(*(data[c].tolist() for c in columns)))
+    return pd.Series([strategy.update(bar) for bar in bars], index=data.index, name='Signal')
@@ -1,5 +1,7 @@
 import pandas as pd
 from .base_strategy import BaseStrategy
+from .indicators import crossover_signals, vwap
+from .streaming import RollingVWAP
 
 class VWAPStrategy(BaseStrategy):
     def __init__(self, data, capital, investment_style="Moderate"):
@@ -20,12 +22,23 @@ class VWAPStrategy(BaseStrategy):
 
     def generate_signals(self):
         """Generate buy/sell signals based on VWAP strategy."""
-        self.data['VWAP'] = (self.data['Close'] * self.data['Volume']).rolling(window=self.vwap_window).sum() / self.data['Volume'].rolling(window=self.vwap_window).sum()
+        close = self.data['Close'].to_numpy()
+        rolling_vwap = vwap(close, self.data['Volume'].to_numpy(), self.vwap_window)
 
-        self.data['Signal'] = 0
-        self.data.loc[self.data['Close'] > self.data['VWAP'], 'Signal'] = 1  # Buy signal
-        self.data.loc[self.data['Close'] < self.data['VWAP'], 'Signal'] = -1  # Sell signal
+        # Buy while the close is above the VWAP, sell while below
+        signals = crossover_signals(close, rolling_vwap)
+        return pd.Series(signals, index=self.data.index, name='Signal')
 
-        self.data['Signal'].fillna(0, inplace=True)
+    def warmup_bars(self):
+        return self.vwap_window
 
-        return self.data['Signal']
+    def update(self, bar):
+        """Update the rolling VWAP with one bar and return its signal."""
+        if self.stream is None:
+            self.stream = RollingVWAP(self.vwap_window)
+        vwap = self.stream.update(bar['Close'], bar['Volume'])
+        if bar['Close'] > vwap:
+            return 1  # Buy signal
+        if bar['Close'] < vwap:
+            return -1  # Sell signal
+        return 0
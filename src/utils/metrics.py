@@ -1,8 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from src.backtest.ledger import TradeLedger
+
+
 def calculate_roi(initial_capital, final_capital):
     """Calculate Return on Investment (ROI)."""
     return (final_capital - initial_capital) / initial_capital
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0):
-    """Calculate the Sharpe ratio given returns and a risk-free rate."""
+    """Calculate the Sharpe ratio given returns and a risk-free rate.
+
+    A 2-D array is treated as one return path per row and gives one ratio per path.
+    """
     excess_returns = returns - risk_free_rate
+    if isinstance(excess_returns, np.ndarray) and excess_returns.ndim == 2:
+        return excess_returns.mean(axis=1) / excess_returns.std(axis=1, ddof=1)
     return excess_returns.mean() / excess_returns.std()
+
+def calculate_max_drawdown(equity):
+    """Largest peak-to-trough decline as a (negative) fraction of the peak.
+
+    Works on a 1-D equity curve or a 2-D array with one curve per row.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    running_peak = np.maximum.accumulate(equity, axis=-1)
+    return (equity / running_peak - 1).min(axis=-1)
+
+POSITION_COLUMNS = ["Date", "Action", "Shares", "Price"]
+
+
+def calculate_equity_curve(prices, positions, capital):
+    """Mark-to-market portfolio value at every bar of ``prices`` given the positions taken.
+
+    ``prices`` is a Close Series; ``positions`` is the Backtester list of
+    (date, action, shares, price) tuples. Runs in O(bars + trades).
+    """
+    close = prices.to_numpy(dtype=np.float64)
+    cash_delta = np.zeros(len(close))
+    share_delta = np.zeros(len(close))
+    if positions:
+        dates, actions, shares, fill_prices = zip(*positions)
+        rows = prices.index.get_indexer(pd.Index(dates))
+        signed = np.where(np.asarray(actions) == 'Buy', 1.0, -1.0) * np.asarray(shares, dtype=np.float64)
+        np.add.at(share_delta, rows, signed)
+        np.add.at(cash_delta, rows, -signed * np.asarray(fill_prices, dtype=np.float64))
+    equity = capital + np.cumsum(cash_delta) + np.cumsum(share_delta) * close
+    return pd.Series(equity, index=prices.index, name='Equity')
+
+
+def calculate_trade_pnl(positions):
+    """Per-trade and cumulative realized profit/loss as a DataFrame.
+
+    Sells are matched against the oldest open buys (FIFO), so partial sells
+    and several buys before a sell are costed correctly.
+    """
+    trades = pd.DataFrame(positions, columns=POSITION_COLUMNS)
+    pnl, average_cost = TradeLedger.from_positions(positions).realized_pnl()
+    trades['Average Cost'] = average_cost
+    trades['Profit/Loss'] = pnl
+    trades['Cumulative P/L'] = trades['Profit/Loss'].cumsum()
+    return trades
+
+
+def calculate_drawdown_duration(equity):
+    """Longest run of bars spent below a previous equity peak."""
+    equity = np.asarray(equity, dtype=np.float64)
+    underwater = equity < np.maximum.accumulate(equity)
+    if not underwater.any():
+        return 0
+    # Length of each run of consecutive underwater bars
+    edges = np.diff(np.concatenate(([0], underwater.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def performance_summary(equity, positions=None, periods_per_year=252, risk_free_rate=0):
+    """Headline statistics of a backtest from its equity curve (and positions, for trade stats).
+
+    Returns total return, CAGR, annualized volatility, Sharpe and Sortino,
+    max drawdown and its duration in bars, Calmar, and, when positions are
+    given, trade count, hit rate, turnover and exposure. Everything is derived
+    from one pass of vectorized operations over the equity and trade arrays.
+    """
+    values = equity.to_numpy(dtype=np.float64) if isinstance(equity, pd.Series) else np.asarray(equity, dtype=np.float64)
+    returns = values[1:] / values[:-1] - 1
+    excess = returns - risk_free_rate / periods_per_year
+
+    if isinstance(equity, pd.Series) and isinstance(equity.index, pd.DatetimeIndex) and len(values) > 1:
+        years = (equity.index[-1] - equity.index[0]).days / 365.25
+    else:
+        years = (len(values) - 1) / periods_per_year
+    total_return = values[-1] / values[0] - 1
+    cagr = (values[-1] / values[0]) ** (1 / years) - 1 if years > 0 else np.nan
+
+    scale = np.sqrt(periods_per_year)
+    volatility = returns.std(ddof=1) * scale if len(returns) > 1 else np.nan
+    downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2)) if len(excess) else np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = excess.mean() / excess.std(ddof=1) * scale if len(excess) > 1 else np.nan
+        sortino = excess.mean() / downside * scale if len(excess) else np.nan
+    max_drawdown = calculate_max_drawdown(values)
+
+    summary = {
+        'Total Return': total_return,
+        'CAGR': cagr,
+        'Volatility': volatility,
+        'Sharpe': sharpe,
+        'Sortino': sortino,
+        'Max Drawdown': max_drawdown,
+        'Max Drawdown Duration': calculate_drawdown_duration(values),
+        'Calmar': cagr / abs(max_drawdown) if max_drawdown < 0 else np.nan,
+    }
+
+    if positions is not None:
+        trades = calculate_trade_pnl(positions)
+        sells = trades['Action'].to_numpy() == 'Sell'
+        traded = (trades['Shares'] * trades['Price']).sum()
+        summary.update({
+            'Trades': len(trades),
+            'Hit Rate': (trades['Profit/Loss'].to_numpy()[sells] > 0).mean() if sells.any() else np.nan,
+            'Turnover': traded / values.mean(),
+        })
+        if isinstance(equity, pd.Series) and len(trades):
+            rows = equity.index.get_indexer(pd.Index(trades['Date']))
+            signed = np.where(trades['Action'].to_numpy() == 'Buy', 1, -1) * trades['Shares'].to_numpy()
+            held = np.zeros(len(values))
+            np.add.at(held, rows, signed)
+            summary['Exposure'] = (np.cumsum(held) > 0).mean()
+        else:
+            summary['Exposure'] = 0.0
+    return summary
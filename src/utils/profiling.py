@@ -0,0 +1,204 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import pandas as pd
+
+# e.g. BACKTEST_PROFILE=1 for stage timers, BACKTEST_PROFILE=cprofile,memory for everything
+PROFILE_ENV = "BACKTEST_PROFILE"
+STAGE_COLUMNS = ["Stage", "Calls", "Total s", "Mean s", "Peak MB"]
+
+# The report being collected in this thread/task, or None when profiling is off
+_active = ContextVar("active_profile", default=None)
+
+
+def profiling_options(value=None):
+    """Parse a BACKTEST_PROFILE value into (enabled, cprofile, memory).
+
+    Empty or "0" turns profiling off; any other value turns on the stage
+    timers, plus cProfile and/or tracemalloc if "cprofile" or "memory" is
+    among its comma-separated words.
+    """
+    value = os.environ.get(PROFILE_ENV, "") if value is None else value
+    words = {word.strip().lower() for word in value.split(",") if word.strip()}
+    if not words or words == {"0"}:
+        return False, False, False
+    return True, "cprofile" in words, bool(words & {"memory", "tracemalloc"})
+
+
+class ProfileReport:
+    """Stage timings, counters and optional cProfile/tracemalloc output of one run."""
+
+    def __init__(self, enabled=True, cprofile=False, memory=False):
+        self.enabled = enabled
+        self.cprofile = cprofile
+        self.memory = memory
+        self.stages = {}  # name -> [calls, seconds, peak bytes or None]
+        self.counters = {}
+        self.profile_text = None
+        self.wall_time = 0.0
+        self._peaks = []
+
+    def add_stage(self, name, seconds, peak=None):
+        entry = self.stages.setdefault(name, [0, 0.0, None])
+        entry[0] += 1
+        entry[1] += seconds
+        if peak is not None:
+            entry[2] = peak if entry[2] is None else max(entry[2], peak)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other):
+        """Fold in another report (or its ``to_dict()``), e.g. one from a worker process."""
+        other = other.to_dict() if isinstance(other, ProfileReport) else other
+        for stage in other["stages"]:
+            entry = self.stages.setdefault(stage["Stage"], [0, 0.0, None])
+            entry[0] += stage["Calls"]
+            entry[1] += stage["Total s"]
+            if stage["Peak MB"] is not None:
+                peak = stage["Peak MB"] * 2**20
+                entry[2] = peak if entry[2] is None else max(entry[2], peak)
+        for name, n in other["counters"].items():
+            self.count(name, n)
+
+    def to_frame(self):
+        rows = [
+            (name, calls, seconds, seconds / calls, None if peak is None else peak / 2**20)
+            for name, (calls, seconds, peak) in self.stages.items()
+        ]
+        frame = pd.DataFrame(rows, columns=STAGE_COLUMNS)
+        return frame.sort_values("Total s", ascending=False, ignore_index=True)
+
+    def to_dict(self):
+        return {
+            "wall_time": self.wall_time,
+            "stages": self.to_frame().to_dict(orient="records"),
+            "counters": dict(self.counters),
+            "profile": self.profile_text,
+        }
+
+    def to_json(self, path=None):
+        """Return the report as JSON, also writing it to ``path`` when given."""
+        text = json.dumps(self.to_dict(), indent=2, default=str)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+def start_profiling(enabled=None, cprofile=None, memory=None):
+    """Make a new ProfileReport the active one and return it.
+
+    Options left as None come from the BACKTEST_PROFILE environment variable.
+    When profiling ends up disabled the report stays empty and every timer is
+    a no-op. Pair with ``stop_profiling``, or use ``profile_run``.
+    """
+    env_enabled, env_cprofile, env_memory = profiling_options()
+    cprofile = env_cprofile if cprofile is None else cprofile
+    memory = env_memory if memory is None else memory
+    enabled = (env_enabled or cprofile or memory) if enabled is None else enabled
+    report = ProfileReport(enabled, cprofile and enabled, memory and enabled)
+    if not enabled:
+        return report
+
+    report._token = _active.set(report)
+    if report.memory:
+        report._started_tracemalloc = not tracemalloc.is_tracing()
+        if report._started_tracemalloc:
+            tracemalloc.start()
+        report._peaks.append(0)
+        tracemalloc.reset_peak()
+    if report.cprofile:
+        report._profiler = cProfile.Profile()
+        report._profiler.enable()
+    report._start = time.perf_counter()
+    return report
+
+
+def stop_profiling(report, top=25):
+    """Finish collecting ``report`` (a no-op when it is disabled) and return it."""
+    if not report.enabled or not hasattr(report, "_token"):
+        return report
+    report.wall_time = time.perf_counter() - report._start
+    if report.cprofile:
+        report._profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(report._profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        report.profile_text = stream.getvalue()
+    if report.memory:
+        report.add_stage("total", 0.0, max(report._peaks.pop(), tracemalloc.get_traced_memory()[1]))
+        report.stages["total"][1] = report.wall_time
+        if report._started_tracemalloc:
+            tracemalloc.stop()
+    _active.reset(report._token)
+    del report._token
+    return report
+
+
+@contextmanager
+def profile_run(enabled=None, cprofile=None, memory=None, top=25):
+    """Collect a ProfileReport over the block; see ``start_profiling`` for the options."""
+    report = start_profiling(enabled, cprofile, memory)
+    try:
+        yield report
+    finally:
+        stop_profiling(report, top)
+
+
+def active_report():
+    """The ProfileReport being collected, or None when profiling is off."""
+    return _active.get()
+
+
+@contextmanager
+def stage(name):
+    """Time the block as stage ``name`` of the active report, if any."""
+    report = _active.get()
+    if report is None:
+        yield
+        return
+    if report.memory:
+        # Carry the enclosing stage's peak so far, then measure this stage on its own
+        report._peaks[-1] = max(report._peaks[-1], tracemalloc.get_traced_memory()[1])
+        report._peaks.append(0)
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        peak = None
+        if report.memory:
+            peak = max(report._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            report._peaks[-1] = max(report._peaks[-1], peak)
+        report.add_stage(name, seconds, peak)
+
+
+def timed(name=None):
+    """Decorator timing every call of a function as a stage (its own name by default)."""
+    def decorator(function):
+        stage_name = name or function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return function(*args, **kwargs)
+            with stage(stage_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Add ``n`` to counter ``name`` of the active report, if any."""
+    report = _active.get()
+    if report is not None:
+        report.count(name, n)
@@ -0,0 +1,70 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import calculate_max_drawdown, calculate_sharpe_ratio
+
+RobustnessReport = namedtuple('RobustnessReport', ['final_values', 'max_drawdowns', 'sharpe_ratios'])
+
+
+def returns_from_equity(equity):
+    """Per-bar simple returns of an equity curve."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[1:] / equity[:-1] - 1
+
+
+def block_bootstrap(returns, n_paths, block_size, rng):
+    """Resample a return stream into ``n_paths`` rows by stitching random circular blocks."""
+    n_bars = len(returns)
+    n_blocks = -(-n_bars // block_size)
+    starts = rng.integers(0, n_bars, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)) % n_bars
+    return returns[index.reshape(n_paths, -1)[:, :n_bars]]
+
+
+def shuffle_order(returns, n_paths, rng):
+    """Randomly reorder a return stream (e.g. per-trade returns) once per row."""
+    return rng.permuted(np.broadcast_to(returns, (n_paths, len(returns))), axis=1)
+
+
+def monte_carlo(returns, n_paths=10000, method='block', block_size=20, capital=10000,
+                seed=None, max_elements=2_000_000):
+    """Distribution of final value, max drawdown and Sharpe over resampled return paths.
+
+    ``method`` is 'block' (circular block bootstrap, keeping short-range
+    autocorrelation) or 'shuffle' (reorder the returns, e.g. trade order).
+    Paths are generated as 2-D arrays in chunks of at most ``max_elements``
+    values, so memory stays bounded however many paths are requested.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if method not in ('block', 'shuffle'):
+        raise ValueError("Invalid method. Choose from 'block' or 'shuffle'.")
+    rng = np.random.default_rng(seed)
+    chunk = max(1, max_elements // max(len(returns), 1))
+
+    final_values = np.empty(n_paths)
+    max_drawdowns = np.empty(n_paths)
+    sharpe_ratios = np.empty(n_paths)
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        if method == 'block':
+            paths = block_bootstrap(returns, stop - start, block_size, rng)
+        else:
+            paths = shuffle_order(returns, stop - start, rng)
+
+        equity = np.cumprod(1 + paths, axis=1)
+        equity *= capital
+        final_values[start:stop] = equity[:, -1]
+        max_drawdowns[start:stop] = calculate_max_drawdown(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe_ratios[start:stop] = calculate_sharpe_ratio(paths)
+    return RobustnessReport(final_values, max_drawdowns, sharpe_ratios)
+
+
+def summarize(report, percentiles=(5, 25, 50, 75, 95)):
+    """Percentile table of each robustness metric."""
+    return pd.DataFrame(
+        {name: np.nanpercentile(values, percentiles) for name, values in report._asdict().items()},
+        index=pd.Index([f"p{p}" for p in percentiles], name='Percentile'),
+    )
@@ -11,15 +11,94 @@
 #         plt.plot(data['Lower'], linestyle='--', color='gray', label='Lower Band')
 #     plt.legend()
 #     plt.show()
-import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
+
+from src.utils.profiling import timed
+
+# Roughly the horizontal pixels of a chart; longer series are downsampled to about this many points
+MAX_POINTS = 2000
+
+
+def lttb(y, n_out, x=None):
+    """Indices of the ``n_out`` points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The rest are split into
+    ``n_out - 2`` equal buckets, and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's average is
+    chosen, which preserves the visual peaks and troughs of the series.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    # Average of each bucket's successor; the last bucket looks at the final point
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.nancumsum(y)))
+    sizes = (ends - starts)[1:]
+    next_x = np.append((cum_x[ends[1:]] - cum_x[starts[1:]]) / sizes, x[-1])
+    next_y = np.append((cum_y[ends[1:]] - cum_y[starts[1:]]) / sizes, y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(len(starts)):
+        s, e = starts[b], ends[b]
+        area = np.abs((x[a] - next_x[b]) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (next_y[b] - y[a]))
+        a = s + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[b + 1] = a
+    return keep
+
+
+def resample_ohlc(open_, high, low, close, max_bars):
+    """Merge runs of consecutive bars into at most ``max_bars`` candles.
+
+    Returns ``(first_index, open, high, low, close)`` where ``first_index``
+    is the position of each candle's first bar. Each candle opens at its first
+    bar's open, closes at its last bar's close and spans their full range.
+    """
+    n = len(close)
+    size = max(-(-n // max_bars), 1)
+    first = np.arange(0, n, size)
+    last = np.minimum(first + size, n) - 1
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    return (
+        first,
+        np.asarray(open_, dtype=np.float64)[first],
+        np.maximum.reduceat(high, first),
+        np.minimum.reduceat(low, first),
+        np.asarray(close, dtype=np.float64)[last],
+    )
+
+
+def _x_values(index):
+    """Numeric x positions for LTTB: timestamps when the index has them, else bar numbers."""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return None
+
+
+@timed()
+def plot_stock_data(data, max_points=MAX_POINTS):
+    """Candlestick chart, re-aggregated into coarser candles beyond ``max_points`` bars."""
+    x, o, h, l, c = data.index, data['Open'], data['High'], data['Low'], data['Close']
+    if len(data) > max_points:
+        first, o, h, l, c = resample_ohlc(o.to_numpy(), h.to_numpy(), l.to_numpy(), c.to_numpy(), max_points)
+        x = data.index[first]
+
+    import plotly.graph_objects as go  # deferred: plotly is slow to import and only needed for charts
 
-def plot_stock_data(data):
     fig = go.Figure(data=[go.Candlestick(
-        x=data.index,
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
+        x=x,
+        open=o,
+        high=h,
+        low=l,
+        close=c,
         name="Candlestick"
     )])
 
@@ -31,42 +110,40 @@ def plot_stock_data(data):
     )
     return fig
 
-def plot_stock_with_signals(data, positions):
+
+@timed()
+def plot_stock_with_signals(data, positions, max_points=MAX_POINTS):
+    """Close price (LTTB-downsampled, WebGL) with every buy and sell marked at its exact date and price."""
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     # Plot the stock closing price
-    fig.add_trace(go.Scatter(
-        x=data.index,
-        y=data['Close'],
+    close = data['Close'].to_numpy()
+    keep = lttb(close, max_points, _x_values(data.index))
+    fig.add_trace(go.Scattergl(
+        x=data.index[keep],
+        y=close[keep],
         mode='lines',
         name='Stock Price'
     ))
 
-    # Separate buy and sell signals from positions
-    buys = [(date, price) for date, action, shares, price in positions if action == "Buy"]
-    sells = [(date, price) for date, action, shares, price in positions if action == "Sell"]
-
-    # Plot buy signals
-    if buys:
-        buy_dates, buy_prices = zip(*buys)
-        fig.add_trace(go.Scatter(
-            x=buy_dates,
-            y=buy_prices,
-            mode='markers',
-            marker=dict(symbol='triangle-up', color='green', size=10),
-            name='Buy Signal'
-        ))
-
-    # Plot sell signals
-    if sells:
-        sell_dates, sell_prices = zip(*sells)
-        fig.add_trace(go.Scatter(
-            x=sell_dates,
-            y=sell_prices,
-            mode='markers',
-            marker=dict(symbol='triangle-down', color='red', size=10),
-            name='Sell Signal'
-        ))
+    # Markers come straight from the positions, so downsampling never moves or drops a trade
+    if positions:
+        dates, actions, shares, prices = zip(*positions)
+        dates = pd.Index(dates)
+        actions = np.asarray(actions)
+        prices = np.asarray(prices, dtype=np.float64)
+        for action, symbol, color in (("Buy", 'triangle-up', 'green'), ("Sell", 'triangle-down', 'red')):
+            mask = actions == action
+            if mask.any():
+                fig.add_trace(go.Scattergl(
+                    x=dates[mask],
+                    y=prices[mask],
+                    mode='markers',
+                    marker=dict(symbol=symbol, color=color, size=10),
+                    name=f'{action} Signal'
+                ))
 
     # Customize layout
     fig.update_layout(
@@ -1,15 +1,89 @@
+import io
+from functools import partial
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.table import Table
 from src.data.data_loader import load_data
-from src.strategies.bollinger_band import BollingerBandStrategy
-from src.strategies.macd import MACDStrategy
-from src.strategies.rsi import RSIStrategy
-from src.strategies.simple_moving_average import SMAStrategy
-from src.strategies.vwap import VWAPStrategy
+from src.data.store import MarketDataStore, to_utc_index
 from src.backtest.backtester import Backtester
+from src.backtest.batch import STRATEGIES, compare_strategies, leaderboard
+from src.backtest.cache import ResultCache, fingerprint
+from src.backtest.screener import SCREENS, screen
+from src.utils.metrics import calculate_equity_curve, calculate_trade_pnl, performance_summary
 from src.utils.visualizations import plot_stock_data, plot_stock_with_signals
+from src.utils.profiling import start_profiling, stage, stop_profiling
+
+# Streamlit reruns this script on every widget change, so loading, backtests, charts and screens are
+# memoized per process. Cached market data expires after DATA_TTL seconds so the store gets refreshed,
+# and every cache keeps a bounded number of entries so browsing many symbols does not grow memory.
+DATA_TTL = 15 * 60
+PREVIEW_ROWS = 500
+
+
+@st.cache_resource
+def get_result_cache():
+    """The on-disk backtest result cache, shared by every session of this process."""
+    return ResultCache()
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=16, show_spinner="Loading data...")
+def load_symbols(symbols, country):
+    """Refresh and read symbols from the store; returns (data, checksum)."""
+    data = load_data(symbols=list(symbols), country=country, store=MarketDataStore(), cache=get_result_cache())
+    return data, fingerprint(data)["checksum"]
+
+
+@st.cache_data(max_entries=4, show_spinner="Reading upload...")
+def load_upload(content):
+    """Parse an uploaded CSV, keyed on the hash of its bytes; returns (data, checksum)."""
+    data = load_data(file_path=io.BytesIO(content))
+    # Dates with changing UTC offsets (daylight saving) are read as strings; the backtester needs timestamps
+    data.index = to_utc_index(data.index).rename('Date')
+    return data, fingerprint(data)["checksum"]
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def run_cached_backtest(data_key, strategy, management_style, capital, start_date, end_date, _data,
+                        strategy_options=()):
+    """Backtest and the tables derived from it, keyed on the data checksum and the backtest parameters.
+
+    ``strategy_options`` are extra (name, value) keyword arguments of the strategy, e.g. ensemble members.
+    """
+    strategy_class = partial(STRATEGIES[strategy], **dict(strategy_options))
+    backtester = Backtester(_data, strategy_class, capital, start_date, end_date, management_style)
+    final_value, hodl_value, positions = get_result_cache().run(backtester)
+
+    # Performance statistics from the mark-to-market equity curve
+    with stage("metrics"):
+        equity = calculate_equity_curve(backtester.data['Close'], positions, capital)
+        summary = performance_summary(equity, positions)
+
+    # Profit/Loss per trade and cumulative; sells are matched against the oldest open buys (FIFO)
+    with stage("trade_pnl"):
+        profit_loss_df = calculate_trade_pnl(positions)
+    return {
+        "final_value": final_value,
+        "hodl_value": hodl_value,
+        "positions": positions,
+        "summary": summary,
+        "trade_pnl": profit_loss_df,
+        "round_trips": backtester.get_ledger().match_fifo(),
+    }
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def price_chart(data_key, _data):
+    return plot_stock_data(_data)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def signals_chart(data_key, positions, _data):
+    return plot_stock_with_signals(_data, positions)
+
+
+@st.cache_data(ttl=DATA_TTL, max_entries=8, show_spinner=False)
+def screen_universe(data_key, strategies, style, _universe):
+    return screen(_universe, list(strategies), style)
+
 
 # App Title and Description
 st.title("Stock Backtesting Engine")
@@ -47,15 +121,28 @@ selected_symbol = st.sidebar.selectbox("Select Stocks", symbols,index=0)
 st.sidebar.subheader("2. Upload Data (Optional)")
 file_path = st.sidebar.file_uploader("Or upload a CSV file with stock data", type=["csv"])
 
+# Backtest results are also cached on disk, across restarts
+result_cache = get_result_cache()
+
+# Stage timings for this run; also switched on by the BACKTEST_PROFILE environment variable
+profile = st.sidebar.checkbox("Profile this run", value=False)
+report = start_profiling(enabled=True if profile else None)
+
 # Load Data (either from CSV or selected symbols)
 data = None
 if file_path:
-    data = load_data(file_path=file_path)
-    st.write("**Uploaded Stock Data:**", data)
+    data, data_key = load_upload(file_path.getvalue())
+    st.write("**Uploaded Stock Data:**")
 
 elif selected_symbol:
-    data = load_data(symbols=[selected_symbol], country=country)
-    st.write(f"**Stock Data for {country} - {selected_symbol}:**", data)
+    data, data_key = load_symbols((selected_symbol,), country)
+    st.write(f"**Stock Data for {country} - {selected_symbol}:**")
+
+# Only the latest rows are sent to the browser; the full history can be long
+if data is not None:
+    st.dataframe(data.tail(PREVIEW_ROWS))
+    if len(data) > PREVIEW_ROWS:
+        st.caption(f"Latest {PREVIEW_ROWS} of {len(data)} rows")
 
 # Check if data is available before displaying strategy options
 if data is not None and not data.empty:
@@ -66,27 +153,31 @@ if data is not None and not data.empty:
     initial_capital = st.sidebar.number_input("Initial Capital", min_value=1000, step=1000)
     management_style = st.sidebar.selectbox("Investment Style", ["Aggressive", "Moderate", "Passive"])
     
-    strategy = st.sidebar.selectbox("Select Strategy", ["Bollinger Band","Simple Moving Avg","MACD", "RSI", "VWAP"])
-    # strategy = st.sidebar.selectbox("Select Strategy", ["Bollinger Band","Simple Moving Avg"])
+    strategy = st.sidebar.selectbox("Select Strategy", list(STRATEGIES))
+    strategy_options = ()
+    if strategy == "Ensemble":
+        choices = [name for name in STRATEGIES if name != "Ensemble"]
+        members = st.sidebar.multiselect("Ensemble Members", choices, default=choices)
+        mode = st.sidebar.selectbox("Combine Signals By", ["vote", "weighted", "unanimous"])
+        strategy_options = (("members", tuple(members) or None), ("mode", mode))
+
+    # Every strategy x style on the loaded data, across worker processes; the table fills in as runs finish
+    if st.sidebar.button("Compare All"):
+        st.subheader("Strategy Leaderboard")
+        board = st.empty()
+        rows = []
+        with st.spinner("Running every strategy and style..."):
+            for row in compare_strategies(data, initial_capital, start_date, end_date, cache=result_cache):
+                rows.append(row)
+                board.dataframe(leaderboard(rows), hide_index=True)
 
     # Run Backtest on Button Click
     if st.sidebar.button("Run Backtest"):
         with st.spinner("Running backtest..."):
-            if strategy == "Bollinger Band":
-                backtester = Backtester(data, BollingerBandStrategy, initial_capital, start_date, end_date, management_style)
-            elif strategy == "MACD":
-                backtester = Backtester(data, MACDStrategy, initial_capital, start_date, end_date, management_style)
-            elif strategy == "RSI":
-                backtester = Backtester(data, RSIStrategy, initial_capital, start_date, end_date, management_style)
-            elif strategy == "Simple Moving Avg":
-                backtester = Backtester(data, SMAStrategy, initial_capital, start_date, end_date, management_style)
-            elif strategy == "VWAP":
-                backtester = Backtester(data, VWAPStrategy, initial_capital, start_date, end_date, management_style)
-
-            backtester.run_backtest()
-
-            # Results
-            final_value, hodl_value, positions = backtester.get_results()
+            # Results (memoized in this process, and read from disk when this exact backtest has run before)
+            result = run_cached_backtest(data_key, strategy, management_style, initial_capital,
+                                         start_date, end_date, data, strategy_options)
+            final_value, hodl_value, positions = result["final_value"], result["hodl_value"], result["positions"]
 
             # Display Final Portfolio Value with a green color for success
             if final_value > hodl_value:
@@ -108,38 +199,23 @@ if data is not None and not data.empty:
             # Visualizations
             st.subheader("Visualizations")
             st.write("### Initial Stock Data")
-            st.plotly_chart(plot_stock_data(data), use_container_width=True)
+            st.plotly_chart(price_chart(data_key, data), use_container_width=True)
 
             st.write("### Backtest Results with Buy/Sell Signals")
-            st.plotly_chart(plot_stock_with_signals(data, positions), use_container_width=True)
-
-            # st.write("### Profit/Loss on Each Trade")
-            # profit_loss = [(date, action, shares * price) for date, action, shares, price in positions]
-            # st.write(profit_loss)
-            profit_loss = []
-            cumulative_profit = 0
-            for i, (date, action, shares, price) in enumerate(positions):
-                # Buy action: no profit/loss yet, just store the cost
-                if action == 'Buy':
-                    profit_loss.append((date, action, shares, price, 0))  # No P/L for buy
-                else:
-                    # Sell action: Calculate profit/loss
-                    previous_buy = positions[i - 1]  # The previous Buy action
-                    buy_price = previous_buy[3]  # Price from the previous Buy action
-                    pl = (price - buy_price) * shares  # Profit or Loss
-                    cumulative_profit += pl
-                    profit_loss.append((date, action, shares, price, pl))
-
-            # Convert profit_loss list into a DataFrame for better display
-            profit_loss_df = pd.DataFrame(profit_loss, columns=["Date", "Action", "Shares", "Price", "Profit/Loss"])
-
-            # Plotting the Profit/Loss Cumulative Over Time
-            dates = [entry[0] for entry in profit_loss]
-            cumulative_pl_values = [sum([entry[4] for entry in profit_loss[:i + 1]]) for i in range(len(profit_loss))]
-
-            # Plot the cumulative profit/loss over time
+            st.plotly_chart(signals_chart(data_key, positions, data), use_container_width=True)
+
+            st.write("### Performance")
+            st.dataframe(pd.DataFrame([result["summary"]]))
+
+            profit_loss_df = result["trade_pnl"]
+            dates = profit_loss_df["Date"]
+            cumulative_pl_values = profit_loss_df["Cumulative P/L"].to_numpy()
+
+            # Plot the cumulative profit/loss over time (matplotlib is only imported once a backtest is shown)
+            import matplotlib.pyplot as plt
+
             plt.figure(figsize=(12, 6))
-            plt.plot(dates, cumulative_pl_values, marker='o', color='g' if cumulative_pl_values[-1] >= 0 else 'r')
+            plt.plot(dates, cumulative_pl_values, marker='o', color='g' if len(cumulative_pl_values) == 0 or cumulative_pl_values[-1] >= 0 else 'r')
             plt.title('Cumulative Profit/Loss Over Time', fontsize=14)
             plt.xlabel('Date', fontsize=12)
             plt.ylabel('Cumulative Profit/Loss ($)', fontsize=12)
@@ -152,5 +228,37 @@ if data is not None and not data.empty:
             st.write("### Profit/Loss on Each Trade")
             st.dataframe(profit_loss_df)
 
+            # Matched buy/sell lots with their holding periods
+            st.write("### Round Trips (FIFO)")
+            st.dataframe(result["round_trips"])
+
 else:
     st.warning("Please upload a file or select stock symbols to proceed with the backtest.")
+
+# Screener: rank a whole universe (the uploaded combined file, or every listed symbol of the country) by latest signal
+st.sidebar.subheader("4. Screener")
+screen_strategies = st.sidebar.multiselect("Screener Strategies", list(SCREENS), default=list(SCREENS))
+screen_style = st.sidebar.selectbox("Screener Style", ["Aggressive", "Moderate", "Passive"], index=1)
+if st.sidebar.button("Screen Universe"):
+    with st.spinner("Screening..."):
+        if data is not None and "Symbol" in data.columns:
+            universe, universe_key = data, data_key
+        else:
+            universe, universe_key = load_symbols(tuple(symbols), country)
+        st.subheader("Screener")
+        st.dataframe(screen_universe(universe_key, tuple(screen_strategies), screen_style, universe), hide_index=True)
+
+cache_stats = result_cache.stats()
+st.sidebar.caption(f"Result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses since start; "
+                   f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 2**20:.1f} MB) on disk")
+
+stop_profiling(report)
+if report.enabled:
+    with st.expander("Performance"):
+        st.write(f"**Total run time**: {report.wall_time:.3f}s")
+        st.dataframe(report.to_frame())
+        if report.counters:
+            st.dataframe(pd.Series(report.counters, name="Count").to_frame())
+        if report.profile_text:
+            st.text(report.profile_text)
+        st.download_button("Download report (JSON)", report.to_json(), file_name="profile.json")
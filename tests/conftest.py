@@ -0,0 +1,8 @@
+import pytest
+
+from benchmarks.synthetic import make_ohlcv
+
+
+@pytest.fixture
+def ohlcv():
+    return make_ohlcv
@@ -0,0 +1,442 @@
+import pytest
+
+from src.backtest.backtester import Backtester
+from src.backtest.engine import get_trade_parameters, simulate_trades
+from src.strategies.bollinger_band import BollingerBandStrategy
+from src.strategies.macd import MACDStrategy
+from src.strategies.rsi import RSIStrategy
+from src.strategies.simple_moving_average import SMAStrategy
+from src.strategies.vwap import VWAPStrategy
+
+STRATEGIES = [BollingerBandStrategy, MACDStrategy, RSIStrategy, SMAStrategy, VWAPStrategy]
+STYLES = ["Aggressive", "Moderate", "Passive"]
+
+
+def _make_backtester(data, strategy_class, style, capital=10000):
+    start, end = data.index[0].date(), data.index[-1].date()
+    return Backtester(data.copy(), strategy_class, capital, start, end, style)
+
+
+@pytest.mark.parametrize("style", STYLES)
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_vectorized_matches_loop(ohlcv, strategy_class, style):
+    data = ohlcv(1500, seed=1)
+
+    loop = _make_backtester(data, strategy_class, style)
+    loop.run_backtest()
+    expected = loop.get_results()
+
+    vectorized = _make_backtester(data, strategy_class, style)
+    result = vectorized.run_backtest_vectorized()
+
+    assert result[0] == pytest.approx(expected[0])
+    assert result[1] == pytest.approx(expected[1])
+    assert result[2] == expected[2]
+    assert vectorized.holdings == loop.holdings
+
+
+@pytest.mark.parametrize("management_style", ["aggressive", "moderate", "passive"])
+def test_simulate_trades_matches_reference(management_style):
+    close = [10.0, 9.0, 8.0, 11.0, 12.0, 7.0, 7.5, 13.0]
+    signals = [1, 1, 0, -1, -1, 1, 1, -1]
+    trade_fraction, min_signal_strength = get_trade_parameters(management_style)
+
+    cash, holdings, fills = simulate_trades(close, signals, 1000, trade_fraction, min_signal_strength)
+
+    ref_cash, ref_holdings, ref_fills = 1000, 0, []
+    for i, (price, signal) in enumerate(zip(close, signals)):
+        if signal >= min_signal_strength:
+            if signal == 1 and ref_cash > 0:
+                shares = int((ref_cash * trade_fraction) // price)
+                if shares > 0:
+                    ref_holdings += shares
+                    ref_cash -= shares * price
+                    ref_fills.append((i, 'Buy', shares, price))
+        elif signal == -1 and ref_holdings > 0:
+            ref_cash += ref_holdings * price
+            ref_fills.append((i, 'Sell', ref_holdings, price))
+            ref_holdings = 0
+
+    assert fills == ref_fills
+    assert cash == pytest.approx(ref_cash)
+    assert holdings == ref_holdings
+
+
+def test_run_batch_matches_single_backtests(ohlcv):
+    import pandas as pd
+    from src.backtest.batch import run_batch
+
+    frames = {symbol: ohlcv(600, seed=seed, symbol=symbol) for seed, symbol in enumerate(["AAA", "BBB"])}
+    data = pd.concat(frames.values())
+
+    serial = run_batch(data, strategies=["RSI", "MACD"], max_workers=1)
+    parallel = run_batch(data, strategies=["RSI", "MACD"], max_workers=2)
+
+    assert len(serial) == 2 * 2 * 3
+    pd.testing.assert_frame_equal(serial, parallel)
+
+    row = serial[(serial["Symbol"] == "BBB") & (serial["Strategy"] == "MACD") & (serial["Style"] == "Passive")].iloc[0]
+    single = _make_backtester(frames["BBB"], MACDStrategy, "Passive")
+    final_value, hodl_value, positions = single.run_backtest_vectorized()
+    assert row["Final Value"] == pytest.approx(final_value)
+    assert row["HODL Value"] == pytest.approx(hodl_value)
+    assert row["Trades"] == len(positions)
+
+
+@pytest.mark.parametrize("strategy_name, strategy_class, params", [
+    ("Bollinger Band", BollingerBandStrategy, {"window": 20, "num_std_dev": 2}),
+    ("Simple Moving Avg", SMAStrategy, {"short_window": 50, "long_window": 200}),
+    ("MACD", MACDStrategy, {"short_window": 12, "long_window": 26, "signal_window": 9}),
+    ("RSI", RSIStrategy, {"rsi_window": 14}),
+    ("VWAP", VWAPStrategy, {"vwap_window": 50}),
+])
+def test_sweep_matches_backtester(ohlcv, strategy_name, strategy_class, params):
+    from src.backtest.sweep import sweep
+
+    backtester = _make_backtester(ohlcv(1500, seed=3), strategy_class, "Moderate")
+    grid = {name: [value] for name, value in params.items()}
+    row = sweep(backtester.data.copy(), strategy_name, grid, management_style="Moderate").iloc[0]
+
+    final_value, hodl_value, positions = backtester.run_backtest_vectorized()
+    assert row["Final Value"] == pytest.approx(final_value)
+    assert row["HODL Value"] == pytest.approx(hodl_value)
+    assert row["Trades"] == len(positions)
+
+
+def test_sweep_ranks_grid_and_reuses_indicators(ohlcv):
+    from src.backtest.sweep import sweep
+    from src.strategies.indicators import IndicatorCache
+
+    data = ohlcv(800, seed=4)
+    cache = IndicatorCache(data["Close"].to_numpy())
+    results = sweep(data, "Simple Moving Avg", {"short_window": range(5, 25, 5), "long_window": range(30, 90, 20)}, cache=cache)
+
+    assert len(results) == 4 * 3
+    assert results["Final Value"].is_monotonic_decreasing
+    # 4 short + 3 long windows computed once each, every other lookup is a hit
+    assert cache.misses == 7
+    assert cache.hits == 2 * 12 - 7
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_single_symbol_portfolio_matches_backtester(ohlcv, strategy_class):
+    from src.backtest.portfolio import run_portfolio
+
+    backtester = _make_backtester(ohlcv(1200, seed=21, symbol="AAA"), strategy_class, "Moderate")
+    final_value, _, positions = backtester.run_backtest_vectorized()
+
+    result = run_portfolio(backtester.data, strategy_class, 10000, "Moderate")
+    assert result.equity.iloc[-1] == pytest.approx(final_value)
+    trades = list(result.trades[["Date", "Action", "Shares", "Price"]].itertuples(index=False, name=None))
+    # The portfolio also closes the open position on the last bar
+    assert trades[:len(positions)] == positions
+
+
+def test_portfolio_handles_ragged_histories(ohlcv):
+    import numpy as np
+    import pandas as pd
+    from src.backtest.portfolio import build_panel, run_portfolio
+
+    full = ohlcv(800, seed=22, symbol="AAA")
+    late = ohlcv(500, seed=23, symbol="BBB").set_axis(full.index[300:])
+    early = ohlcv(400, seed=24, symbol="CCC").set_axis(full.index[:400])
+    data = pd.concat([full, late, early])
+
+    panel = build_panel(data)
+    assert panel.close.shape == (800, 3)
+    assert np.isnan(panel.close[:300, 1]).all() and np.isnan(panel.close[400:, 2]).all()
+
+    result = run_portfolio(data, RSIStrategy, 30000, "Aggressive")
+    trades = result.trades
+    assert (trades.loc[trades["Symbol"] == "BBB", "Date"] >= full.index[300]).all()
+    assert (trades.loc[trades["Symbol"] == "CCC", "Date"] <= full.index[399]).all()
+    assert result.holdings[2] == 0  # delisted symbol was closed out
+    assert np.isfinite(result.equity.to_numpy()).all()
+    assert result.cash >= 0
+    assert result.equity.iloc[-1] == pytest.approx(result.cash + result.holdings[0] * full["Close"].iloc[-1]
+                                                   + result.holdings[1] * late["Close"].iloc[-1])
+
+
+def test_walk_forward_folds_and_stitched_equity(ohlcv):
+    import numpy as np
+    import pandas as pd
+    from src.backtest.engine import equity_curve, simulate_trades
+    from src.backtest.walk_forward import walk_forward
+
+    data = ohlcv(3650, seed=31)
+    serial = walk_forward(data, "RSI", step=pd.DateOffset(months=3), max_workers=1)
+    parallel = walk_forward(data, "RSI", step=pd.DateOffset(months=3), max_workers=2)
+
+    folds = serial.folds
+    assert len(folds) >= 20
+    assert set(folds["Chosen"]) <= {"Aggressive", "Moderate", "Passive"}
+    assert (folds["Test Start"] > folds["Train End"]).all()
+    pd.testing.assert_frame_equal(folds, parallel.folds)
+    pd.testing.assert_series_equal(serial.equity, parallel.equity)
+
+    # The first fold's out-of-sample curve is the chosen style replayed on the test slice
+    first = folds.iloc[0]
+    signals = RSIStrategy(data, 10000, investment_style=first["Chosen"]).generate_signals().to_numpy()
+    lo, hi = data.index.get_loc(first["Test Start"]), data.index.get_loc(first["Test End"]) + 1
+    close = data["Close"].to_numpy()[lo:hi]
+    cash, holdings, fills = simulate_trades(close, signals[lo:hi], 10000, 0.25, 1.0)
+    np.testing.assert_allclose(serial.equity.to_numpy()[:hi - lo], equity_curve(close, fills, 10000))
+    assert first["Test Value"] == pytest.approx(cash + holdings * close[-1])
+
+
+def test_walk_forward_with_grid(ohlcv):
+    from src.backtest.walk_forward import walk_forward
+
+    data = ohlcv(1500, seed=32)
+    result = walk_forward(data, "Simple Moving Avg", grid={"short_window": [10, 20], "long_window": [50, 100]},
+                          management_style="aggressive", max_workers=1)
+    assert len(result.folds) > 0
+    assert len(result.equity) == sum(
+        ((data.index >= fold["Test Start"]) & (data.index <= fold["Test End"])).sum()
+        for _, fold in result.folds.iterrows()
+    )
+
+
+def test_ledger_fifo_matching():
+    import numpy as np
+    import pandas as pd
+    from src.backtest.ledger import TradeLedger
+
+    index = pd.date_range("2020-01-01", periods=6, freq="D", tz="America/New_York")
+    positions = [
+        (index[0], "Buy", 10, 10.0),
+        (index[1], "Buy", 10, 20.0),
+        (index[2], "Sell", 15, 30.0),  # partial: all of the first lot and half of the second
+        (index[3], "Buy", 5, 40.0),
+        (index[5], "Sell", 10, 50.0),
+    ]
+    ledger = TradeLedger.from_positions(positions)
+    assert ledger.to_positions() == positions
+
+    lots = ledger.match_fifo()
+    assert lots["Shares"].tolist() == [10, 5, 5, 5]
+    assert lots["Buy Price"].tolist() == [10.0, 20.0, 20.0, 40.0]
+    assert lots["Sell Price"].tolist() == [30.0, 30.0, 50.0, 50.0]
+    assert lots["Profit/Loss"].tolist() == [200.0, 50.0, 150.0, 50.0]
+    assert lots["Holding Period"].iloc[-1] == pd.Timedelta(days=2)
+    assert lots["Buy Date"].iloc[1] == index[1]
+
+    pnl, average_cost = ledger.realized_pnl()
+    np.testing.assert_allclose(pnl, [0, 0, 250.0, 0, 200.0])
+    np.testing.assert_allclose(average_cost[[2, 4]], [200 / 15, 30.0])
+    assert np.isnan(average_cost[[0, 1, 3]]).all()
+
+    ledger.append(index[5], -1, 1, 50.0)
+    with pytest.raises(ValueError):
+        ledger.match_fifo()
+
+
+def test_ledger_is_compact_and_exports_without_copying():
+    import numpy as np
+    from src.backtest.ledger import BUY, SELL, TradeLedger
+
+    ledger = TradeLedger(capacity=4)
+    n = 100_000
+    sides = np.where(np.arange(n) % 2 == 0, BUY, SELL)
+    for start in range(0, n, 10_000):
+        ledger.extend(np.arange(start, start + 10_000), sides[start:start + 10_000], 7, 100.0)
+    assert len(ledger) == n
+    assert ledger.nbytes == 25 * n
+
+    frame = ledger.to_frame()
+    assert np.shares_memory(frame["price"].to_numpy(), ledger.trades)
+    assert len(ledger.match_fifo()) == n // 2
+
+
+def test_backtester_ledger_matches_trade_pnl(ohlcv):
+    from src.utils.metrics import calculate_trade_pnl
+
+    data = ohlcv(800, seed=13)
+    backtester = Backtester(data, BollingerBandStrategy, 10000, data.index[0].date(), data.index[-1].date(), "Moderate")
+    backtester.run_backtest_vectorized()
+    ledger = backtester.get_ledger()
+    assert ledger.to_positions() == backtester.positions
+
+    pnl = calculate_trade_pnl(backtester.positions)
+    assert ledger.match_fifo()["Profit/Loss"].sum() == pytest.approx(pnl["Profit/Loss"].sum())
+
+
+def test_headless_runner_streams_and_resumes(tmp_path, ohlcv):
+    import json
+
+    import numpy as np
+    import pandas as pd
+    from src.backtest.batch import run_batch
+    from src.data.store import MarketDataStore
+    from src.main import main, run_jobs
+
+    data = pd.concat([ohlcv(600, seed=i, symbol=f"S{i}") for i in range(2)])
+    data.to_csv(tmp_path / "combined.csv")
+    MarketDataStore(str(tmp_path / "store")).write("USA", "S0", data[data["Symbol"] == "S0"])
+    job_file = tmp_path / "jobs.json"
+    job_file.write_text(json.dumps({
+        "defaults": {"strategies": ["RSI", "MACD"], "styles": ["Moderate"]},
+        "jobs": [
+            {"csv": "combined.csv"},
+            {"store": "store", "country": "USA", "symbols": ["S0", "MISSING"],
+             "date_ranges": [[None, None], ["2015-03-01", "2015-12-31"]]},
+        ],
+    }))
+    output = tmp_path / "results.jsonl"
+
+    counts = run_jobs(str(job_file), str(output), max_workers=2, log=None)
+    assert counts == {"completed": 8, "skipped": 0, "failed": 4}
+    results = pd.read_json(output, lines=True)
+    assert results["Job ID"].is_unique
+    assert set(results.loc[results["Error"].notna(), "Symbol"]) == {"MISSING"}
+
+    # Full-range jobs agree with run_batch, whichever source they were read from
+    expected = run_batch(data, strategies=["RSI", "MACD"], styles=["Moderate"], max_workers=1)
+    full = results[results["Start Date"].isna() & results["Error"].isna()]
+    for source in ("csv:combined.csv", "store:store"):
+        got = full[full["Source"] == source].sort_values(["Symbol", "Strategy"], ignore_index=True)
+        want = expected[expected["Symbol"].isin(got["Symbol"])].reset_index(drop=True)
+        np.testing.assert_allclose(got["Final Value"], want["Final Value"])
+        assert got["Trades"].tolist() == want["Trades"].tolist()
+
+    # A rerun skips finished jobs and only retries the failures
+    assert main([str(job_file), "-o", str(output), "-w", "1"]) == 1
+    rerun = pd.read_json(output, lines=True)
+    assert len(rerun) == len(results) + 4
+    assert run_jobs(str(job_file), str(output), max_workers=1, log=None)["skipped"] == 8
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+@pytest.mark.parametrize("rule", [None, "7min"])
+def test_chunked_backtest_matches_in_memory(tmp_path, ohlcv, strategy_class, rule):
+    import pandas as pd
+    from src.backtest.chunked import run_chunked_backtest
+    from src.data.chunks import read_csv_chunks, resample_bars, resample_chunks
+
+    path = tmp_path / "bars.csv"
+    ohlcv(12_000, freq="min", seed=18).to_csv(path)
+    data = pd.read_csv(path, index_col="Date")
+    data.index = pd.to_datetime(data.index, utc=True).tz_convert("America/New_York")
+    if rule:
+        data = resample_bars(data, rule)
+    start_date, end_date = data.index[300].date(), data.index[-300].date()
+
+    backtester = Backtester(data, strategy_class, 10000, start_date, end_date, "Aggressive")
+    final_value, hodl_value, positions = backtester.run_backtest_vectorized()
+
+    chunks = read_csv_chunks(path, chunksize=2000, tz="America/New_York")
+    if rule:
+        chunks = resample_chunks(chunks, rule)
+    result = run_chunked_backtest(chunks, strategy_class, 10000, "Aggressive", start_date, end_date)
+    assert result.bars == len(backtester.data)
+    assert result.ledger.to_positions() == positions
+    assert (result.final_value, result.hodl_value) == (final_value, hodl_value)
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_screener_matches_per_symbol_signals(ohlcv, style):
+    import numpy as np
+    import pandas as pd
+    from src.backtest.batch import STRATEGIES as STRATEGY_NAMES
+    from src.backtest.screener import SCREENS, screen
+
+    full = ohlcv(600, seed=31, symbol="AAA")
+    late = ohlcv(250, seed=32, symbol="BBB").set_axis(full.index[350:])
+    early = ohlcv(300, seed=33, symbol="CCC").set_axis(full.index[:300])
+    short = ohlcv(10, seed=34, symbol="DDD").set_axis(full.index[-10:])
+    gappy = ohlcv(600, seed=35, symbol="EEE").iloc[::3].set_axis(full.index[::3])
+    data = pd.concat([full, late, early, short, gappy])
+
+    table = screen(data, style=style)
+    assert len(table) == 5 * len(SCREENS)
+    for name in SCREENS:
+        strategy_class = STRATEGY_NAMES[name]
+        rows = table[table["Strategy"] == name].set_index("Symbol")
+        assert list(rows["Rank"]) == list(range(1, 6))
+        assert rows["Signal"].map({1: 0, -1: 1, 0: 2}).is_monotonic_increasing
+        for symbol, frame in data.groupby("Symbol"):
+            expected = strategy_class(frame.copy(), 10000, investment_style=style).generate_signals().iloc[-1]
+            assert rows.loc[symbol, "Signal"] == expected, (name, symbol)
+            assert rows.loc[symbol, "Date"] == frame.index[-1]
+            assert (rows.loc[symbol, "Distance"] > 0) == (expected != 0) or np.isnan(rows.loc[symbol, "Distance"])
+
+
+def test_result_cache_hits_evicts_and_invalidates(tmp_path, ohlcv):
+    import os
+    from src.backtest.cache import ResultCache, fingerprint
+
+    data = ohlcv(800, seed=41, symbol="AAA")
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    expected = _make_backtester(data, RSIStrategy, "Moderate").run_backtest_vectorized()
+    assert cache.run(_make_backtester(data, RSIStrategy, "Moderate")) == expected
+    hit = _make_backtester(data, RSIStrategy, "Moderate")
+    assert cache.run(hit) == expected
+    assert hit.get_ledger().to_positions() == expected[2]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Other parameters, styles or data miss
+    cache.run(_make_backtester(data, RSIStrategy, "Aggressive"))
+    cache.run(_make_backtester(data, MACDStrategy, "Moderate"))
+    restated = data.copy()
+    restated.iloc[400, restated.columns.get_loc("Close")] += 0.01
+    assert fingerprint(restated) != fingerprint(data)
+    cache.run(_make_backtester(restated, RSIStrategy, "Moderate"))
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert cache.stats()["entries"] == 4
+
+    # The least recently used entries go first once the size limit is exceeded
+    entry_size = cache.stats()["bytes"] // 4
+    first_key = cache.key(hit, fingerprint(hit.data))
+    os.utime(cache._path(first_key, "AAA"), (0, 0))
+    cache.evict(max_bytes=3 * entry_size + entry_size // 2)
+    assert cache.stats()["entries"] == 3 and cache.evictions == 1
+    assert cache.get(first_key, "AAA") is None
+
+    cache.invalidate("AAA")
+    assert cache.stats()["entries"] == 0
+
+
+def test_compare_strategies_in_workers_matches_backtest_row(ohlcv):
+    from src.backtest.batch import STRATEGIES as STRATEGY_NAMES, backtest_row, compare_strategies, leaderboard
+
+    data = ohlcv(600, seed=51)
+    rows = list(compare_strategies(data, 10000, max_workers=2))
+    assert len(rows) == len(STRATEGY_NAMES) * len(STYLES)
+    for strategy_name, style, *values in rows:
+        assert tuple(values) == backtest_row(data, strategy_name, style, 10000)
+
+    board = leaderboard(rows)
+    assert board["Final Value"].is_monotonic_decreasing
+    assert (board["vs HODL"] == board["Final Value"] - board["HODL Value"]).all()
+
+
+@pytest.mark.parametrize("strategy_class", [RSIStrategy, VWAPStrategy])
+def test_paper_trading_matches_backtest_under_backpressure(ohlcv, strategy_class):
+    import asyncio
+    import pandas as pd
+    from src.backtest.paper import run_paper
+
+    # Uneven histories, so the feed interleaves symbols that start and stop at different bars
+    full = ohlcv(400, seed=71, symbol="AAA")
+    late = ohlcv(150, seed=72, symbol="BBB").set_axis(full.index[250:])
+    data = pd.concat([full, late])
+
+    async def slow_order(fill):
+        await asyncio.sleep(0.0005)
+
+    result = run_paper(data, strategy_class, management_style="aggressive", queue_size=2, on_fill=slow_order)
+    assert result.stats["bars"] == len(data)
+    assert result.stats["backpressure_waits"] > 0
+    assert result.stats["p50_us"] <= result.stats["p99_us"] <= result.stats["max_us"]
+    assert result.fills["Date"].is_monotonic_increasing
+
+    summary = result.summary.set_index("Symbol")
+    for symbol, frame in data.groupby("Symbol"):
+        close = frame["Close"].to_numpy()
+        signals = strategy_class(frame, 10000, investment_style="aggressive").generate_signals()
+        cash, holdings, fills = simulate_trades(close, signals, 10000, *get_trade_parameters("aggressive"))
+        assert summary.loc[symbol, "Cash"] == pytest.approx(cash)
+        assert summary.loc[symbol, "Holdings"] == holdings
+        assert list(result.fills.loc[result.fills["Symbol"] == symbol, "Shares"]) == [f[2] for f in fills]
+        assert summary.loc[symbol, "HODL Value"] == pytest.approx(10000 / close[0] * close[-1])
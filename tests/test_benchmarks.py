@@ -0,0 +1,36 @@
+def test_suite_runs_and_compare_flags_regressions():
+    from benchmarks.suite import compare, run
+
+    baseline = run(sizes=[500], n_symbols=3, universe_bars=300, repeat=1, log=None)
+    names = [r["name"] for r in baseline["results"]]
+    assert "signals/MACD/500" in names
+    assert "run_backtest/Simple Moving Avg/500" in names
+    assert "run_portfolio/Simple Moving Avg/3x300" in names
+    assert all(r["seconds"] > 0 and r["peak_mb"] > 0 for r in baseline["results"])
+
+    current = {"results": [dict(r) for r in baseline["results"][1:]]}
+    current["results"][0]["seconds"] = baseline["results"][1]["seconds"] * 3 + 1
+    current["results"].append({"name": "new/case", "bars": 1, "seconds": 1.0, "peak_mb": 1.0,
+                               "bars_per_second": 1.0})
+    table = compare(baseline, current, threshold=0.2).set_index("Case")["Status"]
+    assert table[names[0]] == "missing"
+    assert table[names[1]] == "regression"
+    assert table["new/case"] == "new"
+    assert (table[names[2:]] == "ok").all()
+
+
+def test_startup_benchmark_parses_importtime():
+    from benchmarks.bench_startup import app_imports, parse_importtime
+
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   _io\n"
+        "import time:       200 |        300 | encodings\n"
+        "import time:        50 |         50 |     yfinance.data\n"
+        "import time:        10 |         60 |   yfinance\n"
+        "import time:        40 |        100 | src.main\n"
+    )
+    total, modules = parse_importtime(stderr)
+    assert total == 400
+    assert {"yfinance", "src.main", "_io"} <= modules
+    assert "src.utils.visualizations" in app_imports()
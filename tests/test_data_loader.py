@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import load_data
+from src.data.store import MarketDataStore, import_csv
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MarketDataStore(str(tmp_path / "store"))
+
+
+def test_store_round_trip(store, ohlcv):
+    data = ohlcv(300, seed=5)
+    store.write("USA", "AAA", data.iloc[::-1])  # unsorted input is sorted on write
+
+    loaded = store.read("USA", "AAA")
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False, check_index_type=False)
+    assert str(loaded.index.tz) == "America/New_York"
+    assert store.last_timestamp("USA", "AAA") == data.index[-1]
+    assert store.symbols("USA") == ["AAA"]
+
+
+def test_store_projection_and_date_range(store, ohlcv):
+    data = ohlcv(300, seed=6)
+    store.write("USA", "AAA", data)
+
+    arrays, tz = store.read_arrays("USA", "AAA", columns=["Close"], start="2015-02-01", end="2015-02-10")
+    assert set(arrays) == {"Date", "Close"}
+    assert isinstance(arrays["Close"], np.memmap)
+
+    loaded = store.read("USA", "AAA", columns=["Close"], start="2015-02-01", end="2015-02-10")
+    expected = data.loc["2015-02-01":"2015-02-10", ["Close"]]
+    assert list(loaded.columns) == ["Close"]
+    np.testing.assert_array_equal(loaded["Close"].to_numpy(), expected["Close"].to_numpy())
+    assert loaded.index[0] == expected.index[0] and loaded.index[-1] == expected.index[-1]
+
+
+def test_import_csv_and_load_from_store(store):
+    imported = import_csv(store, "usa_stock_data/combined_data_USA.csv")
+    assert imported == [("USA", "AAPL")]
+
+    csv = pd.read_csv("usa_stock_data/combined_data_USA.csv")
+    from src.data.fetchers import ReplayFetcher
+
+    fetcher = ReplayFetcher.from_csv("usa_stock_data/combined_data_USA.csv")
+    data = load_data(symbols=["AAPL"], country="USA", store=store, fetcher=fetcher)
+    assert len(data) == len(csv)
+    assert data["Volume"].dtype == np.int64
+    assert (data["Symbol"] == "AAPL").all()
+    np.testing.assert_allclose(data["Close"].to_numpy(), csv["Close"].to_numpy())
+    assert data.index[0] == pd.Timestamp(csv["Date"].iloc[0])
+
+
+def test_refresh_fetches_only_new_bars(store, ohlcv):
+    from src.data.data_loader import refresh_store
+    from src.data.fetchers import ReplayFetcher
+
+    full = ohlcv(300, seed=7)
+    infos = {"AAA": {"marketCap": 123, "priceToBook": 4.5}}
+    report = refresh_store(store, ["AAA"], "USA", ReplayFetcher({"AAA": full.iloc[:250]}, infos))
+    assert report.ok and report.rows == {"AAA": 250}
+
+    fetcher = ReplayFetcher({"AAA": full}, infos)
+    data = load_data(symbols=["AAA"], country="USA", store=store, fetcher=fetcher)
+
+    # Only the last stored day onwards is requested, and fundamentals are still fresh
+    assert fetcher.calls == [("history", "AAA", full.index[249].normalize())]
+    pd.testing.assert_frame_equal(data.drop(columns="Symbol"), full, check_freq=False, check_index_type=False)
+    assert store.fundamentals("USA").loc["AAA", "marketCap"] == 123
+
+
+def test_append_replaces_restated_last_bar(store, ohlcv):
+    data = ohlcv(100, seed=8)
+    store.write("USA", "AAA", data.iloc[:60])
+
+    restated = data.iloc[59:].copy()
+    restated.iloc[0, restated.columns.get_loc("Close")] += 1.0
+    meta = store.append("USA", "AAA", restated)
+
+    loaded = store.read("USA", "AAA")
+    assert meta["rows"] == len(loaded) == 100
+    assert meta["version"] == 2
+    assert loaded["Close"].iloc[59] == data["Close"].iloc[59] + 1.0
+    np.testing.assert_array_equal(loaded["Close"].to_numpy()[60:], data["Close"].to_numpy()[60:])
+
+
+def test_concurrent_fetch_retries_and_reports_errors(ohlcv):
+    from src.data.fetchers import ReplayFetcher, fetch_concurrently
+
+    class FlakyFetcher(ReplayFetcher):
+        def fetch_history(self, symbol, start=None):
+            if sum(call[1] == symbol for call in self.calls) < 1:
+                self.calls.append(("failed", symbol, start))
+                raise ConnectionError("rate limited")
+            return super().fetch_history(symbol, start)
+
+    frames = {symbol: ohlcv(50, seed=i) for i, symbol in enumerate(["AAA", "BBB", "CCC"])}
+    fetcher = FlakyFetcher(frames, latency=0.01)
+    histories, infos, report = fetch_concurrently(
+        fetcher, ["AAA", "BBB", "CCC", "MISSING"], info_symbols=["AAA"], max_workers=4, backoff=0
+    )
+
+    assert sorted(histories) == ["AAA", "BBB", "CCC"]
+    assert list(infos) == ["AAA"]
+    assert report.attempts["BBB"] == 2  # one failure, one success
+    assert report.rows["CCC"] == 50
+    assert "MISSING" in report.errors and report.attempts["MISSING"] == 3
+    assert report.to_frame().set_index("Symbol").loc["MISSING", "Status"] == "error"
+
+
+def test_load_data_assembles_symbols_and_fundamentals(tmp_path, monkeypatch, ohlcv):
+    from src.data.fetchers import ReplayFetcher
+
+    monkeypatch.chdir(tmp_path)
+    frames = {symbol: ohlcv(40, seed=i) for i, symbol in enumerate(["AAA", "BBB"])}
+    fetcher = ReplayFetcher(frames, infos={"AAA": {"marketCap": 1}, "BBB": {"marketCap": 2}})
+
+    data = load_data(symbols=["AAA", "BBB"], country="USA", fetcher=fetcher)
+    assert len(data) == 80
+    assert list(data["Symbol"].unique()) == ["AAA", "BBB"]
+    assert "marketCap" not in data.columns
+
+    fundamentals = pd.read_csv(tmp_path / "data/usa_stock_data/fundamentals_USA.csv", index_col="Symbol")
+    assert fundamentals.loc["BBB", "marketCap"] == 2
+
+
+def test_chunk_readers_and_resampling_match_whole_file(tmp_path, store, ohlcv):
+    from src.data.chunks import read_csv_chunks, read_store_chunks, resample_bars, resample_chunks
+
+    data = ohlcv(5000, freq="min", start="2021-03-13 22:00")  # spans the DST change
+    path = tmp_path / "bars.csv"
+    pd.concat([data.assign(Symbol="A"), data.iloc[:10].assign(Symbol="B")]).to_csv(path)
+
+    chunks = list(read_csv_chunks(path, chunksize=777, symbol="A", tz="America/New_York",
+                                  columns=("Open", "High", "Low", "Close", "Volume")))
+    assert len(chunks) > 1
+    whole = pd.concat(chunks)
+    assert str(whole.index.tz) == "America/New_York"
+    pd.testing.assert_index_equal(whole.index, data.index, check_names=False)
+
+    expected = resample_bars(whole, "7min")
+    pd.testing.assert_frame_equal(pd.concat(resample_chunks(iter(chunks), "7min")), expected)
+    assert expected["Volume"].sum() == data["Volume"].sum()
+    assert expected["High"].max() == whole["High"].max()
+
+    store.write("USA", "A", data)
+    from_store = pd.concat(read_store_chunks(store, "USA", "A", chunksize=1000))
+    np.testing.assert_array_equal(from_store["Close"].to_numpy(), data["Close"].to_numpy())
+    assert from_store.index.equals(data.index)
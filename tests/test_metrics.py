@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.metrics import calculate_max_drawdown, calculate_sharpe_ratio
+from src.utils.robustness import monte_carlo, summarize
+
+
+def test_max_drawdown_1d_and_2d():
+    equity = np.array([100, 120, 90, 130, 65, 70])
+    assert calculate_max_drawdown(equity) == pytest.approx(-0.5)
+    np.testing.assert_allclose(calculate_max_drawdown(np.vstack([equity, equity[::-1]])), [-0.5, 90 / 130 - 1])
+
+
+def test_sharpe_ratio_per_path_matches_series():
+    rng = np.random.default_rng(0)
+    paths = rng.normal(0.001, 0.01, size=(3, 250))
+    expected = [calculate_sharpe_ratio(pd.Series(row)) for row in paths]
+    np.testing.assert_allclose(calculate_sharpe_ratio(paths), expected)
+
+
+@pytest.mark.parametrize("method", ["block", "shuffle"])
+def test_monte_carlo_is_seeded_and_chunk_independent(method):
+    returns = np.random.default_rng(1).normal(0.0005, 0.01, 500)
+
+    whole = monte_carlo(returns, n_paths=300, method=method, seed=42)
+    chunked = monte_carlo(returns, n_paths=300, method=method, seed=42, max_elements=500 * 7)
+    for a, b in zip(whole, chunked):
+        np.testing.assert_allclose(a, b)
+    assert whole.final_values.shape == (300,)
+    assert (whole.max_drawdowns <= 0).all()
+
+
+def test_shuffle_preserves_final_value_but_not_drawdown():
+    trade_returns = np.array([0.1, -0.2, 0.05, 0.3, -0.1, 0.02])
+    report = monte_carlo(trade_returns, n_paths=200, method="shuffle", capital=1000, seed=3)
+
+    np.testing.assert_allclose(report.final_values, 1000 * np.prod(1 + trade_returns))
+    assert report.max_drawdowns.min() < report.max_drawdowns.max()
+    table = summarize(report)
+    assert list(table.columns) == ["final_values", "max_drawdowns", "sharpe_ratios"]
+    assert table.loc["p5", "max_drawdowns"] <= table.loc["p95", "max_drawdowns"]
+
+
+def _positions(index):
+    return [
+        (index[1], "Buy", 10, 10.0),
+        (index[2], "Buy", 5, 12.0),
+        (index[4], "Sell", 15, 11.0),
+        (index[6], "Buy", 20, 9.0),
+        (index[8], "Sell", 20, 8.0),
+    ]
+
+
+def test_equity_curve_and_trade_pnl():
+    from src.utils.metrics import calculate_equity_curve, calculate_trade_pnl
+
+    index = pd.date_range("2020-01-01", periods=10, freq="D", tz="UTC")
+    prices = pd.Series([10.0, 10.0, 12.0, 13.0, 11.0, 11.0, 9.0, 9.5, 8.0, 8.5], index=index)
+    positions = _positions(index)
+
+    equity = calculate_equity_curve(prices, positions, 1000)
+    assert equity.iloc[0] == 1000
+    assert equity.iloc[3] == pytest.approx(1000 - 100 - 60 + 15 * 13.0)
+    assert equity.iloc[-1] == pytest.approx(1000 + (165 - 160) + (160 - 180))
+
+    pnl = calculate_trade_pnl(positions)
+    assert pnl["Profit/Loss"].tolist() == [0, 0, 5.0, 0, -20.0]
+    assert pnl["Cumulative P/L"].iloc[-1] == pytest.approx(-15.0)
+
+
+def test_performance_summary():
+    from src.utils.metrics import calculate_drawdown_duration, calculate_equity_curve, performance_summary
+
+    index = pd.date_range("2020-01-01", periods=10, freq="D", tz="UTC")
+    prices = pd.Series([10.0, 10.0, 12.0, 13.0, 11.0, 11.0, 9.0, 9.5, 8.0, 8.5], index=index)
+    positions = _positions(index)
+    equity = calculate_equity_curve(prices, positions, 1000)
+
+    summary = performance_summary(equity, positions)
+    assert summary["Total Return"] == pytest.approx(equity.iloc[-1] / 1000 - 1)
+    assert summary["Max Drawdown"] == pytest.approx(calculate_max_drawdown(equity.to_numpy()))
+    assert summary["Max Drawdown Duration"] == calculate_drawdown_duration(equity.to_numpy())
+    assert summary["Hit Rate"] == 0.5
+    assert summary["Trades"] == 5
+    assert summary["Exposure"] == pytest.approx(5 / 10)  # holding from bar 1 to 3 and 6 to 7
+    assert calculate_drawdown_duration([1, 2, 1, 1, 3, 2, 4]) == 2
+
+
+def test_trade_pnl_is_linear_on_large_ledgers():
+    import time
+    from src.utils.metrics import calculate_trade_pnl
+
+    index = pd.date_range("2000-01-01", periods=200_000, freq="min")
+    positions = [(index[i], "Buy" if i % 2 == 0 else "Sell", 10, 100.0 + (i % 7)) for i in range(len(index))]
+    start = time.perf_counter()
+    pnl = calculate_trade_pnl(positions)
+    assert time.perf_counter() - start < 2
+    assert len(pnl) == 200_000
@@ -0,0 +1,70 @@
+import json
+
+from src.backtest.backtester import Backtester
+from src.strategies.simple_moving_average import SMAStrategy
+from src.utils.profiling import active_report, profile_run, profiling_options, stage, timed
+
+
+def _backtester(data):
+    return Backtester(data, SMAStrategy, 10000, data.index[0].date(), data.index[-1].date(), "Moderate")
+
+
+def test_profiling_options(monkeypatch):
+    assert profiling_options("") == (False, False, False)
+    assert profiling_options("0") == (False, False, False)
+    assert profiling_options("1") == (True, False, False)
+    assert profiling_options("cprofile, memory") == (True, True, True)
+
+    monkeypatch.setenv("BACKTEST_PROFILE", "1")
+    with profile_run() as report:
+        assert active_report() is report
+    assert report.enabled and active_report() is None
+
+
+def test_disabled_profiling_records_nothing(monkeypatch, ohlcv):
+    monkeypatch.delenv("BACKTEST_PROFILE", raising=False)
+    with profile_run() as report:
+        assert active_report() is None
+        _backtester(ohlcv(300)).run_backtest_vectorized()
+    assert not report.enabled
+    assert report.stages == {} and report.counters == {}
+
+
+def test_stage_report_collects_timings_memory_and_profile(tmp_path, ohlcv):
+    @timed()
+    def build(n):
+        return list(range(n))
+
+    data = ohlcv(500)
+    with profile_run(enabled=True, cprofile=True, memory=True) as report:
+        with stage("outer"):
+            build(200_000)
+            build(10)
+        _backtester(data).run_backtest()
+
+    frame = report.to_frame().set_index("Stage")
+    assert frame.loc["build", "Calls"] == 2
+    assert frame.loc["outer", "Total s"] >= frame.loc["build", "Total s"]
+    assert frame.loc["outer", "Peak MB"] >= frame.loc["build", "Peak MB"] > 1
+    assert {"generate_signals", "trade_loop"} <= set(frame.index)
+    assert report.counters["bars"] == len(_backtester(data).data)
+    assert "build" in report.profile_text
+
+    path = tmp_path / "profile.json"
+    report.to_json(path)
+    saved = json.loads(path.read_text())
+    assert saved["counters"] == report.counters
+    assert {row["Stage"] for row in saved["stages"]} == set(frame.index)
+
+
+def test_batch_profile_merges_worker_stages(ohlcv):
+    import pandas as pd
+    from src.backtest.batch import run_batch
+
+    data = pd.concat([ohlcv(400, seed=i, symbol=f"S{i}") for i in range(3)])
+    with profile_run(enabled=True) as report:
+        results = run_batch(data, strategies=["RSI"], styles=["Moderate"], max_workers=2)
+    stages = report.to_frame().set_index("Stage")
+    assert stages.loc["generate_signals", "Calls"] == len(results) == 3
+    assert stages.loc["split_by_symbol", "Calls"] == 1
+    assert report.counters["trades"] == results["Trades"].sum()
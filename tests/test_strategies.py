@@ -0,0 +1,147 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.bollinger_band import BollingerBandStrategy
+from src.strategies.macd import MACDStrategy
+from src.strategies.rsi import RSIStrategy
+from src.strategies.simple_moving_average import SMAStrategy
+from src.strategies.streaming import stream_signals
+from src.strategies.vwap import VWAPStrategy
+
+STRATEGIES = [BollingerBandStrategy, MACDStrategy, RSIStrategy, SMAStrategy, VWAPStrategy]
+STYLES = ["Aggressive", "Moderate", "Passive"]
+
+
+@pytest.mark.parametrize("style", STYLES)
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_streaming_matches_batch_signals(ohlcv, strategy_class, style):
+    data = ohlcv(2000, seed=11)
+    batch = strategy_class(data.copy(), 10000, investment_style=style).generate_signals()
+
+    streamed = stream_signals(strategy_class(data.copy(), 10000, investment_style=style), data)
+
+    assert (streamed.to_numpy() == batch.to_numpy()).all()
+
+
+def test_streaming_state_resets(ohlcv):
+    data = ohlcv(300, seed=12)
+    strategy = RSIStrategy(data, 10000, investment_style="Aggressive")
+    first = stream_signals(strategy, data)
+    second = stream_signals(strategy, data)
+    assert first.equals(second)
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_generate_signals_leaves_data_untouched(ohlcv, strategy_class):
+    data = ohlcv(500, seed=13)
+    before = data.copy()
+    strategy_class(data, 10000).generate_signals()
+    pd.testing.assert_frame_equal(data, before)
+
+
+def test_indicators_reuse_buffers_and_float32(ohlcv):
+    from src.strategies import indicators
+
+    close = ohlcv(400, seed=14)["Close"].to_numpy()
+    expected = pd.Series(close).rolling(20).mean().to_numpy()
+
+    buffer = np.empty(len(close), dtype=np.float32)
+    result = indicators.rolling_mean(close, 20, out=buffer)
+    assert result is buffer
+    np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    assert indicators.rsi(close, 14, dtype=np.float32).dtype == np.float32
+    bands = indicators.bollinger_bands(close, 20, 2, dtype=np.float32)
+    assert bands.upper.dtype == np.float32
+    assert np.nanmin(bands.upper - bands.lower) >= 0
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_backtest_peak_memory_stays_near_input_size(ohlcv, strategy_class):
+    from src.backtest.backtester import Backtester
+
+    data = ohlcv(100_000, seed=15)
+    frame_bytes = data.memory_usage(index=True).sum()
+
+    tracemalloc.start()
+    backtester = Backtester(data, strategy_class, 10000, data.index[0].date(), data.index[-1].date(), "Moderate")
+    backtester.run_backtest_vectorized()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # No copy of the frame and no full-length indicator columns survive the run
+    assert peak < 1.75 * frame_bytes
+    assert retained < 0.25 * frame_bytes
+
+
+def test_registry_imports_strategies_and_heavy_packages_on_demand():
+    import subprocess
+    import sys
+    from src.strategies.base_strategy import BaseStrategy
+    from src.strategies.registry import StrategyRegistry, get_strategy
+
+    # Listing strategies, or loading the headless runner, imports no strategy module or chart/download package
+    script = (
+        "import sys, src.main\n"
+        "from src.strategies.registry import STRATEGIES\n"
+        "assert 'RSI' in STRATEGIES and len(list(STRATEGIES)) >= 5\n"
+        "loaded = [m for m in ('src.strategies.rsi', 'yfinance', 'plotly', 'matplotlib') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+        "assert STRATEGIES['RSI'].__name__ == 'RSIStrategy' and 'src.strategies.rsi' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    registry = StrategyRegistry({"RSI": "src.strategies.rsi:RSIStrategy"})
+
+    @registry.register("Always Buy")
+    class AlwaysBuy(BaseStrategy):
+        def generate_signals(self):
+            return pd.Series(1, index=self.data.index, name='Signal')
+
+    assert list(registry)[:2] == ["RSI", "Always Buy"]
+    assert registry["RSI"] is RSIStrategy and registry["Always Buy"] is AlwaysBuy
+    assert get_strategy("MACD") is MACDStrategy
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        get_strategy("Nope")
+
+
+@pytest.mark.parametrize("mode", ["vote", "weighted", "unanimous"])
+def test_ensemble_shares_indicators_and_matches_member_signals(ohlcv, mode):
+    from src.strategies.ensemble import CLOSE, SIGNAL_PLANS, VOLUME, EnsembleStrategy, dependency_order
+    from src.strategies.registry import get_strategy
+
+    data = ohlcv(800, seed=61)
+    members = [(name, style) for name in EnsembleStrategy.DEFAULT_MEMBERS for style in ("Aggressive", "Moderate")]
+    weights = [1, 2, 1, 2, 1, 2, 3, 1, 1, 1]
+    ensemble = EnsembleStrategy(data, 10000, members=members, mode=mode, weights=weights, threshold=0.3)
+    combined = ensemble.generate_signals()
+
+    # Each member's row equals its own generate_signals
+    signals = np.array([
+        get_strategy(name)(data, 10000, investment_style=style).generate_signals().to_numpy()
+        for name, style in members
+    ])
+    assert (ensemble.member_signals() == signals).all()
+
+    # Every distinct indicator node was computed exactly once
+    computed = ensemble.graph.computed
+    assert len(computed) == len(set(computed))
+    plans = [node for s in ensemble.strategies for node in SIGNAL_PLANS[type(s)](s)[0]]
+    assert set(computed) == set(dependency_order(plans)) - {CLOSE, VOLUME}
+
+    buys, sells = (signals == 1).sum(axis=0), (signals == -1).sum(axis=0)
+    if mode == "vote":
+        expected = np.where(buys > 5, 1, np.where(sells > 5, -1, 0))
+    elif mode == "weighted":
+        score = np.array(weights) @ signals / sum(weights)
+        expected = np.where(score >= 0.3, 1, np.where(score <= -0.3, -1, 0))
+    else:
+        expected = np.where(buys == 10, 1, np.where(sells == 10, -1, 0))
+    assert (combined.to_numpy() == expected).all()
+    assert ensemble.warmup_bars() == max(s.warmup_bars() for s in ensemble.strategies)
+
+    # Streaming matches the batch signals bar for bar
+    assert (stream_signals(ensemble, data).to_numpy() == combined.to_numpy()).all()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.utils.visualizations import lttb, plot_stock_data, plot_stock_with_signals, resample_ohlc
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    y[4321] = 50.0
+    keep = lttb(y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert (np.diff(keep) > 0).all()
+    assert 4321 in keep
+    np.testing.assert_array_equal(lttb(y[:100], 500), np.arange(100))
+
+
+def test_resample_ohlc_aggregates_runs_of_bars():
+    open_ = np.arange(10.0)
+    high = open_ + 1
+    low = open_ - 1
+    close = open_ + 0.5
+    first, o, h, l, c = resample_ohlc(open_, high, low, close, 4)
+    np.testing.assert_array_equal(first, [0, 3, 6, 9])
+    np.testing.assert_array_equal(o, [0, 3, 6, 9])
+    np.testing.assert_array_equal(h, [3, 6, 9, 10])
+    np.testing.assert_array_equal(l, [-1, 2, 5, 8])
+    np.testing.assert_array_equal(c, [2.5, 5.5, 8.5, 9.5])
+
+
+def test_downsampled_figures_keep_exact_markers(ohlcv):
+    data = ohlcv(20_000, freq="min")
+    positions = [(data.index[i], "Buy" if k % 2 == 0 else "Sell", 10, float(data["Close"].iloc[i]))
+                 for k, i in enumerate(range(7, 20_000, 997))]
+
+    fig = plot_stock_with_signals(data, positions, max_points=1000)
+    line, buys, sells = fig.data
+    assert line.type == "scattergl" and len(line.x) == 1000
+    assert list(buys.y) == [p for _, action, _, p in positions if action == "Buy"]
+    assert list(sells.x) == [d for d, action, _, _ in positions if action == "Sell"]
+
+    candles = plot_stock_data(data, max_points=1000).data[0]
+    assert len(candles.x) == 1000
+    assert max(candles.high) == data["High"].max() and min(candles.low) == data["Low"].min()
+    assert len(plot_stock_data(data.iloc[:500]).data[0].x) == 500